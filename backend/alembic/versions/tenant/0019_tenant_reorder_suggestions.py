@@ -0,0 +1,58 @@
+"""Add supplier lead time and reorder suggestions.
+
+Revision ID: tenant_0019
+Revises: tenant_0018
+Create Date: 2026-03-10 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "tenant_0019"
+down_revision = "tenant_0018"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "suppliers",
+        sa.Column("lead_time_days", sa.Integer(), nullable=False, server_default="7"),
+    )
+    op.create_table(
+        "reorder_suggestions",
+        sa.Column(
+            "product_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("products.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("on_hand", sa.Numeric(12, 3), nullable=False, server_default="0"),
+        sa.Column("avg_daily_qty", sa.Numeric(12, 3), nullable=False, server_default="0"),
+        sa.Column("days_of_cover", sa.Numeric(12, 1), nullable=True),
+        sa.Column("lead_time_days", sa.Integer(), nullable=False),
+        sa.Column("reorder_point", sa.Numeric(12, 3), nullable=False, server_default="0"),
+        sa.Column("suggested_qty", sa.Numeric(12, 3), nullable=False, server_default="0"),
+        sa.Column("needs_reorder", sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column("window_days", sa.Integer(), nullable=False),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_reorder_suggestions_needs_reorder",
+        "reorder_suggestions",
+        ["needs_reorder"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_reorder_suggestions_needs_reorder", table_name="reorder_suggestions")
+    op.drop_table("reorder_suggestions")
+    op.drop_column("suppliers", "lead_time_days")
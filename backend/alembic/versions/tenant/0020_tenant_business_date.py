@@ -0,0 +1,94 @@
+"""Add business_date columns and time-range indexes.
+
+Revision ID: tenant_0020
+Revises: tenant_0019
+Create Date: 2026-03-12 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0020"
+down_revision = "tenant_0019"
+branch_labels = None
+depends_on = None
+
+BUSINESS_DATE_SOURCES = {
+    "sales": "created_at",
+    "expenses": "occurred_at",
+    "stock_moves": "created_at",
+}
+
+
+def _tenant_timezone(bind) -> str:
+    inspector = sa.inspect(bind)
+    if not inspector.has_table("tenant_settings", schema="public"):
+        return "UTC"
+    value = bind.execute(
+        sa.text(
+            "SELECT ts.settings->>'timezone' FROM public.tenant_settings ts "
+            "JOIN public.tenants t ON t.id = ts.tenant_id WHERE t.code = current_schema()"
+        )
+    ).scalar()
+    if not value:
+        return "UTC"
+    valid = bind.execute(
+        sa.text("SELECT count(*) FROM pg_timezone_names WHERE name = :name"), {"name": value}
+    ).scalar()
+    return value if valid else "UTC"
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    schema = bind.dialect.identifier_preparer.quote(current_schema)
+    timezone_name = _tenant_timezone(bind).replace("'", "''")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION business_timezone() RETURNS text "
+        f"LANGUAGE sql IMMUTABLE AS $$ SELECT '{timezone_name}'::text $$"
+    )
+    for table, source in BUSINESS_DATE_SOURCES.items():
+        op.add_column(table, sa.Column("business_date", sa.Date(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET business_date = "
+            f"(coalesce({source}, now()) AT TIME ZONE business_timezone())::date"
+        )
+        op.alter_column(table, "business_date", nullable=False)
+        op.execute(
+            f"CREATE OR REPLACE FUNCTION {table}_set_business_date() RETURNS trigger "
+            "LANGUAGE plpgsql AS $$ BEGIN "
+            f"NEW.business_date := (coalesce(NEW.{source}, now()) "
+            f"AT TIME ZONE {schema}.business_timezone())::date; "
+            "RETURN NEW; END $$"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_business_date BEFORE INSERT OR UPDATE OF {source} ON {table} "
+            f"FOR EACH ROW EXECUTE FUNCTION {table}_set_business_date()"
+        )
+
+    op.create_index(
+        "ix_sales_store_id_status_business_date",
+        "sales",
+        ["store_id", "status", "business_date"],
+    )
+    op.create_index("ix_sales_status_created_at", "sales", ["status", "created_at"])
+    op.create_index("ix_sales_shift_id_status", "sales", ["shift_id", "status"])
+    op.create_index("ix_expenses_store_id_business_date", "expenses", ["store_id", "business_date"])
+    op.create_index(
+        "ix_stock_moves_store_id_business_date",
+        "stock_moves",
+        ["store_id", "business_date"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_moves_store_id_business_date", table_name="stock_moves")
+    op.drop_index("ix_expenses_store_id_business_date", table_name="expenses")
+    op.drop_index("ix_sales_shift_id_status", table_name="sales")
+    op.drop_index("ix_sales_status_created_at", table_name="sales")
+    op.drop_index("ix_sales_store_id_status_business_date", table_name="sales")
+    for table in BUSINESS_DATE_SOURCES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_business_date ON {table}")
+        op.execute(f"DROP FUNCTION IF EXISTS {table}_set_business_date()")
+        op.drop_column(table, "business_date")
+    op.execute("DROP FUNCTION IF EXISTS business_timezone()")
@@ -0,0 +1,48 @@
+"""Add sales daily rollups.
+
+Revision ID: tenant_0021
+Revises: tenant_0020
+Create Date: 2026-03-14 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "tenant_0021"
+down_revision = "tenant_0020"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sales_daily_rollups",
+        sa.Column(
+            "store_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("stores.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("business_date", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("sales_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("gmv", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column(
+            "refreshed_at",
+            sa.DateTime(timezone=True),
+            nullable=False,
+            server_default=sa.func.now(),
+        ),
+    )
+    op.create_index(
+        "ix_sales_daily_rollups_business_date",
+        "sales_daily_rollups",
+        ["business_date"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_sales_daily_rollups_business_date", table_name="sales_daily_rollups")
+    op.drop_table("sales_daily_rollups")
@@ -0,0 +1,144 @@
+"""Add running counters and Z-report to cashier shifts.
+
+Revision ID: tenant_0022
+Revises: tenant_0021
+Create Date: 2026-03-16 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB
+
+revision = "tenant_0022"
+down_revision = "tenant_0021"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("sales_count", sa.Integer(), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("revenue_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("tax_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("profit_gross_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("refunds_total", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column(
+            "payment_totals",
+            JSONB(astext_type=sa.Text()),
+            nullable=False,
+            server_default=sa.text("'{}'::jsonb"),
+        ),
+    )
+    op.add_column(
+        "cashier_shifts",
+        sa.Column("z_report", JSONB(astext_type=sa.Text()), nullable=True),
+    )
+
+    op.execute(
+        """
+        UPDATE cashier_shifts cs SET sales_count = agg.sales_count, revenue_total = agg.revenue_total
+        FROM (
+            SELECT shift_id, count(*) AS sales_count, coalesce(sum(total_amount), 0) AS revenue_total
+            FROM sales WHERE shift_id IS NOT NULL AND status = 'completed' GROUP BY shift_id
+        ) agg
+        WHERE agg.shift_id = cs.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE cashier_shifts cs SET tax_total = agg.tax_total
+        FROM (
+            SELECT s.shift_id, coalesce(sum(t.tax_amount), 0) AS tax_total
+            FROM sale_tax_lines t JOIN sales s ON s.id = t.sale_id
+            WHERE s.shift_id IS NOT NULL AND s.status = 'completed' GROUP BY s.shift_id
+        ) agg
+        WHERE agg.shift_id = cs.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE cashier_shifts cs SET profit_gross_total = agg.profit_total
+        FROM (
+            SELECT s.shift_id, coalesce(sum(i.profit_line), 0) AS profit_total
+            FROM sale_items i JOIN sales s ON s.id = i.sale_id
+            WHERE s.shift_id IS NOT NULL AND s.status = 'completed' GROUP BY s.shift_id
+        ) agg
+        WHERE agg.shift_id = cs.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE cashier_shifts cs SET refunds_total = agg.refunds_total
+        FROM (
+            SELECT s.shift_id, coalesce(sum(r.amount), 0) AS refunds_total
+            FROM refunds r JOIN sales s ON s.id = r.sale_id
+            WHERE s.shift_id IS NOT NULL GROUP BY s.shift_id
+        ) agg
+        WHERE agg.shift_id = cs.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE cashier_shifts cs SET payment_totals = agg.payment_totals
+        FROM (
+            SELECT shift_id, jsonb_object_agg(method, amount) AS payment_totals
+            FROM (
+                SELECT s.shift_id, p.method::text AS method, sum(p.amount) AS amount
+                FROM payments p JOIN sales s ON s.id = p.sale_id
+                WHERE s.shift_id IS NOT NULL AND s.status = 'completed'
+                GROUP BY s.shift_id, p.method
+            ) per_method
+            GROUP BY shift_id
+        ) agg
+        WHERE agg.shift_id = cs.id
+        """
+    )
+    op.execute(
+        """
+        UPDATE cashier_shifts SET z_report = jsonb_build_object(
+            'shift_id', id,
+            'store_id', store_id,
+            'cashier_id', cashier_id,
+            'opened_at', opened_at,
+            'closed_at', closed_at,
+            'opening_cash', opening_cash,
+            'closing_cash', closing_cash,
+            'expected_cash', opening_cash + coalesce((payment_totals->>'cash')::numeric, 0),
+            'cash_difference', CASE WHEN closing_cash IS NULL THEN NULL
+                ELSE closing_cash - opening_cash - coalesce((payment_totals->>'cash')::numeric, 0) END,
+            'sales_count', sales_count,
+            'revenue_total', revenue_total,
+            'tax_total', tax_total,
+            'profit_gross_total', profit_gross_total,
+            'refunds_total', refunds_total,
+            'by_payment_type', payment_totals
+        )
+        WHERE status = 'closed'
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("cashier_shifts", "z_report")
+    op.drop_column("cashier_shifts", "payment_totals")
+    op.drop_column("cashier_shifts", "refunds_total")
+    op.drop_column("cashier_shifts", "profit_gross_total")
+    op.drop_column("cashier_shifts", "tax_total")
+    op.drop_column("cashier_shifts", "revenue_total")
+    op.drop_column("cashier_shifts", "sales_count")
@@ -0,0 +1,46 @@
+"""Backfill expense accruals ahead of profit and loss reads.
+
+Revision ID: tenant_0023
+Revises: tenant_0022
+Create Date: 2026-03-17 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "tenant_0023"
+down_revision = "tenant_0022"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        INSERT INTO expense_accruals (id, store_id, recurring_expense_id, date, amount, created_at)
+        SELECT
+            gen_random_uuid(),
+            r.store_id,
+            r.id,
+            d.day::date,
+            CASE
+                WHEN r.period = 'daily' THEN r.amount
+                WHEN r.period = 'weekly' THEN r.amount / 7
+                WHEN r.allocation_method = 'fixed_30' THEN r.amount / 30
+                ELSE r.amount / extract(day FROM date_trunc('month', d.day) + interval '1 month - 1 day')
+            END,
+            now()
+        FROM recurring_expenses r
+        CROSS JOIN LATERAL generate_series(
+            r.start_date,
+            least(coalesce(r.end_date, (now() AT TIME ZONE business_timezone())::date + 35),
+                  (now() AT TIME ZONE business_timezone())::date + 35),
+            interval '1 day'
+        ) AS d(day)
+        WHERE r.is_active
+        ON CONFLICT (recurring_expense_id, date) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,66 @@
+"""Add accounting periods and profit and loss snapshots.
+
+Revision ID: tenant_0024
+Revises: tenant_0023
+Create Date: 2026-03-18 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "tenant_0024"
+down_revision = "tenant_0023"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "accounting_periods",
+        sa.Column("month", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("is_closed", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("closed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "closed_by_user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+        sa.Column("reopened_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column(
+            "reopened_by_user_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("users.id", ondelete="SET NULL"),
+            nullable=True,
+        ),
+    )
+    op.create_table(
+        "pnl_snapshots",
+        sa.Column(
+            "store_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("stores.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("date", sa.Date(), primary_key=True, nullable=False),
+        sa.Column(
+            "period_month",
+            sa.Date(),
+            sa.ForeignKey("accounting_periods.month", ondelete="CASCADE"),
+            nullable=False,
+        ),
+        sa.Column("revenue", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("cogs", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("taxes", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("one_time_expenses", sa.Numeric(14, 2), nullable=False, server_default="0"),
+        sa.Column("fixed_costs", sa.Numeric(14, 2), nullable=False, server_default="0"),
+    )
+    op.create_index("ix_pnl_snapshots_period_month", "pnl_snapshots", ["period_month"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_pnl_snapshots_period_month", table_name="pnl_snapshots")
+    op.drop_table("pnl_snapshots")
+    op.drop_table("accounting_periods")
@@ -0,0 +1,78 @@
+"""Move catalog import rows into a staging table.
+
+Revision ID: tenant_0025
+Revises: tenant_0024
+Create Date: 2026-03-19 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision = "tenant_0025"
+down_revision = "tenant_0024"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_import_rows",
+        sa.Column(
+            "import_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("catalog_imports.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("row_number", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("data", JSONB(astext_type=sa.Text()), nullable=False, server_default=sa.text("'{}'::jsonb")),
+        sa.Column("status", sa.String(), nullable=False, server_default="pending"),
+        sa.Column("error", sa.String(), nullable=True),
+    )
+    op.create_index(
+        "ix_catalog_import_rows_import_id_status",
+        "catalog_import_rows",
+        ["import_id", "status"],
+    )
+    op.execute(
+        """
+        INSERT INTO catalog_import_rows (import_id, row_number, data, status)
+        SELECT ci.id, item.ordinality + 1, item.value::jsonb, 'pending'
+        FROM catalog_imports ci
+        CROSS JOIN LATERAL json_array_elements(ci.source_rows) WITH ORDINALITY AS item(value, ordinality)
+        """
+    )
+    op.execute(
+        """
+        UPDATE catalog_import_rows r
+        SET status = 'invalid', error = err.value->>'error'
+        FROM catalog_imports ci
+        CROSS JOIN LATERAL json_array_elements(ci.errors) AS err(value)
+        WHERE r.import_id = ci.id
+          AND (err.value->>'row') ~ '^[0-9]+$'
+          AND r.row_number = (err.value->>'row')::int
+        """
+    )
+    op.drop_column("catalog_imports", "source_rows")
+
+
+def downgrade() -> None:
+    op.add_column(
+        "catalog_imports",
+        sa.Column("source_rows", sa.JSON(), nullable=False, server_default=sa.text("'[]'::json")),
+    )
+    op.execute(
+        """
+        UPDATE catalog_imports ci
+        SET source_rows = staged.rows
+        FROM (
+            SELECT import_id, json_agg(data::json ORDER BY row_number) AS rows
+            FROM catalog_import_rows
+            GROUP BY import_id
+        ) staged
+        WHERE staged.import_id = ci.id
+        """
+    )
+    op.drop_index("ix_catalog_import_rows_import_id_status", table_name="catalog_import_rows")
+    op.drop_table("catalog_import_rows")
@@ -0,0 +1,43 @@
+"""Add job queue columns to catalog imports.
+
+Revision ID: tenant_0026
+Revises: tenant_0025
+Create Date: 2026-03-20 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0026"
+down_revision = "tenant_0025"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("catalog_imports", sa.Column("progress", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column("catalog_imports", sa.Column("attempts", sa.Integer(), nullable=False, server_default="0"))
+    op.add_column(
+        "catalog_imports",
+        sa.Column("cancel_requested", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+    op.add_column("catalog_imports", sa.Column("run_after", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("catalog_imports", sa.Column("heartbeat_at", sa.DateTime(timezone=True), nullable=True))
+    op.add_column("catalog_imports", sa.Column("locked_by", sa.String(), nullable=True))
+    op.add_column("catalog_imports", sa.Column("last_error", sa.String(), nullable=True))
+    op.create_index("ix_catalog_imports_status_run_after", "catalog_imports", ["status", "run_after"])
+    op.execute("UPDATE catalog_imports SET progress = 100 WHERE status = 'done'")
+    op.execute("UPDATE catalog_imports SET status = 'uploaded' WHERE status = 'queued'")
+
+
+def downgrade() -> None:
+    op.execute("UPDATE catalog_imports SET status = 'queued' WHERE status = 'uploaded'")
+    op.execute("UPDATE catalog_imports SET status = 'failed' WHERE status = 'cancelled'")
+    op.drop_index("ix_catalog_imports_status_run_after", table_name="catalog_imports")
+    op.drop_column("catalog_imports", "last_error")
+    op.drop_column("catalog_imports", "locked_by")
+    op.drop_column("catalog_imports", "heartbeat_at")
+    op.drop_column("catalog_imports", "run_after")
+    op.drop_column("catalog_imports", "cancel_requested")
+    op.drop_column("catalog_imports", "attempts")
+    op.drop_column("catalog_imports", "progress")
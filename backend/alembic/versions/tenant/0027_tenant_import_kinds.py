@@ -0,0 +1,27 @@
+"""Add import kind to catalog imports.
+
+Revision ID: tenant_0027
+Revises: tenant_0026
+Create Date: 2026-03-21 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0027"
+down_revision = "tenant_0026"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "catalog_imports",
+        sa.Column("kind", sa.String(), nullable=False, server_default="products"),
+    )
+    op.create_index("ix_stock_moves_ref_id", "stock_moves", ["ref_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_stock_moves_ref_id", table_name="stock_moves")
+    op.drop_column("catalog_imports", "kind")
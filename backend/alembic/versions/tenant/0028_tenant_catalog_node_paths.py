@@ -0,0 +1,57 @@
+"""Add closure table for catalog nodes.
+
+Revision ID: tenant_0028
+Revises: tenant_0027
+Create Date: 2026-03-22 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "tenant_0028"
+down_revision = "tenant_0027"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_node_paths",
+        sa.Column(
+            "ancestor_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("catalog_nodes.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column(
+            "descendant_id",
+            UUID(as_uuid=True),
+            sa.ForeignKey("catalog_nodes.id", ondelete="CASCADE"),
+            primary_key=True,
+            nullable=False,
+        ),
+        sa.Column("depth", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_catalog_node_paths_descendant_id", "catalog_node_paths", ["descendant_id"])
+    op.create_index("ix_products_hierarchy_node_id", "products", ["hierarchy_node_id"])
+    op.execute(
+        """
+        WITH RECURSIVE tree(ancestor_id, descendant_id, depth) AS (
+            SELECT id, id, 0 FROM catalog_nodes
+            UNION ALL
+            SELECT tree.ancestor_id, node.id, tree.depth + 1
+            FROM tree JOIN catalog_nodes node ON node.parent_id = tree.descendant_id
+            WHERE tree.depth < 64
+        )
+        INSERT INTO catalog_node_paths (ancestor_id, descendant_id, depth)
+        SELECT ancestor_id, descendant_id, min(depth) FROM tree GROUP BY ancestor_id, descendant_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_hierarchy_node_id", table_name="products")
+    op.drop_index("ix_catalog_node_paths_descendant_id", table_name="catalog_node_paths")
+    op.drop_table("catalog_node_paths")
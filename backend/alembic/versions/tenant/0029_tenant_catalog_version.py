@@ -0,0 +1,49 @@
+"""Add catalog version counter and product keyset index.
+
+Revision ID: tenant_0029
+Revises: tenant_0028
+Create Date: 2026-03-23 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0029"
+down_revision = "tenant_0028"
+branch_labels = None
+depends_on = None
+
+CATALOG_TABLES = ("products", "categories", "brands", "product_lines")
+
+
+def upgrade() -> None:
+    op.create_table(
+        "catalog_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute("INSERT INTO catalog_state (id, version, updated_at) VALUES (1, 1, now())")
+    bind = op.get_bind()
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    schema = bind.dialect.identifier_preparer.quote(current_schema)
+    op.execute(
+        "CREATE OR REPLACE FUNCTION catalog_bump_version() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"UPDATE {schema}.catalog_state SET version = version + 1, updated_at = now() WHERE id = 1; "
+        "RETURN NULL; END $$"
+    )
+    for table in CATALOG_TABLES:
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION catalog_bump_version()"
+        )
+    op.execute("CREATE INDEX ix_products_lower_name_id ON products (lower(name), id)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_products_lower_name_id")
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS catalog_bump_version()")
+    op.drop_table("catalog_state")
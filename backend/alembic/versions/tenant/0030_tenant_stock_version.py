@@ -0,0 +1,37 @@
+"""Add stock change sequence for public catalog snapshots.
+
+Revision ID: tenant_0030
+Revises: tenant_0029
+Create Date: 2026-03-24 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0030"
+down_revision = "tenant_0029"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    schema = bind.dialect.identifier_preparer.quote(current_schema)
+    op.execute("CREATE SEQUENCE IF NOT EXISTS stock_moves_version_seq")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION stock_bump_version() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"PERFORM nextval('{schema}.stock_moves_version_seq'); "
+        "RETURN NULL; END $$"
+    )
+    op.execute(
+        "CREATE TRIGGER stock_moves_stock_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON stock_moves "
+        "FOR EACH STATEMENT EXECUTE FUNCTION stock_bump_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stock_moves_stock_version ON stock_moves")
+    op.execute("DROP FUNCTION IF EXISTS stock_bump_version()")
+    op.execute("DROP SEQUENCE IF EXISTS stock_moves_version_seq")
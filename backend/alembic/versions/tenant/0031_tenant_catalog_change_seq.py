@@ -0,0 +1,70 @@
+"""Add catalog change sequence and deletion log for POS delta sync.
+
+Revision ID: tenant_0031
+Revises: tenant_0030
+Create Date: 2026-03-25 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import UUID
+
+revision = "tenant_0031"
+down_revision = "tenant_0030"
+branch_labels = None
+depends_on = None
+
+CHANGE_TABLES = ("products", "categories", "brands", "product_lines")
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    schema = bind.dialect.identifier_preparer.quote(current_schema)
+    op.create_table(
+        "catalog_deletions",
+        sa.Column("entity", sa.String(), primary_key=True),
+        sa.Column("entity_id", UUID(as_uuid=True), primary_key=True),
+        sa.Column("change_seq", sa.BigInteger(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.create_index("ix_catalog_deletions_change_seq", "catalog_deletions", ["change_seq"])
+    op.execute(
+        "CREATE OR REPLACE FUNCTION catalog_set_change_seq() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        "NEW.change_seq := pg_current_xact_id()::text::bigint; "
+        "RETURN NEW; END $$"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION catalog_log_deletion() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"INSERT INTO {schema}.catalog_deletions (entity, entity_id, change_seq, deleted_at) "
+        "VALUES (TG_TABLE_NAME, OLD.id, pg_current_xact_id()::text::bigint, now()) "
+        "ON CONFLICT (entity, entity_id) DO UPDATE SET change_seq = EXCLUDED.change_seq, deleted_at = EXCLUDED.deleted_at; "
+        "RETURN OLD; END $$"
+    )
+    for table in CHANGE_TABLES:
+        op.add_column(table, sa.Column("change_seq", sa.BigInteger(), nullable=True))
+        op.execute(f"UPDATE {table} SET change_seq = pg_current_xact_id()::text::bigint")
+        op.alter_column(table, "change_seq", nullable=False, server_default="0")
+        op.create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+        op.execute(
+            f"CREATE TRIGGER {table}_change_seq BEFORE INSERT OR UPDATE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION catalog_set_change_seq()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_log_deletion AFTER DELETE ON {table} "
+            "FOR EACH ROW EXECUTE FUNCTION catalog_log_deletion()"
+        )
+
+
+def downgrade() -> None:
+    for table in CHANGE_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_log_deletion ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_change_seq ON {table}")
+        op.drop_index(f"ix_{table}_change_seq", table_name=table)
+        op.drop_column(table, "change_seq")
+    op.execute("DROP FUNCTION IF EXISTS catalog_log_deletion()")
+    op.execute("DROP FUNCTION IF EXISTS catalog_set_change_seq()")
+    op.drop_index("ix_catalog_deletions_change_seq", table_name="catalog_deletions")
+    op.drop_table("catalog_deletions")
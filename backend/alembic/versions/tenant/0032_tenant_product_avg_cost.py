@@ -0,0 +1,31 @@
+"""Add moving average cost to products.
+
+Revision ID: tenant_0032
+Revises: tenant_0031
+Create Date: 2026-03-26 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0032"
+down_revision = "tenant_0031"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("avg_cost", sa.Numeric(14, 4), nullable=False, server_default="0"))
+    op.execute(
+        "UPDATE products SET avg_cost = CASE WHEN purchase_price > 0 THEN purchase_price ELSE cost_price END"
+    )
+    op.execute(
+        "UPDATE products p SET avg_cost = b.total_cost / b.total_qty "
+        "FROM (SELECT product_id, sum(quantity * unit_cost) AS total_cost, sum(quantity) AS total_qty "
+        "FROM stock_batches WHERE quantity > 0 GROUP BY product_id) b "
+        "WHERE b.product_id = p.id AND b.total_qty > 0"
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "avg_cost")
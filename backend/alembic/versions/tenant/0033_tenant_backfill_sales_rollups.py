@@ -0,0 +1,28 @@
+"""Backfill sales daily rollups from sales history.
+
+Revision ID: tenant_0033
+Revises: tenant_0032
+Create Date: 2026-03-27 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "tenant_0033"
+down_revision = "tenant_0032"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute(
+        "INSERT INTO sales_daily_rollups (store_id, business_date, sales_count, gmv, refreshed_at) "
+        "SELECT store_id, business_date, count(id), coalesce(sum(total_amount), 0), now() "
+        "FROM sales WHERE status = 'completed' "
+        "GROUP BY store_id, business_date "
+        "ON CONFLICT (store_id, business_date) DO UPDATE SET "
+        "sales_count = EXCLUDED.sales_count, gmv = EXCLUDED.gmv, refreshed_at = EXCLUDED.refreshed_at"
+    )
+
+
+def downgrade() -> None:
+    pass
@@ -0,0 +1,75 @@
+"""Move catalog version counter to a sequence.
+
+Revision ID: tenant_0034
+Revises: tenant_0033
+Create Date: 2026-03-28 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0034"
+down_revision = "tenant_0033"
+branch_labels = None
+depends_on = None
+
+CATALOG_TABLES = ("products", "categories", "brands", "product_lines")
+
+
+def _schema() -> str:
+    bind = op.get_bind()
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    return bind.dialect.identifier_preparer.quote(current_schema)
+
+
+def upgrade() -> None:
+    schema = _schema()
+    op.execute("CREATE SEQUENCE IF NOT EXISTS catalog_version_seq")
+    op.execute(
+        "SELECT setval('catalog_version_seq', greatest(coalesce((SELECT version FROM catalog_state WHERE id = 1), 1), 1))"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION catalog_bump_version() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"PERFORM nextval('{schema}.catalog_version_seq'); "
+        "RETURN NULL; END $$"
+    )
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+        op.execute(
+            f"CREATE CONSTRAINT TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE ON {table} "
+            "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION catalog_bump_version()"
+        )
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version_truncate AFTER TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION catalog_bump_version()"
+        )
+    op.drop_table("catalog_state")
+
+
+def downgrade() -> None:
+    schema = _schema()
+    op.create_table(
+        "catalog_state",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("version", sa.BigInteger(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.execute(
+        "INSERT INTO catalog_state (id, version, updated_at) "
+        "SELECT 1, last_value, now() FROM catalog_version_seq"
+    )
+    op.execute(
+        "CREATE OR REPLACE FUNCTION catalog_bump_version() RETURNS trigger "
+        "LANGUAGE plpgsql AS $$ BEGIN "
+        f"UPDATE {schema}.catalog_state SET version = version + 1, updated_at = now() WHERE id = 1; "
+        "RETURN NULL; END $$"
+    )
+    for table in CATALOG_TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version_truncate ON {table}")
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_catalog_version ON {table}")
+        op.execute(
+            f"CREATE TRIGGER {table}_catalog_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON {table} "
+            "FOR EACH STATEMENT EXECUTE FUNCTION catalog_bump_version()"
+        )
+    op.execute("DROP SEQUENCE IF EXISTS catalog_version_seq")
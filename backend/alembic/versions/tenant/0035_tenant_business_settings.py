@@ -0,0 +1,47 @@
+"""Store business timezone in a settings table.
+
+Revision ID: tenant_0035
+Revises: tenant_0034
+Create Date: 2026-03-29 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0035"
+down_revision = "tenant_0034"
+branch_labels = None
+depends_on = None
+
+
+def _schema(bind) -> str:
+    current_schema = bind.execute(sa.text("SELECT current_schema()")).scalar()
+    return bind.dialect.identifier_preparer.quote(current_schema)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    schema = _schema(bind)
+    op.create_table(
+        "business_settings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("timezone", sa.String(), nullable=False, server_default="UTC"),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute("INSERT INTO business_settings (id, timezone) VALUES (1, business_timezone())")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION business_timezone() RETURNS text "
+        "LANGUAGE sql STABLE AS $$ "
+        f"SELECT coalesce((SELECT timezone FROM {schema}.business_settings WHERE id = 1), 'UTC') $$"
+    )
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    timezone_name = bind.execute(sa.text("SELECT business_timezone()")).scalar() or "UTC"
+    timezone_name = timezone_name.replace("'", "''")
+    op.execute(
+        "CREATE OR REPLACE FUNCTION business_timezone() RETURNS text "
+        f"LANGUAGE sql IMMUTABLE AS $$ SELECT '{timezone_name}'::text $$"
+    )
+    op.drop_table("business_settings")
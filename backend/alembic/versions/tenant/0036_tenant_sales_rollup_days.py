@@ -0,0 +1,39 @@
+"""Track sales rollup coverage per day.
+
+Revision ID: tenant_0036
+Revises: tenant_0035
+Create Date: 2026-03-30 00:00:00.000000
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "tenant_0036"
+down_revision = "tenant_0035"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "sales_rollup_days",
+        sa.Column("business_date", sa.Date(), primary_key=True, nullable=False),
+        sa.Column("refreshed_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+    )
+    op.execute("DELETE FROM sales_daily_rollups")
+    op.execute(
+        "INSERT INTO sales_daily_rollups (store_id, business_date, sales_count, gmv, refreshed_at) "
+        "SELECT store_id, business_date, count(id), coalesce(sum(total_amount), 0), now() "
+        "FROM sales WHERE status = 'completed' "
+        "GROUP BY store_id, business_date"
+    )
+    op.execute(
+        "INSERT INTO sales_rollup_days (business_date, refreshed_at) "
+        "SELECT day::date, now() FROM generate_series("
+        "(SELECT min(business_date) FROM sales), "
+        "(now() AT TIME ZONE business_timezone())::date - 1, interval '1 day') AS day"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("sales_rollup_days")
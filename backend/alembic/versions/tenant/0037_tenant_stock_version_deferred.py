@@ -0,0 +1,34 @@
+"""Bump stock version when stock move writers commit.
+
+Revision ID: tenant_0037
+Revises: tenant_0036
+Create Date: 2026-03-31 00:00:00.000000
+"""
+
+from alembic import op
+
+revision = "tenant_0037"
+down_revision = "tenant_0036"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stock_moves_stock_version ON stock_moves")
+    op.execute(
+        "CREATE CONSTRAINT TRIGGER stock_moves_stock_version AFTER INSERT OR UPDATE OR DELETE ON stock_moves "
+        "DEFERRABLE INITIALLY DEFERRED FOR EACH ROW EXECUTE FUNCTION stock_bump_version()"
+    )
+    op.execute(
+        "CREATE TRIGGER stock_moves_stock_version_truncate AFTER TRUNCATE ON stock_moves "
+        "FOR EACH STATEMENT EXECUTE FUNCTION stock_bump_version()"
+    )
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER IF EXISTS stock_moves_stock_version_truncate ON stock_moves")
+    op.execute("DROP TRIGGER IF EXISTS stock_moves_stock_version ON stock_moves")
+    op.execute(
+        "CREATE TRIGGER stock_moves_stock_version AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON stock_moves "
+        "FOR EACH STATEMENT EXECUTE FUNCTION stock_bump_version()"
+    )
@@ -1,6 +1,8 @@
 import uuid
 
-from fastapi import APIRouter, Depends, Request
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db_session, get_current_tenant, require_roles, require_module
@@ -18,18 +20,25 @@ from app.schemas.catalog import (
     ProductUpdate,
     ProductOut,
     ProductUnit,
+    ProductBulkCreate,
+    ProductBulkResponse,
+    ProductBulkUpdate,
+    ProductPriceList,
+    CatalogChangesOut,
 )
 from app.schemas.catalog_hierarchy import (
     CatalogHierarchyResponse,
     CatalogNodeCreate,
     CatalogNodeOut,
     CatalogNodeUpdate,
+    CatalogTreeNode,
 )
-from app.services.catalog_service import CatalogService
-from app.repos.catalog_repo import CategoryRepo, BrandRepo, ProductLineRepo, ProductRepo, CategoryBrandRepo
+from app.services.catalog_service import CatalogService, catalog_etag
+from app.repos.catalog_repo import CategoryRepo, BrandRepo, ProductLineRepo, ProductRepo, CategoryBrandRepo, CatalogChangeRepo
 from app.repos.catalog_nodes_repo import CatalogNodeRepo
 from app.repos.tenant_settings_repo import TenantSettingsRepo
 from app.services.catalog_hierarchy_service import CatalogHierarchyService
+from app.services.catalog_sync_service import CatalogSyncService
 
 router = APIRouter(
     prefix="",
@@ -41,6 +50,16 @@ router = APIRouter(
     ],
 )
 
+sync_router = APIRouter(
+    prefix="",
+    tags=["catalog"],
+    dependencies=[
+        Depends(require_roles({"owner", "admin", "cashier"})),
+        Depends(get_current_tenant),
+        Depends(require_module("catalog")),
+    ],
+)
+
 
 def get_catalog_service(session: AsyncSession):
     return CatalogService(
@@ -59,6 +78,14 @@ def get_catalog_hierarchy_service(session: AsyncSession):
     )
 
 
+def _etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {value.strip().removeprefix("W/") for value in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
 @router.get("/categories", response_model=list[CategoryOut])
 async def list_categories(request: Request, session: AsyncSession = Depends(get_db_session)):
     service = get_catalog_service(session)
@@ -82,6 +109,16 @@ async def list_catalog_nodes(
     return await service.list_nodes(parent_id=parent_id, level_code=level_code)
 
 
+@router.get("/catalog/nodes/tree", response_model=list[CatalogTreeNode])
+async def get_catalog_tree(
+    root_id: uuid.UUID | None = None,
+    session: AsyncSession = Depends(get_db_session),
+    tenant=Depends(get_current_tenant),
+):
+    service = get_catalog_hierarchy_service(session)
+    return await service.get_tree(root_id)
+
+
 @router.post("/catalog/nodes", response_model=CatalogNodeOut)
 async def create_catalog_node(
     payload: CatalogNodeCreate,
@@ -234,9 +271,18 @@ async def list_products(
     line_id: str | None = None,
     q: str | None = None,
     is_active: bool | None = True,
+    fields: str | None = None,
+    limit: int | None = Query(default=None, ge=1, le=1000),
+    cursor: str | None = None,
     session: AsyncSession = Depends(get_db_session),
+    tenant=Depends(get_current_tenant),
 ):
     service = get_catalog_service(session)
+    scope = f"{tenant.id}?" + "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    etag = catalog_etag(await service.catalog_version(), scope)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if _etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
     filters = {
         "sku": sku,
         "barcode": barcode,
@@ -247,7 +293,11 @@ async def list_products(
         "q": q,
         "is_active": is_active,
     }
-    return await service.list_products(filters)
+    field_names = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    items, next_cursor = await service.list_products_page(filters, fields=field_names, limit=limit, cursor=cursor)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return JSONResponse(to_jsonable_python(items), headers=headers)
 
 
 @router.post("/products", response_model=ProductOut)
@@ -257,6 +307,24 @@ async def create_product(payload: ProductCreate, request: Request, session: Asyn
     return await service.create_product(payload.model_dump(), tenant_id=tenant_id)
 
 
+@router.post("/products/bulk", response_model=ProductBulkResponse)
+async def bulk_create_products(payload: ProductBulkCreate, session: AsyncSession = Depends(get_db_session)):
+    service = get_catalog_service(session)
+    return await service.bulk_create_products([item.model_dump() for item in payload.items])
+
+
+@router.patch("/products/bulk", response_model=ProductBulkResponse)
+async def bulk_update_products(payload: ProductBulkUpdate, session: AsyncSession = Depends(get_db_session)):
+    service = get_catalog_service(session)
+    return await service.bulk_update_products([item.model_dump() for item in payload.items])
+
+
+@router.patch("/products/prices", response_model=ProductBulkResponse)
+async def update_product_prices(payload: ProductPriceList, session: AsyncSession = Depends(get_db_session)):
+    service = get_catalog_service(session)
+    return await service.update_prices([item.model_dump() for item in payload.items])
+
+
 @router.get("/products/{product_id}", response_model=ProductOut)
 async def get_product(product_id: str, request: Request, session: AsyncSession = Depends(get_db_session)):
     service = get_catalog_service(session)
@@ -281,3 +349,13 @@ async def delete_all_products(request: Request, session: AsyncSession = Depends(
     service = get_catalog_service(session)
     deleted_count = await service.delete_all_products()
     return {"detail": "deleted", "deleted_count": deleted_count}
+
+
+@sync_router.get("/catalog/changes", response_model=CatalogChangesOut)
+async def list_catalog_changes(
+    since: int = Query(default=0, ge=0),
+    limit: int = Query(default=1000, ge=1, le=5000),
+    session: AsyncSession = Depends(get_db_session),
+):
+    service = CatalogSyncService(CatalogChangeRepo(session))
+    return await service.changes(since, limit)
@@ -1,9 +1,13 @@
 from datetime import date, datetime
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.db import get_sessionmaker
+from app.core.db_utils import set_search_path
+
 from app.core.deps import (
     get_current_tenant,
     get_current_user,
@@ -12,6 +16,7 @@ from app.core.deps import (
     require_roles,
 )
 from app.repos.finance_repo import (
+    AccountingPeriodRepo,
     ExpenseAccrualRepo,
     ExpenseCategoryRepo,
     ExpenseRepo,
@@ -19,6 +24,7 @@ from app.repos.finance_repo import (
 )
 from app.repos.store_repo import StoreRepo
 from app.schemas.finance import (
+    AccountingPeriodOut,
     ExpenseCategoryCreate,
     ExpenseCategoryOut,
     ExpenseCreate,
@@ -26,6 +32,7 @@ from app.schemas.finance import (
     RecurringExpenseCreate,
     RecurringExpenseOut,
     RecurringExpenseUpdate,
+    ProfitLossComparisonResponse,
     ProfitLossResponse,
 )
 from app.services.finance_service import AccrualService, FinanceService
@@ -49,6 +56,7 @@ def get_service(session: AsyncSession):
         recurring_repo,
         AccrualService(recurring_repo, ExpenseAccrualRepo(session)),
         StoreRepo(session),
+        AccountingPeriodRepo(session),
     )
 
 
@@ -131,16 +139,80 @@ async def delete_recurring_expense(
     return await get_service(session).delete_recurring_expense(recurring_expense_id)
 
 
+async def _stream_profit_loss(schema: str | None, store_id: uuid.UUID, date_from: date, date_to: date):
+    async with get_sessionmaker()() as session:
+        if schema:
+            await set_search_path(session, schema)
+        async for line in get_service(session).stream_profit_loss(store_id, date_from, date_to):
+            yield line
+
+
 @router.get("/profit-loss", response_model=ProfitLossResponse)
 async def profit_loss(
+    request: Request,
     store_id: uuid.UUID | None = None,
     date_from: date | None = None,
     date_to: date | None = None,
+    stream: bool = False,
     session: AsyncSession = Depends(get_db_session),
 ):
     today = datetime.utcnow().date()
-    return await get_service(session).profit_loss(
-        store_id=store_id,
+    date_from = date_from or today
+    date_to = date_to or today
+    service = get_service(session)
+    if stream:
+        service.validate_range(date_from, date_to)
+        store_id = await service.resolve_store_id(store_id)
+        return StreamingResponse(
+            _stream_profit_loss(getattr(request.state, "tenant_schema", None), store_id, date_from, date_to),
+            media_type="application/x-ndjson",
+        )
+    return await service.profit_loss(store_id=store_id, date_from=date_from, date_to=date_to)
+
+
+@router.get("/profit-loss/compare", response_model=ProfitLossComparisonResponse)
+async def compare_profit_loss(
+    store_ids: list[uuid.UUID] | None = Query(default=None),
+    date_from: date | None = None,
+    date_to: date | None = None,
+    bucket: str = "day",
+    session: AsyncSession = Depends(get_db_session),
+):
+    today = datetime.utcnow().date()
+    return await get_service(session).compare_profit_loss(
+        store_ids=store_ids,
         date_from=date_from or today,
         date_to=date_to or today,
+        bucket=bucket,
     )
+
+
+@router.get("/periods", response_model=list[AccountingPeriodOut])
+async def list_periods(session: AsyncSession = Depends(get_db_session)):
+    return await get_service(session).list_periods()
+
+
+@router.post(
+    "/periods/{month}/close",
+    response_model=AccountingPeriodOut,
+    dependencies=[Depends(require_roles({"owner", "admin"}))],
+)
+async def close_period(
+    month: date,
+    session: AsyncSession = Depends(get_db_session),
+    current_user=Depends(get_current_user),
+):
+    return await get_service(session).close_period(month, current_user.id)
+
+
+@router.post(
+    "/periods/{month}/reopen",
+    response_model=AccountingPeriodOut,
+    dependencies=[Depends(require_roles({"owner", "admin"}))],
+)
+async def reopen_period(
+    month: date,
+    session: AsyncSession = Depends(get_db_session),
+    current_user=Depends(get_current_user),
+):
+    return await get_service(session).reopen_period(month, current_user.id)
@@ -1,8 +1,9 @@
 import csv
 import io
 import uuid
+from datetime import datetime
 
-from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, HTTPException, UploadFile
+from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
@@ -10,13 +11,15 @@ from app.core.db import get_sessionmaker
 from app.core.db_utils import set_search_path
 from app.core.deps import get_current_tenant, get_current_user, get_db_session, require_roles
 from app.repos.imports_repo import ImportsRepo
-from app.schemas.imports import ImportMode
+from app.schemas.imports import ImportKind, ImportMode
+from app.services.import_parser import spooled_upload
 from app.services.import_service import ImportService
 
 
 class ImportOut(BaseModel):
     id: uuid.UUID
     filename: str
+    kind: str
     status: str
     sheet_name: str | None
     encoding: str
@@ -24,9 +27,23 @@ class ImportOut(BaseModel):
     rows_total: int
     rows_valid: int
     rows_invalid: int
+    progress: int = 0
     columns: list[str] = Field(default_factory=list)
 
 
+class ImportProgressOut(BaseModel):
+    id: uuid.UUID
+    status: str
+    progress: int
+    counters: dict[str, int] = Field(default_factory=dict)
+    attempts: int
+    cancel_requested: bool
+    last_error: str | None
+    heartbeat_at: datetime | None
+    started_at: datetime | None
+    finished_at: datetime | None
+
+
 class ImportPreviewRequest(BaseModel):
     import_id: uuid.UUID
     mapping: dict[str, str]
@@ -62,6 +79,7 @@ def _to_out(item) -> ImportOut:
     return ImportOut(
         id=item.id,
         filename=item.filename,
+        kind=item.kind,
         status=item.status,
         sheet_name=item.sheet_name,
         encoding=item.encoding,
@@ -69,16 +87,33 @@ def _to_out(item) -> ImportOut:
         rows_total=item.rows_total,
         rows_valid=item.rows_valid,
         rows_invalid=item.rows_invalid,
+        progress=item.progress,
         columns=[],
     )
 
 
+def _to_progress(item) -> ImportProgressOut:
+    return ImportProgressOut(
+        id=item.id,
+        status=item.status,
+        progress=item.progress,
+        counters=item.counters or {},
+        attempts=item.attempts,
+        cancel_requested=item.cancel_requested,
+        last_error=item.last_error,
+        heartbeat_at=item.heartbeat_at,
+        started_at=item.started_at,
+        finished_at=item.finished_at,
+    )
+
+
 @router.post("/catalog/upload", response_model=ImportOut)
 async def upload_catalog_import(
     file: UploadFile = File(...),
     sheet_name: str | None = Form(default=None),
     encoding: str = Form(default="utf-8"),
     delimiter: str = Form(default=","),
+    kind: ImportKind = Form(default=ImportKind.products),
     tenant=Depends(get_current_tenant),
     current_user=Depends(get_current_user),
     session=Depends(get_db_session),
@@ -86,39 +121,43 @@ async def upload_catalog_import(
     if len(delimiter) != 1:
         raise HTTPException(status_code=400, detail="Delimiter must be a single character")
 
-    raw = await file.read()
-    if not raw:
-        raise HTTPException(status_code=400, detail="Uploaded file is empty")
-
     service = ImportService(session, ImportsRepo(session))
-    try:
-        parsed = service.parse_file(raw, filename=file.filename, sheet=sheet_name, encoding=encoding, delimiter=delimiter)
-    except UnicodeDecodeError as exc:
-        raise HTTPException(status_code=400, detail=f"Failed to decode file with encoding '{encoding}'") from exc
-    except csv.Error as exc:
-        raise HTTPException(status_code=400, detail="Failed to parse CSV") from exc
-    except ValueError as exc:
-        raise HTTPException(status_code=400, detail=str(exc)) from exc
-
-    record = await service.imports_repo.create_job(
-        {
-            "filename": file.filename or "uploaded.csv",
-            "status": "queued",
-            "mode": "sync",
-            "sheet_name": sheet_name,
-            "encoding": encoding,
-            "delimiter": delimiter,
-            "uploaded_by": current_user.id,
-            "rows_total": len(parsed["rows"]),
-            "rows_valid": len(parsed["rows"]),
-            "rows_invalid": 0,
-            "source_rows": parsed["rows"],
-            "errors": [],
-            "mapping": {},
-            "options": {},
-            "counters": {},
-        }
-    )
+    async with spooled_upload(file) as (source_path, size):
+        if not size:
+            raise HTTPException(status_code=400, detail="Uploaded file is empty")
+        record = await service.imports_repo.create_job(
+            {
+                "filename": file.filename or "uploaded.csv",
+                "status": "uploaded",
+                "kind": kind.value,
+                "mode": "sync",
+                "sheet_name": sheet_name,
+                "encoding": encoding,
+                "delimiter": delimiter,
+                "uploaded_by": current_user.id,
+                "rows_total": 0,
+                "rows_valid": 0,
+                "rows_invalid": 0,
+                "errors": [],
+                "mapping": {},
+                "options": {},
+                "counters": {},
+            }
+        )
+        try:
+            parsed = await service.stage_upload(
+                record.id, source_path, filename=file.filename, sheet=sheet_name, encoding=encoding, delimiter=delimiter
+            )
+        except (UnicodeDecodeError, LookupError) as exc:
+            raise HTTPException(status_code=400, detail=f"Failed to decode file with encoding '{encoding}'") from exc
+        except csv.Error as exc:
+            raise HTTPException(status_code=400, detail="Failed to parse CSV") from exc
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+    record.rows_total = parsed["rows"]
+    record.rows_valid = parsed["rows"]
+    await session.flush()
     out = _to_out(record)
     out.columns = parsed["columns"]
     return out
@@ -133,40 +172,25 @@ async def preview_catalog_import(
     return await service.preview_import(payload.import_id, payload.mapping, payload.options)
 
 
-async def _perform_import_background(tenant_schema: str, import_id: uuid.UUID, mapping: dict[str, str], options: dict):
-    sessionmaker = get_sessionmaker()
-    async with sessionmaker() as session:
-        await set_search_path(session, tenant_schema)
-        service = ImportService(session, ImportsRepo(session))
-        try:
-            await service.perform_import(import_id, mapping, options)
-            await session.commit()
-        except Exception:
-            await service.imports_repo.update_status(import_id, "failed")
-            await session.commit()
-
-
 @router.post("/catalog/apply", response_model=ImportApplyResponse)
 async def apply_catalog_import(
     payload: ImportApplyRequest,
-    background_tasks: BackgroundTasks,
     tenant=Depends(get_current_tenant),
     session=Depends(get_db_session),
 ):
     service = ImportService(session, ImportsRepo(session))
 
     if payload.mode == ImportMode.background:
-        await service.imports_repo.update_status(payload.import_id, "queued")
-        background_tasks.add_task(
-            _perform_import_background,
-            tenant.code,
-            payload.import_id,
-            payload.mapping,
-            payload.options,
-        )
-        return ImportApplyResponse(import_id=payload.import_id, status="queued", mode=payload.mode, counters={})
+        job = await service.queue_import(payload.import_id, payload.mapping, payload.options)
+        return ImportApplyResponse(import_id=job.id, status=job.status, mode=payload.mode, counters={})
 
-    counters = await service.perform_import(payload.import_id, payload.mapping, payload.options)
+    job = await service.imports_repo.get_import(payload.import_id)
+    if job and job.status in {"queued", "running"}:
+        raise HTTPException(status_code=409, detail="Import is already queued or running")
+
+    counters = await service.perform_import(
+        payload.import_id, payload.mapping, payload.options, schema=tenant.code
+    )
     return ImportApplyResponse(import_id=payload.import_id, status="done", mode=payload.mode, counters=counters)
 
 
@@ -186,18 +210,47 @@ async def get_import(import_id: uuid.UUID, session=Depends(get_db_session)):
     return _to_out(item)
 
 
+@router.get("/{import_id}/progress", response_model=ImportProgressOut)
+async def get_import_progress(import_id: uuid.UUID, session=Depends(get_db_session)):
+    item = await ImportsRepo(session).get_import(import_id)
+    if not item:
+        raise HTTPException(status_code=404, detail="Import not found")
+    return _to_progress(item)
+
+
+@router.post("/{import_id}/cancel", response_model=ImportProgressOut)
+async def cancel_import(import_id: uuid.UUID, session=Depends(get_db_session)):
+    item = await ImportService(session, ImportsRepo(session)).cancel_import(import_id)
+    return _to_progress(item)
+
+
+async def _stream_import_errors(tenant_schema: str, import_id: uuid.UUID):
+    stream = io.StringIO()
+    writer = csv.writer(stream)
+    writer.writerow(["row", "error"])
+    yield stream.getvalue()
+    async with get_sessionmaker()() as session:
+        await set_search_path(session, tenant_schema)
+        async for chunk in ImportsRepo(session).iter_row_chunks(import_id, with_errors=True):
+            stream = io.StringIO()
+            writer = csv.writer(stream)
+            writer.writerows([row.row_number, row.error] for row in chunk)
+            yield stream.getvalue()
+
+
 @router.get("/{import_id}/errors")
-async def download_import_errors(import_id: uuid.UUID, session=Depends(get_db_session)):
+async def download_import_errors(
+    import_id: uuid.UUID,
+    tenant=Depends(get_current_tenant),
+    session=Depends(get_db_session),
+):
     repo = ImportsRepo(session)
     item = await repo.get_import(import_id)
     if not item:
         raise HTTPException(status_code=404, detail="Import not found")
 
-    stream = io.StringIO()
-    writer = csv.DictWriter(stream, fieldnames=["row", "error"])
-    writer.writeheader()
-    writer.writerows(item.errors or [])
-
     filename = f"import-errors-{import_id}.csv"
     headers = {"Content-Disposition": f'attachment; filename="{filename}"'}
-    return StreamingResponse(iter([stream.getvalue()]), media_type="text/csv", headers=headers)
+    return StreamingResponse(
+        _stream_import_errors(tenant.code, import_id), media_type="text/csv", headers=headers
+    )
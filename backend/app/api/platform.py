@@ -1,4 +1,5 @@
 import logging
+from datetime import date
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +10,7 @@ from app.core.deps import get_db_session, require_platform_auth, require_platfor
 from app.core.db_utils import list_tables
 from app.core.security import create_platform_token
 from app.schemas.platform import (
+    PlatformAnalyticsResponse,
     PlatformModuleCreate,
     PlatformModuleResponse,
     PlatformTemplateApply,
@@ -31,6 +33,7 @@ from app.schemas.platform import (
     PlatformTenantUserUpdate,
 )
 from app.schemas.user import TokenOut
+from app.services.platform_analytics_service import PlatformAnalyticsService
 from app.services.platform_service import PlatformService
 
 logger = logging.getLogger(__name__)
@@ -66,6 +69,17 @@ async def login(payload: PlatformLoginPayload, session: AsyncSession = Depends(g
     return TokenOut(access_token=token)
 
 
+@router.get("/analytics", response_model=PlatformAnalyticsResponse)
+async def analytics(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    source: str = "live",
+    refresh: bool = False,
+    session: AsyncSession = Depends(get_db_session),
+):
+    return await PlatformAnalyticsService(session).summary(date_from, date_to, source, refresh)
+
+
 @router.get("/tenants", response_model=list[PlatformTenantResponse])
 async def list_tenants(session: AsyncSession = Depends(get_db_session)):
     service = PlatformService(session)
@@ -1,108 +1,80 @@
+import hashlib
+from datetime import datetime
 from decimal import Decimal
+from email.utils import format_datetime, parsedate_to_datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy import func, select
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.config import get_settings
 from app.core.deps import get_current_tenant, get_db_session
-from app.models.catalog import Brand, Category, Product, ProductLine
-from app.models.platform import Module, TenantModule, TenantSettings
+from app.models.catalog import Product
 from app.models.public_order import PublicOrder, PublicOrderItem
-from app.models.stock import StockMove
 from app.schemas.public_catalog import (
     PublicCatalogOrderCreate,
     PublicCatalogOrderOut,
-    PublicCatalogProductOut,
     PublicCatalogResponse,
 )
+from app.services.public_catalog_service import PublicCatalogService, search_snapshot
 
 router = APIRouter(prefix="/public/catalog", tags=["public-catalog"])
 
 
-async def _catalog_enabled(session: AsyncSession, tenant_id) -> bool:
-    public_catalog_module = await session.scalar(select(Module).where(Module.code == "public_catalog"))
-    if not public_catalog_module or not public_catalog_module.is_active:
-        return False
-    tenant_module = await session.scalar(
-        select(TenantModule).where(
-            TenantModule.module_id == public_catalog_module.id,
-            TenantModule.tenant_id == tenant_id,
-        )
-    )
-    if not tenant_module or not tenant_module.is_enabled:
-        return False
-    tenant_settings = await session.get(TenantSettings, tenant_id)
-    settings_payload = tenant_settings.settings if tenant_settings else {}
-    catalog_settings = settings_payload.get("internet_catalog", {})
-    return bool(catalog_settings.get("is_enabled", False))
+def _not_modified(request: Request, etag: str, last_modified: datetime) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+        return "*" in candidates or etag in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return parsedate_to_datetime(if_modified_since) >= last_modified
+        except (TypeError, ValueError):
+            return False
+    return False
 
 
 @router.get("/products", response_model=PublicCatalogResponse)
 async def list_public_catalog_products(
+    request: Request,
     session: AsyncSession = Depends(get_db_session),
     tenant=Depends(get_current_tenant),
     q: str | None = Query(default=None),
+    category_id: str | None = None,
+    brand_id: str | None = None,
+    line_id: str | None = None,
+    variant_group: str | None = None,
+    in_stock: bool | None = None,
+    offset: int = Query(default=0, ge=0),
+    limit: int | None = Query(default=None, ge=1, le=500),
+    facets: bool = False,
 ):
-    if not await _catalog_enabled(session, tenant.id):
-        return PublicCatalogResponse(items=[])
-
-    on_hand_expr = func.coalesce(func.sum(StockMove.delta_qty), 0)
-    stmt = (
-        select(
-            Product.id,
-            Product.name,
-            Product.sku,
-            Product.image_url,
-            Product.unit,
-            Product.sell_price,
-            Product.variant_group,
-            Product.variant_name,
-            Category.name.label("category"),
-            Brand.name.label("brand"),
-            ProductLine.name.label("line"),
-            on_hand_expr.label("on_hand"),
-        )
-        .join(Category, Category.id == Product.category_id)
-        .join(Brand, Brand.id == Product.brand_id)
-        .outerjoin(ProductLine, ProductLine.id == Product.line_id)
-        .outerjoin(StockMove, StockMove.product_id == Product.id)
-        .where(Product.is_active.is_(True), Product.is_hidden.is_(False))
-        .group_by(
-            Product.id,
-            Product.name,
-            Product.sku,
-            Product.image_url,
-            Product.unit,
-            Product.sell_price,
-            Product.variant_group,
-            Product.variant_name,
-            Category.name,
-            Brand.name,
-            ProductLine.name,
-        )
-        .order_by(func.lower(Product.name), Product.id)
-    )
-    if q:
-        stmt = stmt.where(Product.name.ilike(f"%{q}%"))
-    rows = (await session.execute(stmt)).all()
-    items = [
-        PublicCatalogProductOut(
-            id=str(row.id),
-            name=row.name,
-            sku=row.sku,
-            image_url=row.image_url,
-            unit=row.unit.value if hasattr(row.unit, "value") else str(row.unit),
-            sell_price=row.sell_price,
-            category=row.category,
-            brand=row.brand,
-            line=row.line,
-            on_hand=float(row.on_hand or 0),
-            variant_group=row.variant_group,
-            variant_name=row.variant_name,
-        )
-        for row in rows
-    ]
-    return PublicCatalogResponse(items=items)
+    snapshot = await PublicCatalogService(session).snapshot(tenant)
+    etag = snapshot.etag
+    query = "&".join(f"{key}={value}" for key, value in sorted(request.query_params.multi_items()))
+    if query:
+        etag = f'{etag[:-1]}-{hashlib.sha256(query.encode()).hexdigest()[:8]}"'
+    headers = {
+        "ETag": etag,
+        "Last-Modified": format_datetime(snapshot.last_modified, usegmt=True),
+        "Cache-Control": f"public, max-age={get_settings().public_catalog_http_max_age}",
+    }
+    if _not_modified(request, etag, snapshot.last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    filters = {
+        "q": q,
+        "category_id": category_id,
+        "brand_id": brand_id,
+        "line_id": line_id,
+        "variant_group": variant_group,
+        "in_stock": in_stock,
+    }
+    if not any(value is not None for value in filters.values()) and not offset and not limit and not facets:
+        body = snapshot.body
+    else:
+        body = search_snapshot(snapshot, filters, offset, limit, facets).model_dump_json().encode()
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
 @router.post('/orders', response_model=PublicCatalogOrderOut, status_code=status.HTTP_201_CREATED)
@@ -111,7 +83,7 @@ async def create_public_order(
     session: AsyncSession = Depends(get_db_session),
     tenant=Depends(get_current_tenant),
 ):
-    if not await _catalog_enabled(session, tenant.id):
+    if not await PublicCatalogService(session).is_enabled(tenant):
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Catalog is disabled')
 
     product_ids = [item.product_id for item in payload.items]
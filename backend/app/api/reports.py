@@ -1,6 +1,6 @@
-from datetime import datetime
+from datetime import date, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_db_session, get_current_user, get_current_tenant, require_feature, require_module
@@ -14,8 +14,16 @@ from app.schemas.reports import (
     FinanceOverviewReport,
     TopProductPerformanceReport,
     InventoryValuationReport,
+    ReorderReport,
+    AbcXyzReport,
 )
 from app.models.sales import PaymentProvider
+from app.services.reorder_engine import (
+    DEFAULT_LEAD_TIME_DAYS,
+    DEFAULT_REVIEW_DAYS,
+    DEFAULT_SERVICE_LEVEL_Z,
+    DEFAULT_WINDOW_DAYS,
+)
 
 router = APIRouter(
     prefix="/reports",
@@ -67,6 +75,48 @@ async def stock_alerts(threshold: float, session: AsyncSession = Depends(get_db_
     return await get_service(session).stock_alerts(threshold)
 
 
+@router.get("/reorder-suggestions", response_model=ReorderReport)
+async def reorder_suggestions(
+    window_days: int = Query(DEFAULT_WINDOW_DAYS, ge=1, le=365),
+    lead_time_days: int = Query(DEFAULT_LEAD_TIME_DAYS, ge=0),
+    review_days: int = Query(DEFAULT_REVIEW_DAYS, ge=0),
+    service_level_z: float = Query(DEFAULT_SERVICE_LEVEL_Z, ge=0),
+    only_needed: bool = True,
+    precomputed: bool = False,
+    session: AsyncSession = Depends(get_db_session),
+):
+    service = get_service(session)
+    if precomputed:
+        return await service.reorder_snapshot(only_needed)
+    return await service.reorder_suggestions(
+        window_days, lead_time_days, review_days, service_level_z, only_needed
+    )
+
+
+@router.get("/abc-xyz", response_model=AbcXyzReport)
+async def abc_xyz(
+    date_from: date | None = None,
+    date_to: date | None = None,
+    a_threshold: float = Query(0.8, gt=0, lt=1),
+    b_threshold: float = Query(0.95, gt=0, lt=1),
+    x_threshold: float = Query(0.5, ge=0),
+    y_threshold: float = Query(1.0, ge=0),
+    refresh: bool = False,
+    session: AsyncSession = Depends(get_db_session),
+    tenant=Depends(get_current_tenant),
+):
+    if a_threshold > b_threshold or x_threshold > y_threshold:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid thresholds")
+    return await get_service(session).abc_xyz(
+        tenant.id,
+        date_from,
+        date_to,
+        (a_threshold, b_threshold),
+        (x_threshold, y_threshold),
+        refresh,
+    )
+
+
 @router.get("/taxes", response_model=list[TaxReportItem])
 async def taxes(
     date_from: datetime | None = None,
@@ -1,12 +1,13 @@
 from datetime import datetime
 import uuid
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.deps import get_current_tenant, get_current_user, get_db_session, require_module, require_roles
 from app.models.shifts import CashierShiftStatus
 from app.repos.shifts_repo import CashierShiftRepo
+from app.schemas.sales import SaleOut
 from app.schemas.shifts import ShiftCloseIn, ShiftDetail, ShiftOpenIn, ShiftOut
 from app.services.shifts_service import ShiftsService
 
@@ -73,9 +74,10 @@ async def list_shifts(
 @router.get("/{shift_id}", response_model=ShiftDetail)
 async def get_shift(
     shift_id: uuid.UUID,
+    include_sales: bool = True,
     session: AsyncSession = Depends(get_db_session),
 ):
-    data = await get_service(session).get_shift(shift_id)
+    data = await get_service(session).get_shift(shift_id, include_sales)
     shift = data["shift"]
     return {
         "id": shift.id,
@@ -87,6 +89,17 @@ async def get_shift(
         "opening_cash": shift.opening_cash,
         "closing_cash": shift.closing_cash,
         "note": shift.note,
+        "z_report": shift.z_report,
         "aggregates": data["aggregates"],
         "sales": data["sales"],
     }
+
+
+@router.get("/{shift_id}/sales", response_model=list[SaleOut])
+async def list_shift_sales(
+    shift_id: uuid.UUID,
+    limit: int = Query(default=50, ge=1, le=500),
+    offset: int = Query(default=0, ge=0),
+    session: AsyncSession = Depends(get_db_session),
+):
+    return await get_service(session).list_shift_sales(shift_id, limit, offset)
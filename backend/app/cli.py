@@ -1,8 +1,13 @@
 import argparse
 import asyncio
+import multiprocessing
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
 from sqlalchemy import select
 
+from app.core.business_date import recompute_business_dates
 from app.core.config import get_settings
 from app.core.db import get_engine, get_sessionmaker
 from app.core.db_utils import set_search_path
@@ -10,7 +15,18 @@ from app.core.security import hash_password, verify_password
 from app.models.tenant import Tenant, TenantStatus
 from app.models.user import User, Role, UserRole
 from app.services.bootstrap import apply_template_by_name, ensure_roles, ensure_tenant_schema, seed_platform_defaults
-from app.services.migrations import run_public_migrations, run_tenant_migrations, verify_public_migrations
+from app.services.finance_service import accrue_ahead
+from app.services.migrations import (
+    close_tenant_migration_worker,
+    init_tenant_migration_worker,
+    migrate_tenant_in_worker,
+    pending_tenant_schemas,
+    run_public_migrations,
+    run_tenant_migrations,
+    verify_public_migrations,
+)
+from app.services.platform_analytics_service import rebuild_sales_rollups, refresh_sales_rollups
+from app.services.reports_service import ReportsService
 
 
 async def create_owner(tenant_schema: str):
@@ -55,7 +71,7 @@ async def create_owner(tenant_schema: str):
         await session.commit()
 
 
-async def migrate_all():
+async def migrate_all(concurrency: int = 1):
     await migrate_public()
     await seed_platform_defaults()
     sessionmaker = get_sessionmaker()
@@ -70,8 +86,7 @@ async def migrate_all():
         for tenant in tenants:
             await ensure_tenant_schema(session, tenant.code)
         await session.commit()
-    for tenant in tenants:
-        await migrate_tenant(tenant.code)
+    await migrate_tenants([tenant.code for tenant in tenants], concurrency)
     husky_present = any(tenant.code == "husky" for tenant in tenants)
     settings = get_settings()
     if settings.first_owner_email and settings.first_owner_password and husky_present:
@@ -91,15 +106,123 @@ async def migrate_tenant(schema: str) -> None:
     print(f"Tenant migrations applied for schema={schema}.")
 
 
+async def migrate_tenants(codes: list[str], concurrency: int = 1) -> None:
+    started = time.monotonic()
+    pending = await asyncio.to_thread(pending_tenant_schemas, codes)
+    print(f"Tenant migrations: {len(codes) - len(pending)} of {len(codes)} schemas already at head.")
+    failed: dict[str, str] = {}
+    done = 0
+
+    def report(schema: str, duration: float, error: str | None) -> None:
+        nonlocal done
+        done += 1
+        if error:
+            failed[schema] = error
+            sys.stderr.write(f"[{done}/{len(pending)}] Tenant migrations failed for schema={schema}: {error}\n")
+        else:
+            print(f"[{done}/{len(pending)}] Tenant migrations applied for schema={schema} in {duration:.1f}s.")
+
+    if concurrency <= 1 or len(pending) <= 1:
+        try:
+            for code in pending:
+                report(*await asyncio.to_thread(migrate_tenant_in_worker, code))
+        finally:
+            close_tenant_migration_worker()
+    elif pending:
+        loop = asyncio.get_running_loop()
+        with ProcessPoolExecutor(
+            max_workers=min(concurrency, len(pending)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=init_tenant_migration_worker,
+        ) as pool:
+            futures = [loop.run_in_executor(pool, migrate_tenant_in_worker, code) for code in pending]
+            for future in asyncio.as_completed(futures):
+                report(*await future)
+    print(
+        f"Tenant migrations finished in {time.monotonic() - started:.1f}s: "
+        f"{len(pending) - len(failed)} migrated, {len(codes) - len(pending)} skipped, {len(failed)} failed."
+    )
+    if failed:
+        raise RuntimeError(f"Tenant migrations failed for: {', '.join(sorted(failed))}")
+
+
+async def _run_for_active_tenants(schema: str | None, label: str, action) -> None:
+    sessionmaker = get_sessionmaker()
+    async with sessionmaker() as session:
+        stmt = select(Tenant.code).where(Tenant.status == TenantStatus.active)
+        if schema:
+            stmt = stmt.where(Tenant.code == schema)
+        codes = (await session.execute(stmt)).scalars().all()
+    failed = []
+    for code in codes:
+        async with sessionmaker() as session:
+            try:
+                await set_search_path(session, code)
+                count = await action(session)
+                await session.commit()
+                print(f"{label} refreshed for schema={code}: {count} rows.")
+            except Exception as exc:
+                await session.rollback()
+                failed.append(code)
+                sys.stderr.write(f"{label} refresh failed for schema={code}: {exc}\n")
+    if failed:
+        raise RuntimeError(f"{label} refresh failed for: {', '.join(failed)}")
+
+
+async def refresh_reorder_suggestions(schema: str | None = None) -> None:
+    await _run_for_active_tenants(
+        schema,
+        "Reorder suggestions",
+        lambda session: ReportsService(session).refresh_reorder_snapshot(),
+    )
+
+
+async def refresh_rollups(schema: str | None = None, days: int = 2) -> None:
+    await _run_for_active_tenants(
+        schema,
+        "Sales rollups",
+        lambda session: refresh_sales_rollups(session, days),
+    )
+
+
+async def accrue_expenses(schema: str | None = None, days: int | None = None) -> None:
+    await _run_for_active_tenants(
+        schema,
+        "Expense accruals",
+        lambda session: accrue_ahead(session, days),
+    )
+
+
+async def _recompute_business_dates(session) -> int:
+    updated = await recompute_business_dates(session)
+    await rebuild_sales_rollups(session)
+    return updated
+
+
+async def recompute_dates(schema: str | None = None) -> None:
+    await _run_for_active_tenants(schema, "Business dates", _recompute_business_dates)
+
+
 def main():
     parser = argparse.ArgumentParser()
     subparsers = parser.add_subparsers(dest="command")
     create_owner_parser = subparsers.add_parser("create-owner")
     create_owner_parser.add_argument("--tenant", default="husky")
-    subparsers.add_parser("migrate-all")
+    migrate_all_parser = subparsers.add_parser("migrate-all")
+    migrate_all_parser.add_argument("--concurrency", type=int, default=1)
     migrate_public_parser = subparsers.add_parser("migrate-public")
     migrate_tenant_parser = subparsers.add_parser("migrate-tenant")
     migrate_tenant_parser.add_argument("--schema", required=True)
+    reorder_parser = subparsers.add_parser("refresh-reorder")
+    reorder_parser.add_argument("--schema")
+    rollups_parser = subparsers.add_parser("refresh-rollups")
+    rollups_parser.add_argument("--schema")
+    rollups_parser.add_argument("--days", type=int, default=2)
+    accruals_parser = subparsers.add_parser("accrue-expenses")
+    accruals_parser.add_argument("--schema")
+    accruals_parser.add_argument("--days", type=int)
+    business_dates_parser = subparsers.add_parser("recompute-business-dates")
+    business_dates_parser.add_argument("--schema")
     args = parser.parse_args()
     if args.command == "create-owner":
         try:
@@ -109,7 +232,7 @@ def main():
             sys.exit(1)
     elif args.command == "migrate-all":
         try:
-            asyncio.run(migrate_all())
+            asyncio.run(migrate_all(args.concurrency))
         except Exception as exc:
             sys.stderr.write(f"{exc}\n")
             sys.exit(1)
@@ -125,6 +248,30 @@ def main():
         except Exception as exc:
             sys.stderr.write(f"{exc}\n")
             sys.exit(1)
+    elif args.command == "refresh-reorder":
+        try:
+            asyncio.run(refresh_reorder_suggestions(args.schema))
+        except Exception as exc:
+            sys.stderr.write(f"{exc}\n")
+            sys.exit(1)
+    elif args.command == "refresh-rollups":
+        try:
+            asyncio.run(refresh_rollups(args.schema, args.days))
+        except Exception as exc:
+            sys.stderr.write(f"{exc}\n")
+            sys.exit(1)
+    elif args.command == "accrue-expenses":
+        try:
+            asyncio.run(accrue_expenses(args.schema, args.days))
+        except Exception as exc:
+            sys.stderr.write(f"{exc}\n")
+            sys.exit(1)
+    elif args.command == "recompute-business-dates":
+        try:
+            asyncio.run(recompute_dates(args.schema))
+        except Exception as exc:
+            sys.stderr.write(f"{exc}\n")
+            sys.exit(1)
     else:
         parser.print_help()
 
@@ -0,0 +1,67 @@
+from datetime import date, datetime
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.platform import BusinessSettings
+
+DEFAULT_BUSINESS_TIMEZONE = "UTC"
+BUSINESS_DATE_SOURCES = {
+    "sales": "created_at",
+    "expenses": "occurred_at",
+    "stock_moves": "created_at",
+}
+
+
+def normalize_timezone(value: object) -> str | None:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    name = value.strip()
+    try:
+        ZoneInfo(name)
+    except (ZoneInfoNotFoundError, ValueError):
+        return None
+    return name
+
+
+async def set_business_timezone(session: AsyncSession, timezone_name: str) -> None:
+    name = normalize_timezone(timezone_name)
+    if name is None:
+        raise ValueError(f"Unknown timezone: {timezone_name}")
+    await session.execute(
+        pg_insert(BusinessSettings)
+        .values(id=1, timezone=name, updated_at=func.now())
+        .on_conflict_do_update(index_elements=[BusinessSettings.id], set_={"timezone": name, "updated_at": func.now()})
+    )
+
+
+async def recompute_business_dates(session: AsyncSession) -> int:
+    updated = 0
+    for table, source in BUSINESS_DATE_SOURCES.items():
+        result = await session.execute(
+            text(
+                f"UPDATE {table} SET business_date = "
+                f"(coalesce({source}, now()) AT TIME ZONE business_timezone())::date "
+                f"WHERE business_date IS DISTINCT FROM (coalesce({source}, now()) AT TIME ZONE business_timezone())::date "
+                "AND NOT EXISTS (SELECT 1 FROM accounting_periods p WHERE p.is_closed AND p.month IN ("
+                f"date_trunc('month', business_date)::date, "
+                f"date_trunc('month', (coalesce({source}, now()) AT TIME ZONE business_timezone())::date)::date))"
+            )
+        )
+        updated += result.rowcount or 0
+    return updated
+
+
+async def business_today(session: AsyncSession) -> date:
+    result = await session.execute(text("SELECT (now() AT TIME ZONE business_timezone())::date"))
+    return result.scalar_one()
+
+
+async def business_date_for(session: AsyncSession, moment: datetime) -> date:
+    result = await session.execute(
+        text("SELECT (CAST(:moment AS timestamptz) AT TIME ZONE business_timezone())::date"),
+        {"moment": moment},
+    )
+    return result.scalar_one()
@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings, SettingsConfigDict
 from pydantic import AliasChoices, Field, EmailStr, model_validator
@@ -17,7 +18,9 @@ class Settings(BaseSettings):
     jwt_secret: str | None = Field(default=None, alias="JWT_SECRET")
     jwt_expires_seconds: int = Field(default=3600, alias="JWT_EXPIRES")
     cors_origins: str = Field(default="http://localhost:5173", alias="CORS_ORIGINS")
-    costing_method: str = Field(default="LAST_PURCHASE", alias="COSTING_METHOD")
+    costing_method: Literal["LAST_PURCHASE", "WEIGHTED_AVERAGE", "FIFO"] = Field(
+        default="LAST_PURCHASE", alias="COSTING_METHOD"
+    )
     discount_max_percent_line: float = Field(default=0, alias="DISCOUNT_MAX_PERCENT_LINE")
     discount_max_percent_receipt: float = Field(default=0, alias="DISCOUNT_MAX_PERCENT_RECEIPT")
     discount_max_amount_line: float = Field(default=0, alias="DISCOUNT_MAX_AMOUNT_LINE")
@@ -38,6 +41,19 @@ class Settings(BaseSettings):
     tenant_migration_lock_timeout: int = Field(default=60, alias="TENANT_MIGRATION_LOCK_TIMEOUT")
     enable_wait_for_migration_lock: bool = Field(default=True, alias="ENABLE_WAIT_FOR_MIGRATION_LOCK")
     force_stamp_if_tables_exist: bool = Field(default=False, alias="FORCE_STAMP_IF_TABLES_EXIST")
+    platform_analytics_concurrency: int = Field(default=8, alias="PLATFORM_ANALYTICS_CONCURRENCY")
+    platform_analytics_timeout: float = Field(default=5.0, alias="PLATFORM_ANALYTICS_TIMEOUT")
+    platform_analytics_cache_ttl: int = Field(default=60, alias="PLATFORM_ANALYTICS_CACHE_TTL")
+    reports_cache_ttl: int = Field(default=300, alias="REPORTS_CACHE_TTL")
+    public_catalog_refresh_interval: float = Field(default=5.0, alias="PUBLIC_CATALOG_REFRESH_INTERVAL")
+    public_catalog_max_age: int = Field(default=300, alias="PUBLIC_CATALOG_MAX_AGE")
+    public_catalog_http_max_age: int = Field(default=30, alias="PUBLIC_CATALOG_HTTP_MAX_AGE")
+    accrual_ahead_days: int = Field(default=35, alias="ACCRUAL_AHEAD_DAYS")
+    import_parse_workers: int = Field(default=2, alias="IMPORT_PARSE_WORKERS")
+    import_worker_poll_interval: float = Field(default=2.0, alias="IMPORT_WORKER_POLL_INTERVAL")
+    import_job_max_attempts: int = Field(default=3, alias="IMPORT_JOB_MAX_ATTEMPTS")
+    import_job_retry_delay: int = Field(default=30, alias="IMPORT_JOB_RETRY_DELAY")
+    import_job_stale_after: int = Field(default=120, alias="IMPORT_JOB_STALE_AFTER")
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", case_sensitive=False)
 
@@ -0,0 +1,55 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Hashable
+
+
+class TTLCache:
+    def __init__(self, ttl_seconds: float, max_entries: int = 1024):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._locks: dict[Hashable, asyncio.Lock] = {}
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        now = time.monotonic()
+        if len(self._entries) >= self.max_entries:
+            for stale_key in [k for k, entry in self._entries.items() if entry[0] <= now]:
+                self._entries.pop(stale_key, None)
+            while len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (now + self.ttl_seconds, value)
+
+    def invalidate(self, predicate: Callable[[Hashable], bool] | None = None) -> None:
+        if predicate is None:
+            self._entries.clear()
+            return
+        for key in [k for k in self._entries if predicate(k)]:
+            self._entries.pop(key, None)
+
+    async def get_or_compute(
+        self, key: Hashable, compute: Callable[[], Awaitable[Any]], refresh: bool = False
+    ) -> Any:
+        if not refresh:
+            cached = self.get(key)
+            if cached is not None:
+                return cached
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            if not refresh:
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+            value = await compute()
+            self.set(key, value)
+        if not lock.locked():
+            self._locks.pop(key, None)
+        return value
@@ -39,6 +39,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 
@@ -64,6 +65,7 @@ api_router = APIRouter(prefix="/api/v1")
 api_router.include_router(health.router)
 api_router.include_router(auth.router)
 api_router.include_router(catalog.router)
+api_router.include_router(catalog.sync_router)
 api_router.include_router(purchasing.router)
 api_router.include_router(stock.router)
 api_router.include_router(sales.router)
@@ -1,15 +1,17 @@
 from app.core.db import Base
 from app.models.user import User, Role, UserRole
-from app.models.catalog import Category, Brand, ProductLine, Product
-from app.models.catalog_nodes import CatalogNode
+from app.models.catalog import Category, Brand, ProductLine, Product, CatalogDeletion
+from app.models.catalog_nodes import CatalogNode, CatalogNodePath
 from app.models.purchasing import Supplier, PurchaseInvoice, PurchaseItem
 from app.models.stock import StockMove, StockBatch, SaleItemCostAllocation
 from app.models.sales import Sale, SaleItem
 from app.models.cash import CashReceipt
 from app.models.finance import (
+    AccountingPeriod,
     Expense,
     ExpenseAccrual,
     ExpenseCategory,
+    ProfitLossSnapshot,
     RecurringExpense,
     RecurringExpenseAllocationMethod,
     RecurringExpensePeriod,
@@ -20,8 +22,11 @@ from app.models.tenant import Tenant, TenantStatus
 from app.models.tenant_domain import TenantDomain
 from app.models.invitation import TenantInvitation
 from app.models.public_order import PublicOrder, PublicOrderItem
-from app.models.imports import CatalogImport
+from app.models.imports import CatalogImport, CatalogImportRow
+from app.models.reorder import ReorderSuggestion
+from app.models.analytics import SalesDailyRollup, SalesRollupDay
 from app.models.platform import (
+    BusinessSettings,
     Feature,
     Module,
     Template,
@@ -40,7 +45,9 @@ __all__ = [
     "Brand",
     "ProductLine",
     "Product",
+    "CatalogDeletion",
     "CatalogNode",
+    "CatalogNodePath",
     "Supplier",
     "PurchaseInvoice",
     "PurchaseItem",
@@ -50,9 +57,11 @@ __all__ = [
     "Sale",
     "SaleItem",
     "CashReceipt",
+    "AccountingPeriod",
     "Expense",
     "ExpenseAccrual",
     "ExpenseCategory",
+    "ProfitLossSnapshot",
     "RecurringExpense",
     "RecurringExpenseAllocationMethod",
     "RecurringExpensePeriod",
@@ -66,11 +75,16 @@ __all__ = [
     "PublicOrder",
     "PublicOrderItem",
     "CatalogImport",
+    "CatalogImportRow",
+    "ReorderSuggestion",
+    "SalesDailyRollup",
+    "SalesRollupDay",
     "Module",
     "Feature",
     "Template",
     "TenantModule",
     "TenantFeature",
     "TenantUIPreference",
+    "BusinessSettings",
     "TenantSettings",
 ]
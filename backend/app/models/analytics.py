@@ -0,0 +1,23 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Column, Date, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.db import Base
+
+
+class SalesDailyRollup(Base):
+    __tablename__ = "sales_daily_rollups"
+
+    store_id = Column(UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True)
+    business_date = Column(Date, primary_key=True)
+    sales_count = Column(Integer, nullable=False, default=0)
+    gmv = Column(Numeric(14, 2), nullable=False, default=0)
+    refreshed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
+class SalesRollupDay(Base):
+    __tablename__ = "sales_rollup_days"
+
+    business_date = Column(Date, primary_key=True)
+    refreshed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
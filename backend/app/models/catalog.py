@@ -1,6 +1,6 @@
 import enum
 import uuid
-from sqlalchemy import Column, String, Boolean, Numeric, ForeignKey, Index, UniqueConstraint, Enum
+from sqlalchemy import BigInteger, Column, DateTime, String, Boolean, Numeric, ForeignKey, Index, UniqueConstraint, Enum, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -22,6 +22,7 @@ class Category(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    change_seq = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     products = relationship("Product", back_populates="category")
     brands = relationship("Brand", secondary="category_brands", back_populates="categories")
@@ -36,6 +37,7 @@ class Brand(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    change_seq = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     lines = relationship("ProductLine", back_populates="brand")
     categories = relationship("Category", secondary="category_brands", back_populates="brands")
@@ -58,6 +60,7 @@ class ProductLine(Base):
     name = Column(String, nullable=False)
     brand_id = Column(UUID(as_uuid=True), ForeignKey("brands.id", ondelete="CASCADE"), nullable=False)
     is_active = Column(Boolean, default=True)
+    change_seq = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     brand = relationship("Brand", back_populates="lines")
     products = relationship("Product", back_populates="line")
@@ -67,6 +70,8 @@ class Product(Base):
     __tablename__ = "products"
     __table_args__ = (
         Index("ix_products_sku", "sku", unique=True),
+        Index("ix_products_hierarchy_node_id", "hierarchy_node_id"),
+        Index("ix_products_lower_name_id", text("lower(name)"), "id"),
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -82,12 +87,14 @@ class Product(Base):
     unit = Column(Enum(ProductUnit, name="product_unit"), nullable=False, default=ProductUnit.pcs)
     purchase_price = Column(Numeric(12, 2), nullable=False, default=0)
     cost_price = Column(Numeric(12, 2), nullable=False, default=0)
+    avg_cost = Column(Numeric(14, 4), nullable=False, default=0)
     sell_price = Column(Numeric(12, 2), nullable=False, default=0)
     tax_rate = Column(Numeric(5, 2), nullable=False, default=0)
     is_active = Column(Boolean, default=True)
     is_hidden = Column(Boolean, nullable=False, default=False)
     variant_group = Column(String, nullable=True)
     variant_name = Column(String, nullable=True)
+    change_seq = Column(BigInteger, nullable=False, server_default="0", index=True)
 
     category = relationship("Category", back_populates="products")
     brand = relationship("Brand")
@@ -95,3 +102,12 @@ class Product(Base):
     hierarchy_node = relationship("CatalogNode")
     purchase_items = relationship("PurchaseItem", back_populates="product")
     sale_items = relationship("SaleItem", back_populates="product")
+
+
+class CatalogDeletion(Base):
+    __tablename__ = "catalog_deletions"
+
+    entity = Column(String, primary_key=True)
+    entity_id = Column(UUID(as_uuid=True), primary_key=True)
+    change_seq = Column(BigInteger, nullable=False, index=True)
+    deleted_at = Column(DateTime(timezone=True), nullable=False)
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, text
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, text
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
@@ -25,3 +25,12 @@ class CatalogNode(Base):
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
     parent = relationship("CatalogNode", remote_side=[id], backref="children")
+
+
+class CatalogNodePath(Base):
+    __tablename__ = "catalog_node_paths"
+    __table_args__ = (Index("ix_catalog_node_paths_descendant_id", "descendant_id"),)
+
+    ancestor_id = Column(UUID(as_uuid=True), ForeignKey("catalog_nodes.id", ondelete="CASCADE"), primary_key=True)
+    descendant_id = Column(UUID(as_uuid=True), ForeignKey("catalog_nodes.id", ondelete="CASCADE"), primary_key=True)
+    depth = Column(Integer, nullable=False)
@@ -8,7 +8,9 @@ from sqlalchemy import (
     Date,
     DateTime,
     Enum,
+    FetchedValue,
     ForeignKey,
+    Index,
     Numeric,
     String,
     UniqueConstraint,
@@ -44,9 +46,13 @@ class ExpenseCategory(Base):
 
 class Expense(Base):
     __tablename__ = "expenses"
+    __table_args__ = (Index("ix_expenses_store_id_business_date", "store_id", "business_date"),)
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     occurred_at = Column(DateTime(timezone=True), nullable=False)
+    business_date = Column(
+        Date, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue()
+    )
     amount = Column(Numeric(12, 2), nullable=False)
     category_id = Column(
         UUID(as_uuid=True), ForeignKey("expense_categories.id", ondelete="SET NULL")
@@ -114,3 +120,32 @@ class ExpenseAccrual(Base):
 
     store = relationship("Store")
     recurring_expense = relationship("RecurringExpense", back_populates="accruals")
+
+
+class AccountingPeriod(Base):
+    __tablename__ = "accounting_periods"
+
+    month = Column(Date, primary_key=True)
+    is_closed = Column(Boolean, nullable=False, default=True, server_default="true")
+    closed_at = Column(DateTime(timezone=True), nullable=True)
+    closed_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+    reopened_at = Column(DateTime(timezone=True), nullable=True)
+    reopened_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
+
+
+class ProfitLossSnapshot(Base):
+    __tablename__ = "pnl_snapshots"
+    __table_args__ = (Index("ix_pnl_snapshots_period_month", "period_month"),)
+
+    store_id = Column(
+        UUID(as_uuid=True), ForeignKey("stores.id", ondelete="CASCADE"), primary_key=True
+    )
+    date = Column(Date, primary_key=True)
+    period_month = Column(
+        Date, ForeignKey("accounting_periods.month", ondelete="CASCADE"), nullable=False
+    )
+    revenue = Column(Numeric(14, 2), nullable=False, default=0)
+    cogs = Column(Numeric(14, 2), nullable=False, default=0)
+    taxes = Column(Numeric(14, 2), nullable=False, default=0)
+    one_time_expenses = Column(Numeric(14, 2), nullable=False, default=0)
+    fixed_costs = Column(Numeric(14, 2), nullable=False, default=0)
@@ -1,7 +1,7 @@
 import uuid
 
-from sqlalchemy import DateTime, Integer, String, func
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Boolean, DateTime, ForeignKey, Index, Integer, String, func
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.types import JSON
 
@@ -10,9 +10,11 @@ from app.core.db import Base
 
 class CatalogImport(Base):
     __tablename__ = "catalog_imports"
+    __table_args__ = (Index("ix_catalog_imports_status_run_after", "status", "run_after"),)
 
     id: Mapped[uuid.UUID] = mapped_column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     status: Mapped[str] = mapped_column(String, nullable=False, default="queued")
+    kind: Mapped[str] = mapped_column(String, nullable=False, default="products")
     mode: Mapped[str] = mapped_column(String, nullable=False, default="sync")
     filename: Mapped[str] = mapped_column(String, nullable=False)
     sheet_name: Mapped[str | None] = mapped_column(String, nullable=True)
@@ -24,12 +26,32 @@ class CatalogImport(Base):
     rows_valid: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     rows_invalid: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
 
-    source_rows: Mapped[list[dict[str, object]]] = mapped_column(JSON, nullable=False, default=list)
     mapping: Mapped[dict[str, str]] = mapped_column(JSON, nullable=False, default=dict)
     options: Mapped[dict[str, object]] = mapped_column(JSON, nullable=False, default=dict)
     counters: Mapped[dict[str, int]] = mapped_column(JSON, nullable=False, default=dict)
     errors: Mapped[list[dict[str, object]]] = mapped_column(JSON, nullable=False, default=list)
 
+    progress: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    cancel_requested: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+    run_after: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    heartbeat_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(String, nullable=True)
+    last_error: Mapped[str | None] = mapped_column(String, nullable=True)
+
     created_at: Mapped[object] = mapped_column(DateTime(timezone=True), nullable=False, server_default=func.now())
     started_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
     finished_at: Mapped[object | None] = mapped_column(DateTime(timezone=True), nullable=True)
+
+
+class CatalogImportRow(Base):
+    __tablename__ = "catalog_import_rows"
+    __table_args__ = (Index("ix_catalog_import_rows_import_id_status", "import_id", "status"),)
+
+    import_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("catalog_imports.id", ondelete="CASCADE"), primary_key=True
+    )
+    row_number: Mapped[int] = mapped_column(Integer, primary_key=True)
+    data: Mapped[dict[str, object]] = mapped_column(JSONB, nullable=False, default=dict)
+    status: Mapped[str] = mapped_column(String, nullable=False, default="pending")
+    error: Mapped[str | None] = mapped_column(String, nullable=True)
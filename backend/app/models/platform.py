@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, String, UniqueConstraint
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Index, Integer, String, UniqueConstraint
 from sqlalchemy.dialects.postgresql import JSONB, UUID
 
 from app.core.db import Base
@@ -78,6 +78,14 @@ class TenantUIPreference(Base):
     updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
 
 
+class BusinessSettings(Base):
+    __tablename__ = "business_settings"
+
+    id = Column(Integer, primary_key=True, default=1)
+    timezone = Column(String, nullable=False, default="UTC")
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+
+
 class TenantSettings(Base):
     __tablename__ = "tenant_settings"
     __table_args__ = ({"schema": "public"},)
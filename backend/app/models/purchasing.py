@@ -1,5 +1,5 @@
 import uuid
-from sqlalchemy import Column, String, Numeric, ForeignKey, Enum, DateTime
+from sqlalchemy import Column, String, Numeric, ForeignKey, Enum, DateTime, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
@@ -20,6 +20,7 @@ class Supplier(Base):
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String, nullable=False)
     contact = Column(String, default="")
+    lead_time_days = Column(Integer, nullable=False, default=7, server_default="7")
 
     invoices = relationship("PurchaseInvoice", back_populates="supplier")
 
@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, Numeric
+from sqlalchemy.dialects.postgresql import UUID
+
+from app.core.db import Base
+
+
+class ReorderSuggestion(Base):
+    __tablename__ = "reorder_suggestions"
+
+    product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), primary_key=True)
+    on_hand = Column(Numeric(12, 3), nullable=False, default=0)
+    avg_daily_qty = Column(Numeric(12, 3), nullable=False, default=0)
+    days_of_cover = Column(Numeric(12, 1), nullable=True)
+    lead_time_days = Column(Integer, nullable=False)
+    reorder_point = Column(Numeric(12, 3), nullable=False, default=0)
+    suggested_qty = Column(Numeric(12, 3), nullable=False, default=0)
+    needs_reorder = Column(Boolean, nullable=False, default=False)
+    window_days = Column(Integer, nullable=False)
+    computed_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
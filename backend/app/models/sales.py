@@ -1,7 +1,7 @@
 import uuid
 import enum
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Numeric, ForeignKey, Enum, DateTime, Index, Boolean
+from sqlalchemy import Column, String, Numeric, ForeignKey, Enum, DateTime, Date, Index, Boolean, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -44,10 +44,16 @@ class PaymentStatus(str, enum.Enum):
 
 class Sale(Base):
     __tablename__ = "sales"
-    __table_args__ = (Index("ix_sales_status", "status"),)
+    __table_args__ = (
+        Index("ix_sales_status", "status"),
+        Index("ix_sales_store_id_status_business_date", "store_id", "status", "business_date"),
+        Index("ix_sales_status_created_at", "status", "created_at"),
+        Index("ix_sales_shift_id_status", "shift_id", "status"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), nullable=False)
+    business_date = Column(Date, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
     created_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     status = Column(Enum(SaleStatus), default=SaleStatus.draft, nullable=False)
     total_amount = Column(Numeric(12, 2), nullable=False, server_default="0")
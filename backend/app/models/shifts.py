@@ -2,8 +2,8 @@ import enum
 import uuid
 from datetime import datetime, timezone
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Numeric, String
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, DateTime, Enum, ForeignKey, Index, Integer, Numeric, String
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from sqlalchemy.orm import relationship
 
 from app.core.db import Base
@@ -30,5 +30,12 @@ class CashierShift(Base):
     opening_cash = Column(Numeric(12, 2), nullable=False, server_default="0")
     closing_cash = Column(Numeric(12, 2), nullable=True)
     note = Column(String, nullable=True)
+    sales_count = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    tax_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    profit_gross_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    refunds_total = Column(Numeric(14, 2), nullable=False, default=0, server_default="0")
+    payment_totals = Column(JSONB, nullable=False, default=dict)
+    z_report = Column(JSONB, nullable=True)
 
     sales = relationship("Sale", back_populates="shift")
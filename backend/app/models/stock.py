@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime
+from sqlalchemy import Column, String, Numeric, ForeignKey, DateTime, Date, Index, FetchedValue
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 
@@ -9,6 +9,10 @@ from app.core.db import Base
 
 class StockMove(Base):
     __tablename__ = "stock_moves"
+    __table_args__ = (
+        Index("ix_stock_moves_store_id_business_date", "store_id", "business_date"),
+        Index("ix_stock_moves_ref_id", "ref_id"),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     product_id = Column(UUID(as_uuid=True), ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
@@ -19,6 +23,7 @@ class StockMove(Base):
     ref_id = Column(UUID(as_uuid=True))
     created_by_user_id = Column(UUID(as_uuid=True), ForeignKey("users.id", ondelete="SET NULL"))
     created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+    business_date = Column(Date, nullable=False, server_default=FetchedValue(), server_onupdate=FetchedValue())
     store_id = Column(UUID(as_uuid=True), ForeignKey("stores.id", ondelete="RESTRICT"), nullable=True)
 
     product = relationship("Product")
@@ -1,10 +1,12 @@
 import uuid
-from typing import Optional
+from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import delete, exists, func, insert, literal, select, true
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
-from app.models.catalog_nodes import CatalogNode
+from app.models.catalog import Product
+from app.models.catalog_nodes import CatalogNode, CatalogNodePath
 
 
 class CatalogNodeRepo:
@@ -38,3 +40,94 @@ class CatalogNodeRepo:
         self.session.add(node)
         await self.session.flush()
         return node
+
+    async def add_paths(self, node_id: uuid.UUID, parent_id: Optional[uuid.UUID]) -> None:
+        rows = select(literal(node_id), literal(node_id), literal(0))
+        if parent_id is not None:
+            rows = select(CatalogNodePath.ancestor_id, literal(node_id), CatalogNodePath.depth + 1).where(
+                CatalogNodePath.descendant_id == parent_id
+            ).union_all(rows)
+        await self.session.execute(
+            insert(CatalogNodePath).from_select(["ancestor_id", "descendant_id", "depth"], rows)
+        )
+
+    async def is_descendant(self, ancestor_id: uuid.UUID, node_id: uuid.UUID) -> bool:
+        result = await self.session.execute(
+            select(
+                exists().where(CatalogNodePath.ancestor_id == ancestor_id, CatalogNodePath.descendant_id == node_id)
+            )
+        )
+        return bool(result.scalar())
+
+    async def move_subtree(self, node_id: uuid.UUID, new_parent_id: Optional[uuid.UUID]) -> None:
+        subtree = select(CatalogNodePath.descendant_id).where(CatalogNodePath.ancestor_id == node_id)
+        ancestors = select(CatalogNodePath.ancestor_id).where(
+            CatalogNodePath.descendant_id == node_id, CatalogNodePath.ancestor_id != node_id
+        )
+        await self.session.execute(
+            delete(CatalogNodePath).where(
+                CatalogNodePath.descendant_id.in_(subtree),
+                CatalogNodePath.ancestor_id.in_(ancestors),
+            )
+        )
+        if new_parent_id is None:
+            return
+        above = aliased(CatalogNodePath)
+        below = aliased(CatalogNodePath)
+        await self.session.execute(
+            insert(CatalogNodePath).from_select(
+                ["ancestor_id", "descendant_id", "depth"],
+                select(above.ancestor_id, below.descendant_id, above.depth + below.depth + 1)
+                .select_from(above)
+                .join(below, true())
+                .where(above.descendant_id == new_parent_id, below.ancestor_id == node_id),
+            )
+        )
+
+    async def tree(self, root_id: Optional[uuid.UUID] = None) -> List[tuple]:
+        hidden = aliased(CatalogNode)
+        visible = (
+            select(CatalogNode.id)
+            .where(
+                ~exists()
+                .where(
+                    CatalogNodePath.descendant_id == CatalogNode.id,
+                    hidden.id == CatalogNodePath.ancestor_id,
+                    hidden.is_active.is_not(True),
+                )
+            )
+            .cte("visible")
+        )
+        direct = (
+            select(Product.hierarchy_node_id.label("node_id"), func.count().label("products"))
+            .where(Product.is_active.is_(True), Product.hierarchy_node_id.is_not(None))
+            .group_by(Product.hierarchy_node_id)
+            .cte("direct")
+        )
+        totals = (
+            select(CatalogNodePath.ancestor_id.label("node_id"), func.sum(direct.c.products).label("products"))
+            .join(visible, visible.c.id == CatalogNodePath.descendant_id)
+            .join(direct, direct.c.node_id == CatalogNodePath.descendant_id)
+            .group_by(CatalogNodePath.ancestor_id)
+            .cte("totals")
+        )
+        scope = aliased(CatalogNodePath)
+        stmt = (
+            select(
+                CatalogNode,
+                scope.depth,
+                func.coalesce(direct.c.products, 0),
+                func.coalesce(totals.c.products, 0),
+            )
+            .join(visible, visible.c.id == CatalogNode.id)
+            .join(scope, scope.descendant_id == CatalogNode.id)
+            .outerjoin(direct, direct.c.node_id == CatalogNode.id)
+            .outerjoin(totals, totals.c.node_id == CatalogNode.id)
+        )
+        if root_id is not None:
+            stmt = stmt.where(scope.ancestor_id == root_id)
+        else:
+            roots = aliased(CatalogNode)
+            stmt = stmt.join(roots, roots.id == scope.ancestor_id).where(roots.parent_id.is_(None))
+        result = await self.session.execute(stmt.order_by(scope.depth, CatalogNode.name))
+        return result.all()
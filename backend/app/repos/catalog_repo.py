@@ -1,8 +1,11 @@
 from typing import List, Optional
-from sqlalchemy import func, select, update
+from sqlalchemy import Numeric, case, column, func, literal, select, text, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.catalog import Category, Brand, ProductLine, Product, CategoryBrand
+from app.models.catalog import Category, Brand, ProductLine, Product, CategoryBrand, CatalogDeletion
+
+PRODUCT_BULK_CHUNK = 1000
 
 
 class CategoryRepo:
@@ -55,6 +58,12 @@ class BrandRepo:
     async def delete(self, brand: Brand) -> None:
         await self.session.delete(brand)
 
+    async def get_many(self, brand_ids) -> dict:
+        if not brand_ids:
+            return {}
+        result = await self.session.execute(select(Brand).where(Brand.id.in_(brand_ids)))
+        return {brand.id: brand for brand in result.scalars().all()}
+
 
 class ProductLineRepo:
     def __init__(self, session: AsyncSession):
@@ -81,13 +90,19 @@ class ProductLineRepo:
     async def delete(self, line: ProductLine) -> None:
         await self.session.delete(line)
 
+    async def get_many(self, line_ids) -> dict:
+        if not line_ids:
+            return {}
+        result = await self.session.execute(select(ProductLine).where(ProductLine.id.in_(line_ids)))
+        return {line.id: line for line in result.scalars().all()}
+
 
 class ProductRepo:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def list(self, filters: dict) -> List[Product]:
-        stmt = select(Product)
+    @staticmethod
+    def _filtered(stmt, filters: dict):
         if filters.get("sku"):
             stmt = stmt.where(Product.sku == filters["sku"])
         if filters.get("barcode"):
@@ -104,10 +119,110 @@ class ProductRepo:
             stmt = stmt.where(Product.is_active == filters["is_active"])
         if filters.get("q"):
             stmt = stmt.where(Product.name.ilike(f"%{filters['q']}%"))
+        return stmt
+
+    async def list(self, filters: dict) -> List[Product]:
+        stmt = self._filtered(select(Product), filters)
         stmt = stmt.order_by(func.lower(Product.name), Product.id)
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
+    async def list_page(
+        self,
+        filters: dict,
+        columns: List[str],
+        limit: Optional[int] = None,
+        after: Optional[tuple] = None,
+    ) -> List[dict]:
+        sort_key = func.lower(Product.name)
+        stmt = self._filtered(select(sort_key.label("_sort_key"), *(getattr(Product, name) for name in columns)), filters)
+        if after is not None:
+            stmt = stmt.where(
+                tuple_(sort_key, Product.id) > tuple_(literal(after[0]), literal(after[1], Product.id.type))
+            )
+        stmt = stmt.order_by(sort_key, Product.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
+        return [dict(row) for row in result.mappings().all()]
+
+    async def get_links(self, product_ids) -> dict:
+        if not product_ids:
+            return {}
+        result = await self.session.execute(
+            select(Product.id, Product.category_id, Product.brand_id, Product.line_id).where(Product.id.in_(product_ids))
+        )
+        return {row[0]: tuple(row[1:]) for row in result.all()}
+
+    async def sku_owners(self, skus) -> dict:
+        if not skus:
+            return {}
+        result = await self.session.execute(select(Product.sku, Product.id).where(Product.sku.in_(skus)))
+        return {row[0]: row[1] for row in result.all()}
+
+    async def insert_many(self, rows: List[dict]) -> set:
+        inserted = set()
+        for start in range(0, len(rows), PRODUCT_BULK_CHUNK):
+            result = await self.session.execute(
+                pg_insert(Product)
+                .values(rows[start : start + PRODUCT_BULK_CHUNK])
+                .on_conflict_do_nothing(index_elements=[Product.sku])
+                .returning(Product.id)
+            )
+            inserted.update(result.scalars().all())
+        return inserted
+
+    async def update_many(self, rows: List[dict], fields: List[str], key: str = "id") -> List[tuple]:
+        table = Product.__table__
+        names = [key, *fields]
+        updated = []
+        for start in range(0, len(rows), PRODUCT_BULK_CHUNK):
+            data = values(*(column(name, table.c[name].type) for name in names), name="data").data(
+                [tuple(row[name] for name in names) for row in rows[start : start + PRODUCT_BULK_CHUNK]]
+            )
+            result = await self.session.execute(
+                update(table)
+                .where(table.c[key] == data.c[key])
+                .values({name: data.c[name] for name in fields})
+                .returning(table.c.id, table.c[key])
+            )
+            updated.extend(tuple(row) for row in result.all())
+        return updated
+
+    async def apply_purchase_costs(self, rows: List[tuple]) -> None:
+        table = Product.__table__
+        for start in range(0, len(rows), PRODUCT_BULK_CHUNK):
+            data = values(
+                column("id", table.c.id.type),
+                column("purchase_price", table.c.purchase_price.type),
+                column("first_cost", table.c.cost_price.type),
+                column("on_hand", Numeric()),
+                column("quantity", Numeric()),
+                column("total_cost", Numeric()),
+                name="data",
+            ).data(rows[start : start + PRODUCT_BULK_CHUNK])
+            on_hand = func.greatest(data.c.on_hand, 0)
+            await self.session.execute(
+                update(Product)
+                .where(Product.id == data.c.id)
+                .values(
+                    purchase_price=data.c.purchase_price,
+                    cost_price=case((func.coalesce(Product.cost_price, 0) == 0, data.c.first_cost), else_=Product.cost_price),
+                    avg_cost=case(
+                        (
+                            on_hand + data.c.quantity > 0,
+                            (Product.avg_cost * on_hand + data.c.total_cost) / (on_hand + data.c.quantity),
+                        ),
+                        else_=Product.avg_cost,
+                    ),
+                )
+                .execution_options(synchronize_session="fetch")
+            )
+
+    async def catalog_version(self) -> int:
+        result = await self.session.execute(text("SELECT last_value FROM catalog_version_seq"))
+        return int(result.scalar_one())
+
     async def create(self, data: dict) -> Product:
         product = Product(**data)
         self.session.add(product)
@@ -164,6 +279,17 @@ class CategoryBrandRepo:
     async def delete(self, link: CategoryBrand) -> None:
         await self.session.delete(link)
 
+    async def existing_pairs(self, category_ids, brand_ids) -> set:
+        if not category_ids or not brand_ids:
+            return set()
+        result = await self.session.execute(
+            select(CategoryBrand.category_id, CategoryBrand.brand_id).where(
+                CategoryBrand.category_id.in_(category_ids),
+                CategoryBrand.brand_id.in_(brand_ids),
+            )
+        )
+        return {tuple(row) for row in result.all()}
+
     async def list_brands_for_category(self, category_id) -> List[Brand]:
         result = await self.session.execute(
             select(Brand)
@@ -172,3 +298,35 @@ class CategoryBrandRepo:
             .order_by(func.lower(Brand.name), Brand.id)
         )
         return result.scalars().all()
+
+
+class CatalogChangeRepo:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def watermark(self) -> int:
+        result = await self.session.execute(text("SELECT pg_snapshot_xmin(pg_current_snapshot())::text::bigint"))
+        return int(result.scalar_one())
+
+    async def cut(self, model, since: int, upper: int, limit: int) -> Optional[int]:
+        result = await self.session.execute(
+            select(model.change_seq)
+            .where(model.change_seq >= since, model.change_seq < upper)
+            .order_by(model.change_seq)
+            .limit(limit + 1)
+        )
+        seqs = result.scalars().all()
+        if len(seqs) <= limit:
+            return None
+        return seqs[limit] if seqs[limit] > seqs[0] else seqs[limit] + 1
+
+    async def changed(self, model, columns: List[str], since: int, upper: int) -> List[tuple]:
+        result = await self.session.execute(
+            select(*(getattr(model, name) for name in columns))
+            .where(model.change_seq >= since, model.change_seq < upper)
+            .order_by(model.change_seq)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def deletions(self, since: int, upper: int) -> List[tuple]:
+        return await self.changed(CatalogDeletion, ["entity", "entity_id"], since, upper)
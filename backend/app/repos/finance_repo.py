@@ -2,10 +2,20 @@ from datetime import date, datetime
 from typing import List
 import uuid
 
-from sqlalchemy import select
+from sqlalchemy import Date, case, cast, delete, exists, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.finance import Expense, ExpenseAccrual, ExpenseCategory, RecurringExpense
+from app.models.finance import (
+    AccountingPeriod,
+    Expense,
+    ExpenseAccrual,
+    ExpenseCategory,
+    ProfitLossSnapshot,
+    RecurringExpense,
+    RecurringExpenseAllocationMethod,
+    RecurringExpensePeriod,
+)
 
 
 class ExpenseCategoryRepo:
@@ -100,19 +110,154 @@ class ExpenseAccrualRepo:
     def __init__(self, session: AsyncSession):
         self.session = session
 
-    async def list_existing_dates(
-        self, recurring_expense_id: uuid.UUID, date_from: date, date_to: date
-    ) -> set[date]:
-        stmt = select(ExpenseAccrual.date).where(
-            ExpenseAccrual.recurring_expense_id == recurring_expense_id,
-            ExpenseAccrual.date >= date_from,
-            ExpenseAccrual.date <= date_to,
+    async def generate(
+        self,
+        store_id: uuid.UUID | None,
+        date_from: date,
+        date_to: date,
+        recurring_expense_id: uuid.UUID | None = None,
+    ) -> int:
+        active_to = func.least(func.coalesce(RecurringExpense.end_date, date_to), date_to)
+        days = (
+            func.generate_series(
+                func.greatest(RecurringExpense.start_date, date_from),
+                active_to,
+                literal_column("interval '1 day'"),
+            )
+            .table_valued("day")
+            .lateral()
+        )
+        days_in_month = func.extract(
+            "day", func.date_trunc("month", days.c.day) + literal_column("interval '1 month - 1 day'")
+        )
+        amount = case(
+            (RecurringExpense.period == RecurringExpensePeriod.daily, RecurringExpense.amount),
+            (RecurringExpense.period == RecurringExpensePeriod.weekly, RecurringExpense.amount / 7),
+            (
+                RecurringExpense.allocation_method == RecurringExpenseAllocationMethod.fixed_30,
+                RecurringExpense.amount / 30,
+            ),
+            else_=RecurringExpense.amount / days_in_month,
+        )
+        source = (
+            select(
+                func.gen_random_uuid(),
+                RecurringExpense.store_id,
+                RecurringExpense.id,
+                cast(days.c.day, Date),
+                amount,
+                func.now(),
+            )
+            .select_from(RecurringExpense)
+            .join(days, literal_column("true"))
+            .where(
+                RecurringExpense.is_active.is_(True),
+                RecurringExpense.start_date <= date_to,
+                (RecurringExpense.end_date.is_(None)) | (RecurringExpense.end_date >= date_from),
+                ~exists().where(
+                    AccountingPeriod.is_closed.is_(True),
+                    AccountingPeriod.month == cast(func.date_trunc("month", days.c.day), Date),
+                ),
+            )
+        )
+        if store_id:
+            source = source.where(RecurringExpense.store_id == store_id)
+        if recurring_expense_id:
+            source = source.where(RecurringExpense.id == recurring_expense_id)
+        stmt = (
+            insert(ExpenseAccrual)
+            .from_select(
+                ["id", "store_id", "recurring_expense_id", "date", "amount", "created_at"], source
+            )
+            .on_conflict_do_nothing(index_elements=["recurring_expense_id", "date"])
+        )
+        result = await self.session.execute(stmt)
+        return result.rowcount or 0
+
+    async def delete_stale(self, recurring_expense: RecurringExpense, after: date) -> int:
+        stale = (ExpenseAccrual.date > after) | ExpenseAccrual.store_id.is_distinct_from(
+            recurring_expense.store_id
+        )
+        if recurring_expense.start_date:
+            stale = stale | (ExpenseAccrual.date < recurring_expense.start_date)
+        if recurring_expense.end_date:
+            stale = stale | (ExpenseAccrual.date > recurring_expense.end_date)
+        result = await self.session.execute(
+            delete(ExpenseAccrual).where(
+                ExpenseAccrual.recurring_expense_id == recurring_expense.id,
+                stale,
+                ~exists().where(
+                    AccountingPeriod.is_closed.is_(True),
+                    AccountingPeriod.month == cast(func.date_trunc("month", ExpenseAccrual.date), Date),
+                ),
+            )
         )
+        return result.rowcount or 0
+
+
+class AccountingPeriodRepo:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def list(self) -> List[AccountingPeriod]:
+        result = await self.session.execute(
+            select(AccountingPeriod).order_by(AccountingPeriod.month.desc())
+        )
+        return result.scalars().all()
+
+    async def get(self, month: date, for_update: bool = False) -> AccountingPeriod | None:
+        stmt = select(AccountingPeriod).where(AccountingPeriod.month == month)
+        if for_update:
+            stmt = stmt.with_for_update()
         result = await self.session.execute(stmt)
-        return set(result.scalars().all())
+        return result.scalar_one_or_none()
 
-    async def bulk_create(self, payloads: list[dict]) -> None:
-        if not payloads:
-            return
-        self.session.add_all([ExpenseAccrual(**payload) for payload in payloads])
+    async def create(self, data: dict) -> AccountingPeriod:
+        period = AccountingPeriod(**data)
+        self.session.add(period)
         await self.session.flush()
+        return period
+
+    async def closed_months(self, date_from: date, date_to: date) -> List[date]:
+        result = await self.session.execute(
+            select(AccountingPeriod.month)
+            .where(
+                AccountingPeriod.is_closed.is_(True),
+                AccountingPeriod.month >= date_from.replace(day=1),
+                AccountingPeriod.month <= date_to,
+            )
+            .order_by(AccountingPeriod.month)
+        )
+        return list(result.scalars().all())
+
+    async def is_closed(self, day: date) -> bool:
+        result = await self.session.execute(
+            select(AccountingPeriod.month).where(
+                AccountingPeriod.month == day.replace(day=1), AccountingPeriod.is_closed.is_(True)
+            )
+        )
+        return result.first() is not None
+
+    async def store_snapshots(self, month: date, source) -> int:
+        rows = source.subquery()
+        result = await self.session.execute(
+            insert(ProfitLossSnapshot).from_select(
+                ["store_id", "date", "period_month", "revenue", "cogs", "taxes", "one_time_expenses", "fixed_costs"],
+                select(
+                    rows.c.store_id,
+                    rows.c.day,
+                    literal(month, Date),
+                    rows.c.revenue,
+                    rows.c.cogs,
+                    rows.c.taxes,
+                    rows.c.one_time_expenses,
+                    rows.c.fixed_costs,
+                ),
+            )
+        )
+        return result.rowcount or 0
+
+    async def delete_snapshots(self, month: date) -> None:
+        await self.session.execute(
+            delete(ProfitLossSnapshot).where(ProfitLossSnapshot.period_month == month)
+        )
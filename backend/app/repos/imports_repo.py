@@ -1,10 +1,15 @@
 import uuid
-from datetime import datetime, timezone
+from collections.abc import AsyncIterator, Iterable
+from datetime import datetime, timedelta, timezone
 
-from sqlalchemy import select
+from sqlalchemy import and_, func, insert, null, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.imports import CatalogImport
+from app.models.imports import CatalogImport, CatalogImportRow
+
+IMPORT_ROWS_CHUNK = 1000
+IMPORT_APPLY_CHUNK = 2000
+IMPORT_FINISHED_STATUSES = {"done", "failed", "cancelled"}
 
 
 class ImportsRepo:
@@ -27,20 +32,72 @@ class ImportsRepo:
         record.status = status
         if status == "running" and not record.started_at:
             record.started_at = datetime.now(timezone.utc)
-        if status in {"done", "failed"}:
+        if status in IMPORT_FINISHED_STATUSES:
             record.finished_at = datetime.now(timezone.utc)
         await self.session.flush()
         return record
 
-    async def append_errors(self, import_id: uuid.UUID, errors: list[dict]) -> CatalogImport | None:
-        record = await self.get_import(import_id)
+    async def save_progress(self, import_id: uuid.UUID, counters: dict[str, int]) -> bool:
+        done = counters.get("processed", 0) + counters.get("skipped", 0) + counters.get("failed", 0)
+        total = counters.get("total", 0)
+        result = await self.session.execute(
+            update(CatalogImport)
+            .where(CatalogImport.id == import_id)
+            .values(
+                counters=counters,
+                progress=min(done * 100 // total, 100) if total else 0,
+                heartbeat_at=func.now(),
+            )
+            .returning(CatalogImport.cancel_requested)
+            .execution_options(synchronize_session=False)
+        )
+        return bool(result.scalar_one_or_none())
+
+    async def claim_next(self, worker_id: str, stale_after: int) -> CatalogImport | None:
+        now = datetime.now(timezone.utc)
+        stmt = (
+            select(CatalogImport)
+            .where(
+                or_(
+                    and_(
+                        CatalogImport.status == "queued",
+                        or_(CatalogImport.run_after.is_(None), CatalogImport.run_after <= now),
+                    ),
+                    and_(
+                        CatalogImport.status == "running",
+                        CatalogImport.heartbeat_at < now - timedelta(seconds=stale_after),
+                    ),
+                )
+            )
+            .order_by(CatalogImport.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        record = (await self.session.execute(stmt)).scalar_one_or_none()
         if not record:
             return None
-        existing = list(record.errors or [])
-        existing.extend(errors)
-        record.errors = existing
-        record.rows_invalid = len(existing)
-        record.rows_valid = max(record.rows_total - record.rows_invalid, 0)
+        record.status = "running"
+        record.attempts += 1
+        record.locked_by = worker_id
+        record.heartbeat_at = now
+        record.started_at = record.started_at or now
+        await self.session.flush()
+        return record
+
+    async def retry_or_fail(
+        self, import_id: uuid.UUID, error: str, max_attempts: int, retry_delay: int
+    ) -> CatalogImport | None:
+        record = await self.get_import(import_id, for_update=True)
+        if not record:
+            return None
+        record.last_error = error
+        record.locked_by = None
+        if record.attempts >= max_attempts:
+            record.status = "failed"
+            record.finished_at = datetime.now(timezone.utc)
+        else:
+            record.status = "queued"
+            record.run_after = datetime.now(timezone.utc) + timedelta(seconds=retry_delay * record.attempts)
         await self.session.flush()
         return record
 
@@ -62,6 +119,9 @@ class ImportsRepo:
         record.rows_total = rows_total
         record.rows_valid = rows_valid
         record.rows_invalid = rows_invalid
+        if status == "done":
+            record.progress = 100
+        record.locked_by = None
         record.finished_at = datetime.now(timezone.utc)
         await self.session.flush()
         return record
@@ -76,6 +136,83 @@ class ImportsRepo:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def get_import(self, import_id: uuid.UUID) -> CatalogImport | None:
-        result = await self.session.execute(select(CatalogImport).where(CatalogImport.id == import_id))
+    async def get_import(self, import_id: uuid.UUID, for_update: bool = False) -> CatalogImport | None:
+        stmt = select(CatalogImport).where(CatalogImport.id == import_id)
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
+
+    async def add_rows(
+        self,
+        import_id: uuid.UUID,
+        rows: Iterable[dict],
+        start_row: int = 2,
+        chunk_size: int = IMPORT_ROWS_CHUNK,
+    ) -> int:
+        chunk: list[dict] = []
+        count = 0
+        for row_number, data in enumerate(rows, start=start_row):
+            chunk.append({"import_id": import_id, "row_number": row_number, "data": data, "status": "pending"})
+            if len(chunk) >= chunk_size:
+                await self.session.execute(insert(CatalogImportRow), chunk)
+                count += len(chunk)
+                chunk = []
+        if chunk:
+            await self.session.execute(insert(CatalogImportRow), chunk)
+            count += len(chunk)
+        return count
+
+    async def iter_row_chunks(
+        self,
+        import_id: uuid.UUID,
+        chunk_size: int = IMPORT_ROWS_CHUNK,
+        statuses: list[str] | None = None,
+        with_errors: bool = False,
+    ) -> AsyncIterator[list]:
+        last_row = 0
+        while True:
+            stmt = (
+                select(
+                    CatalogImportRow.row_number,
+                    CatalogImportRow.data,
+                    CatalogImportRow.status,
+                    CatalogImportRow.error,
+                )
+                .where(CatalogImportRow.import_id == import_id, CatalogImportRow.row_number > last_row)
+                .order_by(CatalogImportRow.row_number)
+                .limit(chunk_size)
+            )
+            if statuses:
+                stmt = stmt.where(CatalogImportRow.status.in_(statuses))
+            if with_errors:
+                stmt = stmt.where(CatalogImportRow.error.is_not(None))
+            rows = (await self.session.execute(stmt)).all()
+            if not rows:
+                return
+            yield rows
+            last_row = rows[-1].row_number
+
+    async def update_rows(self, import_id: uuid.UUID, updates: list[dict]) -> None:
+        if not updates:
+            return
+        await self.session.execute(
+            update(CatalogImportRow),
+            [{"import_id": import_id, **item} for item in updates],
+        )
+
+    async def distinct_values(self, import_id: uuid.UUID, columns: list[str | None]) -> list[tuple]:
+        values = [
+            func.nullif(func.btrim(CatalogImportRow.data[column].astext), "") if column else null()
+            for column in columns
+        ]
+        result = await self.session.execute(
+            select(*values).where(CatalogImportRow.import_id == import_id).distinct()
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def count_rows(self, import_id: uuid.UUID) -> int:
+        result = await self.session.execute(
+            select(func.count()).select_from(CatalogImportRow).where(CatalogImportRow.import_id == import_id)
+        )
+        return result.scalar_one()
@@ -49,13 +49,16 @@ class PurchaseInvoiceRepo:
         await self.session.flush()
         return invoice
 
-    async def get(self, invoice_id) -> Optional[PurchaseInvoice]:
-        result = await self.session.execute(
+    async def get(self, invoice_id, for_update: bool = False) -> Optional[PurchaseInvoice]:
+        stmt = (
             select(PurchaseInvoice)
             .options(selectinload(PurchaseInvoice.items))
             .execution_options(populate_existing=True)
             .where(PurchaseInvoice.id == invoice_id)
         )
+        if for_update:
+            stmt = stmt.with_for_update(of=PurchaseInvoice)
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def add_item(self, invoice: PurchaseInvoice, data: dict) -> PurchaseItem:
@@ -1,9 +1,11 @@
 from typing import List, Optional
-from sqlalchemy import select
+from decimal import Decimal
+
+from sqlalchemy import func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.sales import Payment, PaymentProvider, Sale, SaleItem
+from app.models.sales import Payment, PaymentProvider, Sale, SaleItem, SaleTaxLine
 from app.models.stock import SaleItemCostAllocation
 
 
@@ -29,6 +31,12 @@ class SaleRepo:
         result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def tax_total(self, sale_id) -> Decimal:
+        result = await self.session.execute(
+            select(func.coalesce(func.sum(SaleTaxLine.tax_amount), 0)).where(SaleTaxLine.sale_id == sale_id)
+        )
+        return Decimal(result.scalar_one())
+
     async def list(
         self,
         status_filter=None,
@@ -1,10 +1,11 @@
 from decimal import Decimal
 
-from sqlalchemy import func, select
+from sqlalchemy import Numeric, Text, cast, func, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, array
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
-from app.models.sales import Payment, Sale, SaleItem, SaleTaxLine, SaleStatus
+from app.models.sales import Sale
 from app.models.shifts import CashierShift, CashierShiftStatus
 
 
@@ -18,12 +19,11 @@ class CashierShiftRepo:
         await self.session.flush()
         return shift
 
-    async def get(self, shift_id) -> CashierShift | None:
-        result = await self.session.execute(
-            select(CashierShift)
-            .where(CashierShift.id == shift_id)
-            .options(selectinload(CashierShift.sales).selectinload(Sale.payments), selectinload(CashierShift.sales).selectinload(Sale.items))
-        )
+    async def get(self, shift_id, for_update: bool = False) -> CashierShift | None:
+        stmt = select(CashierShift).where(CashierShift.id == shift_id)
+        if for_update:
+            stmt = stmt.with_for_update()
+        result = await self.session.execute(stmt)
         return result.scalar_one_or_none()
 
     async def get_active_for_cashier(self, cashier_id) -> CashierShift | None:
@@ -62,44 +62,47 @@ class CashierShiftRepo:
         result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def list_sales(self, shift_id):
-        result = await self.session.execute(
+    async def list_sales(self, shift_id, limit: int | None = 50, offset: int = 0):
+        stmt = (
             select(Sale)
             .where(Sale.shift_id == shift_id)
-            .options(selectinload(Sale.payments), selectinload(Sale.items), selectinload(Sale.tax_lines))
-            .order_by(Sale.created_at.desc())
+            .options(selectinload(Sale.payments))
+            .order_by(Sale.created_at.desc(), Sale.id)
+            .offset(offset)
         )
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.execute(stmt)
         return result.scalars().all()
 
-    async def get_aggregates(self, shift_id) -> dict:
-        sales_count_result = await self.session.execute(
-            select(func.count(Sale.id), func.coalesce(func.sum(Sale.total_amount), 0))
-            .where(Sale.shift_id == shift_id, Sale.status == SaleStatus.completed)
-        )
-        sales_count, revenue_total = sales_count_result.one()
-
-        tax_result = await self.session.execute(
-            select(func.coalesce(func.sum(SaleTaxLine.tax_amount), 0)).join(Sale, Sale.id == SaleTaxLine.sale_id).where(Sale.shift_id == shift_id)
-        )
-        tax_total = tax_result.scalar_one()
-
-        profit_result = await self.session.execute(
-            select(func.coalesce(func.sum(SaleItem.profit_line), 0)).join(Sale, Sale.id == SaleItem.sale_id).where(Sale.shift_id == shift_id, Sale.status == SaleStatus.completed)
-        )
-        profit_total = profit_result.scalar_one()
-
-        payment_rows = await self.session.execute(
-            select(Payment.method, func.coalesce(func.sum(Payment.amount), 0))
-            .join(Sale, Sale.id == Payment.sale_id)
-            .where(Sale.shift_id == shift_id)
-            .group_by(Payment.method)
+    async def apply_totals(
+        self,
+        shift_id,
+        *,
+        sales_count: int = 0,
+        revenue: Decimal = Decimal("0"),
+        tax: Decimal = Decimal("0"),
+        profit: Decimal = Decimal("0"),
+        refunds: Decimal = Decimal("0"),
+        by_payment_type: dict[str, Decimal] | None = None,
+    ) -> bool:
+        payment_totals = CashierShift.payment_totals
+        for method, amount in (by_payment_type or {}).items():
+            current = func.coalesce(cast(CashierShift.payment_totals[method].astext, Numeric), 0)
+            payment_totals = func.jsonb_set(
+                payment_totals, cast(array([method]), ARRAY(Text)), func.to_jsonb(current + amount)
+            )
+        result = await self.session.execute(
+            update(CashierShift)
+            .where(CashierShift.id == shift_id, CashierShift.status == CashierShiftStatus.open)
+            .values(
+                sales_count=CashierShift.sales_count + sales_count,
+                revenue_total=CashierShift.revenue_total + revenue,
+                tax_total=CashierShift.tax_total + tax,
+                profit_gross_total=CashierShift.profit_gross_total + profit,
+                refunds_total=CashierShift.refunds_total + refunds,
+                payment_totals=payment_totals,
+            )
+            .execution_options(synchronize_session="fetch")
         )
-        by_payment_type = {method: amount for method, amount in payment_rows.all()}
-
-        return {
-            "sales_count": sales_count or 0,
-            "revenue_total": Decimal(revenue_total or 0),
-            "tax_total": Decimal(tax_total or 0),
-            "profit_gross_total": Decimal(profit_total or 0),
-            "by_payment_type": by_payment_type,
-        }
+        return result.rowcount > 0
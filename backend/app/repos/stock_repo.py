@@ -1,6 +1,6 @@
 from typing import List
 
-from sqlalchemy import select, func
+from sqlalchemy import insert, select, func
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.stock import StockMove, StockBatch
@@ -21,6 +21,10 @@ class StockRepo:
         await self.session.flush()
         return move
 
+    async def record_moves(self, rows: List[dict]) -> None:
+        if rows:
+            await self.session.execute(insert(StockMove), rows)
+
     async def list_moves(self, product_id=None) -> List[StockMove]:
         stmt = select(StockMove)
         if product_id:
@@ -40,6 +44,16 @@ class StockRepo:
         result = await self.session.execute(stmt)
         return result.all()
 
+    async def on_hand_many(self, product_ids) -> dict:
+        if not product_ids:
+            return {}
+        result = await self.session.execute(
+            select(StockMove.product_id, func.coalesce(func.sum(StockMove.delta_qty), 0))
+            .where(StockMove.product_id.in_(product_ids))
+            .group_by(StockMove.product_id)
+        )
+        return dict(result.all())
+
     async def on_hand(self, product_id) -> float:
         sum_expr = func.coalesce(func.sum(StockMove.delta_qty), 0)
         fallback_expr = func.coalesce(func.sum(StockMove.quantity), 0)
@@ -61,6 +75,10 @@ class StockBatchRepo:
         await self.session.flush()
         return batch
 
+    async def create_many(self, rows: List[dict]) -> None:
+        if rows:
+            await self.session.execute(insert(StockBatch), rows)
+
     async def consume(self, product_id, quantity: float) -> List[StockBatch]:
         batches = await self.session.execute(
             select(StockBatch)
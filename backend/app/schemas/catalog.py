@@ -1,5 +1,5 @@
 import uuid
-from typing import Optional
+from typing import Any, Optional
 from pydantic import BaseModel, Field
 from decimal import Decimal
 
@@ -116,3 +116,57 @@ class ProductOut(ProductBase):
     id: uuid.UUID
 
     model_config = {"from_attributes": True}
+
+
+class ProductBulkUpdateItem(ProductUpdate):
+    id: uuid.UUID
+
+
+class ProductBulkCreate(BaseModel):
+    items: list[ProductCreate] = Field(min_length=1, max_length=5000)
+
+
+class ProductBulkUpdate(BaseModel):
+    items: list[ProductBulkUpdateItem] = Field(min_length=1, max_length=5000)
+
+
+class ProductPriceItem(BaseModel):
+    id: Optional[uuid.UUID] = None
+    sku: Optional[str] = None
+    sell_price: Optional[Decimal] = Field(default=None, ge=0)
+    purchase_price: Optional[Decimal] = Field(default=None, ge=0)
+    cost_price: Optional[Decimal] = Field(default=None, ge=0)
+
+
+class ProductPriceList(BaseModel):
+    items: list[ProductPriceItem] = Field(min_length=1, max_length=20000)
+
+
+class ProductBulkResult(BaseModel):
+    index: int
+    id: Optional[uuid.UUID] = None
+    status: str
+    error: Optional[str] = None
+
+
+class ProductBulkResponse(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: list[ProductBulkResult]
+
+
+class CatalogChangeSet(BaseModel):
+    columns: list[str]
+    rows: list[list[Any]]
+
+
+class CatalogChangesOut(BaseModel):
+    since: int
+    checkpoint: int
+    has_more: bool
+    products: CatalogChangeSet
+    categories: CatalogChangeSet
+    brands: CatalogChangeSet
+    lines: CatalogChangeSet
+    deleted: dict[str, list[uuid.UUID]]
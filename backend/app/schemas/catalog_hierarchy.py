@@ -38,6 +38,13 @@ class CatalogNodeOut(CatalogNodeBase):
     model_config = {"from_attributes": True}
 
 
+class CatalogTreeNode(CatalogNodeOut):
+    depth: int = 0
+    product_count: int = 0
+    total_product_count: int = 0
+    children: list["CatalogTreeNode"] = Field(default_factory=list)
+
+
 class CatalogHierarchyResponse(BaseModel):
     levels: list[CatalogHierarchyLevel]
     roots: list[CatalogNodeOut]
@@ -113,3 +113,34 @@ class ProfitLossTotals(FinanceDecimalModel):
 class ProfitLossResponse(FinanceDecimalModel):
     totals: ProfitLossTotals
     daily_breakdown: list[ProfitLossDailyBreakdown]
+
+
+class ProfitLossStoreSeries(FinanceDecimalModel):
+    store_id: uuid.UUID
+    store_name: str
+    totals: ProfitLossTotals
+    series: list[ProfitLossDailyBreakdown]
+
+
+class ProfitLossConsolidated(FinanceDecimalModel):
+    totals: ProfitLossTotals
+    series: list[ProfitLossDailyBreakdown]
+
+
+class ProfitLossComparisonResponse(FinanceDecimalModel):
+    date_from: date
+    date_to: date
+    bucket: str
+    stores: list[ProfitLossStoreSeries]
+    consolidated: ProfitLossConsolidated
+
+
+class AccountingPeriodOut(BaseModel):
+    month: date
+    is_closed: bool
+    closed_at: datetime | None
+    closed_by_user_id: uuid.UUID | None
+    reopened_at: datetime | None
+    reopened_by_user_id: uuid.UUID | None
+
+    model_config = {"from_attributes": True}
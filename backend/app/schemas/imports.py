@@ -8,10 +8,12 @@ from pydantic import BaseModel, Field, HttpUrl
 
 
 class ImportStatus(StrEnum):
+    uploaded = "uploaded"
     queued = "queued"
     running = "running"
     done = "done"
     failed = "failed"
+    cancelled = "cancelled"
 
 
 class ImportMode(StrEnum):
@@ -19,6 +21,12 @@ class ImportMode(StrEnum):
     background = "background"
 
 
+class ImportKind(StrEnum):
+    products = "products"
+    stock = "stock"
+    purchase_items = "purchase_items"
+
+
 class ImportOnConflict(StrEnum):
     update = "update"
     skip = "skip"
@@ -66,6 +74,7 @@ class ImportPreviewOptions(BaseModel):
     on_conflict: ImportOnConflict = ImportOnConflict.update
     dry_run: bool = True
     strict: bool = False
+    create_missing: bool = False
 
 
 class ImportPreviewRequest(BaseModel):
@@ -80,12 +89,17 @@ class ImportPreviewSummary(BaseModel):
     would_create: int = Field(default=0, ge=0)
     would_update: int = Field(default=0, ge=0)
     would_skip: int = Field(default=0, ge=0)
+    unchanged: int = Field(default=0, ge=0)
+    would_create_categories: list[str] = Field(default_factory=list)
+    would_create_brands: list[str] = Field(default_factory=list)
+    would_create_lines: list[str] = Field(default_factory=list)
 
 
 class ImportPreviewAction(BaseModel):
     row: int = Field(ge=1)
-    action: Literal["create", "update", "skip", "error"]
+    action: Literal["create", "update", "unchanged", "skip", "error"]
     reason: str | None = None
+    changes: dict[str, dict[str, object]] | None = None
 
 
 class ImportPreviewResponse(BaseModel):
@@ -1,3 +1,5 @@
+from datetime import date, datetime
+from decimal import Decimal
 from typing import List
 
 from pydantic import BaseModel, EmailStr, Field, field_validator
@@ -159,3 +161,27 @@ class PlatformTenantUserUpdate(BaseModel):
 
 class PlatformTemplateApply(BaseModel):
     template_id: str
+
+
+class PlatformAnalyticsTenant(BaseModel):
+    tenant_id: str
+    code: str
+    name: str
+    status: str
+    gmv: Decimal = Decimal("0")
+    sales_count: int = 0
+    active_stores: int = 0
+    error: str | None = None
+
+
+class PlatformAnalyticsResponse(BaseModel):
+    date_from: date
+    date_to: date
+    source: str
+    generated_at: datetime
+    tenants_total: int
+    tenants_failed: int
+    gmv: Decimal
+    sales_count: int
+    active_stores: int
+    tenants: List[PlatformAnalyticsTenant]
@@ -16,10 +16,31 @@ class PublicCatalogProductOut(BaseModel):
     on_hand: float
     variant_group: str | None = None
     variant_name: str | None = None
+    category_id: str | None = None
+    brand_id: str | None = None
+    line_id: str | None = None
+
+
+class PublicCatalogFacetValue(BaseModel):
+    id: str | None = None
+    name: str
+    count: int
+
+
+class PublicCatalogFacets(BaseModel):
+    categories: list[PublicCatalogFacetValue] = Field(default_factory=list)
+    brands: list[PublicCatalogFacetValue] = Field(default_factory=list)
+    lines: list[PublicCatalogFacetValue] = Field(default_factory=list)
+    variant_groups: list[PublicCatalogFacetValue] = Field(default_factory=list)
+    in_stock: int = 0
 
 
 class PublicCatalogResponse(BaseModel):
     items: list[PublicCatalogProductOut]
+    total: int | None = None
+    offset: int = 0
+    limit: int | None = None
+    facets: PublicCatalogFacets | None = None
 
 
 class PublicCatalogOrderItemIn(BaseModel):
@@ -9,6 +9,7 @@ from app.models.purchasing import PurchaseStatus
 class SupplierBase(BaseModel):
     name: str
     contact: str = ""
+    lead_time_days: int = Field(default=7, ge=0)
 
 
 class SupplierCreate(SupplierBase):
@@ -18,6 +19,7 @@ class SupplierCreate(SupplierBase):
 class SupplierUpdate(BaseModel):
     name: Optional[str] = None
     contact: Optional[str] = None
+    lead_time_days: Optional[int] = Field(default=None, ge=0)
 
 
 class SupplierOut(SupplierBase):
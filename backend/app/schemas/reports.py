@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from decimal import Decimal
 from pydantic import BaseModel
 
@@ -65,3 +65,44 @@ class InventoryValuationItem(BaseModel):
 class InventoryValuationReport(BaseModel):
     total_value: Decimal
     items: list[InventoryValuationItem]
+
+
+class ReorderSuggestionItem(BaseModel):
+    product_id: str
+    sku: str | None = None
+    name: str
+    on_hand: Decimal
+    avg_daily_qty: Decimal
+    days_of_cover: Decimal | None = None
+    lead_time_days: int
+    reorder_point: Decimal
+    suggested_qty: Decimal
+    needs_reorder: bool
+
+
+class ReorderReport(BaseModel):
+    window_days: int
+    computed_at: datetime | None = None
+    items: list[ReorderSuggestionItem]
+
+
+class AbcXyzItem(BaseModel):
+    product_id: str
+    sku: str | None = None
+    name: str
+    qty: Decimal
+    revenue: Decimal
+    revenue_share: Decimal
+    cumulative_share: Decimal
+    cv: Decimal | None = None
+    abc_class: str
+    xyz_class: str
+    rank: int
+
+
+class AbcXyzReport(BaseModel):
+    date_from: date
+    date_to: date
+    generated_at: datetime
+    counts: dict[str, int]
+    items: list[AbcXyzItem]
@@ -20,6 +20,24 @@ class ShiftCloseIn(BaseModel):
     note: str | None = None
 
 
+class ShiftZReport(BaseModel):
+    shift_id: uuid.UUID
+    store_id: uuid.UUID
+    cashier_id: uuid.UUID
+    opened_at: datetime | None = None
+    closed_at: datetime | None = None
+    opening_cash: Decimal
+    closing_cash: Decimal | None = None
+    expected_cash: Decimal
+    cash_difference: Decimal | None = None
+    sales_count: int
+    revenue_total: Decimal
+    tax_total: Decimal
+    profit_gross_total: Decimal
+    refunds_total: Decimal
+    by_payment_type: dict[PaymentProvider, Decimal]
+
+
 class ShiftOut(BaseModel):
     id: uuid.UUID
     store_id: uuid.UUID
@@ -30,6 +48,7 @@ class ShiftOut(BaseModel):
     opening_cash: Decimal
     closing_cash: Decimal | None
     note: str | None
+    z_report: ShiftZReport | None = None
 
     model_config = {"from_attributes": True}
 
@@ -47,9 +66,10 @@ class ShiftAggregates(BaseModel):
     revenue_total: Decimal
     tax_total: Decimal
     profit_gross_total: Decimal
+    refunds_total: Decimal = Decimal("0")
     by_payment_type: dict[PaymentProvider, Decimal]
 
 
 class ShiftDetail(ShiftOut):
     aggregates: ShiftAggregates
-    sales: list[SaleOut]
+    sales: list[SaleOut] = []
@@ -0,0 +1,47 @@
+import numpy as np
+
+DEFAULT_ABC_THRESHOLDS = (0.8, 0.95)
+DEFAULT_XYZ_THRESHOLDS = (0.5, 1.0)
+
+
+def classify_abc_xyz(
+    revenue: np.ndarray,
+    qty_total: np.ndarray,
+    qty_squares: np.ndarray,
+    window_days: int,
+    abc_thresholds: tuple[float, float] = DEFAULT_ABC_THRESHOLDS,
+    xyz_thresholds: tuple[float, float] = DEFAULT_XYZ_THRESHOLDS,
+) -> dict[str, np.ndarray]:
+    revenue = np.asarray(revenue, dtype=np.float64)
+    qty_total = np.asarray(qty_total, dtype=np.float64)
+    qty_squares = np.asarray(qty_squares, dtype=np.float64)
+    size = revenue.size
+
+    days = max(window_days, 1)
+    mean = qty_total / days
+    variance = np.maximum(qty_squares / days - mean * mean, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cv = np.where(mean > 0, np.sqrt(variance) / mean, np.inf)
+
+    order = np.argsort(-revenue, kind="stable")
+    grand_total = revenue.sum()
+    share = revenue / grand_total if grand_total > 0 else np.zeros(size)
+    cumulative = np.empty(size, dtype=np.float64)
+    cumulative[order] = np.cumsum(share[order])
+    preceding = cumulative - share
+    abc = np.where(
+        preceding < abc_thresholds[0], "A", np.where(preceding < abc_thresholds[1], "B", "C")
+    )
+    if grand_total <= 0:
+        abc[:] = "C"
+    xyz = np.where(cv <= xyz_thresholds[0], "X", np.where(cv <= xyz_thresholds[1], "Y", "Z"))
+    rank = np.empty(size, dtype=np.int64)
+    rank[order] = np.arange(1, size + 1)
+    return {
+        "share": share,
+        "cumulative_share": cumulative,
+        "cv": cv,
+        "abc": abc,
+        "xyz": xyz,
+        "rank": rank,
+    }
@@ -27,6 +27,33 @@ class CatalogHierarchyService:
     async def list_nodes(self, parent_id=None, level_code: str | None = None):
         return await self.node_repo.list(parent_id=parent_id, level_code=level_code, filter_parent=parent_id is not None)
 
+    async def get_tree(self, root_id=None):
+        if root_id is not None and not await self.node_repo.get(root_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found")
+        items: dict = {}
+        roots = []
+        for node, depth, product_count, total_product_count in await self.node_repo.tree(root_id):
+            item = {
+                "id": node.id,
+                "level_code": node.level_code,
+                "parent_id": node.parent_id,
+                "name": node.name,
+                "code": node.code,
+                "meta": node.meta or {},
+                "is_active": node.is_active,
+                "depth": depth,
+                "product_count": product_count,
+                "total_product_count": total_product_count,
+                "children": [],
+            }
+            items[node.id] = item
+            parent = items.get(node.parent_id) if depth else None
+            if parent is not None:
+                parent["children"].append(item)
+            elif depth == 0:
+                roots.append(item)
+        return roots
+
     async def create_node(self, data: dict[str, Any]):
         parent_id = data.get("parent_id")
         if parent_id is not None:
@@ -34,6 +61,7 @@ class CatalogHierarchyService:
             if not parent:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent node not found")
         node = await self.node_repo.create(data)
+        await self.node_repo.add_paths(node.id, parent_id)
         await self.session.refresh(node)
         return node
 
@@ -41,10 +69,16 @@ class CatalogHierarchyService:
         node = await self.node_repo.get(node_id)
         if not node:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Node not found")
-        if "parent_id" in data and data["parent_id"] is not None:
-            parent = await self.node_repo.get(data["parent_id"])
+        parent_id = data.pop("parent_id", node.parent_id)
+        if parent_id is not None:
+            parent = await self.node_repo.get(parent_id)
             if not parent:
                 raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Parent node not found")
+        if parent_id != node.parent_id:
+            if parent_id is not None and await self.node_repo.is_descendant(node.id, parent_id):
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot move node into its own subtree")
+            await self.node_repo.move_subtree(node.id, parent_id)
+            node.parent_id = parent_id
         for key, value in data.items():
             if value is not None:
                 setattr(node, key, value)
@@ -1,12 +1,46 @@
+import base64
+import hashlib
+import json
 import logging
+import uuid
 
 from fastapi import HTTPException, status
 from sqlalchemy.exc import DataError, IntegrityError, ProgrammingError
 
-from app.repos.catalog_repo import CategoryRepo, BrandRepo, ProductLineRepo, ProductRepo, CategoryBrandRepo
+from app.repos.catalog_repo import (
+    PRODUCT_BULK_CHUNK,
+    CategoryRepo,
+    BrandRepo,
+    ProductLineRepo,
+    ProductRepo,
+    CategoryBrandRepo,
+)
+from app.schemas.catalog import ProductOut
 
 logger = logging.getLogger(__name__)
 
+PRODUCT_LIST_FIELDS = tuple(ProductOut.model_fields)
+PRODUCT_PRICE_FIELDS = ("sell_price", "purchase_price", "cost_price")
+UNIQUE_CONSTRAINT_ERRORS = {"ix_products_sku": "Sku already exists"}
+
+
+def encode_cursor(sort_key: str, product_id) -> str:
+    raw = json.dumps([sort_key, str(product_id)], ensure_ascii=False).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, uuid.UUID]:
+    try:
+        sort_key, product_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        return str(sort_key), uuid.UUID(str(product_id))
+    except (ValueError, TypeError) as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor") from exc
+
+
+def catalog_etag(version: int, scope: str) -> str:
+    digest = hashlib.sha256(scope.encode()).hexdigest()[:16]
+    return f'"{version}-{digest}"'
+
 
 class CatalogService:
     def __init__(
@@ -188,9 +222,30 @@ class CatalogService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Line not found")
         await self.line_repo.delete(line)
 
+    async def catalog_version(self) -> int:
+        return await self.product_repo.catalog_version()
+
     async def list_products(self, filters):
         return await self.product_repo.list(filters)
 
+    async def list_products_page(self, filters, fields=None, limit=None, cursor=None):
+        columns = list(PRODUCT_LIST_FIELDS)
+        if fields:
+            columns = list(dict.fromkeys(["id", *fields]))
+            unknown = [name for name in columns if name not in PRODUCT_LIST_FIELDS]
+            if unknown:
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                    detail=f"Unknown fields: {', '.join(unknown)}",
+                )
+        after = decode_cursor(cursor) if cursor else None
+        rows = await self.product_repo.list_page(filters, columns, limit + 1 if limit else None, after)
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1]["_sort_key"], rows[-1]["id"])
+        return [{name: row[name] for name in columns} for row in rows], next_cursor
+
     async def _validate_product_links(self, category_id, brand_id, line_id):
         if not category_id or not brand_id:
             raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Category and brand required")
@@ -267,6 +322,188 @@ class CatalogService:
                 detail="Unable to create product.",
             ) from exc
 
+    async def _link_maps(self, rows: list[dict]):
+        category_ids = {row["category_id"] for row in rows if row.get("category_id")}
+        brand_ids = {row["brand_id"] for row in rows if row.get("brand_id")}
+        line_ids = {row["line_id"] for row in rows if row.get("line_id")}
+        pairs = await self.category_brand_repo.existing_pairs(category_ids, brand_ids)
+        lines = await self.line_repo.get_many(line_ids)
+        return pairs, lines
+
+    @staticmethod
+    def _link_error(category_id, brand_id, line_id, pairs: set, lines: dict) -> str | None:
+        if not category_id or not brand_id:
+            return "Category and brand required"
+        if (category_id, brand_id) not in pairs:
+            return "Brand is not linked to category"
+        if line_id:
+            line = lines.get(line_id)
+            if not line or line.brand_id != brand_id:
+                return "Line does not belong to brand"
+        return None
+
+    @staticmethod
+    def _bulk_response(results: list[dict]) -> dict:
+        return {
+            "created": sum(1 for result in results if result["status"] == "created"),
+            "updated": sum(1 for result in results if result["status"] == "updated"),
+            "failed": sum(1 for result in results if result["status"] == "failed"),
+            "results": results,
+        }
+
+    async def bulk_create_products(self, items: list[dict]):
+        pairs, lines = await self._link_maps(items)
+        brands = await self.brand_repo.get_many(
+            {item["brand_id"] for item in items if item.get("brand_id") and not (item.get("name") or "").strip()}
+        )
+        results = []
+        rows = []
+        skus = set()
+        for index, item in enumerate(items):
+            error = self._link_error(item.get("category_id"), item.get("brand_id"), item.get("line_id"), pairs, lines)
+            name = (item.get("name") or "").strip()
+            if not error and not name:
+                line = lines.get(item.get("line_id"))
+                brand = brands.get(item.get("brand_id"))
+                if not item.get("line_id"):
+                    error = "Product name required (or pick a line)"
+                elif not line:
+                    error = "Line not found"
+                elif not brand:
+                    error = "Brand not found"
+                else:
+                    name = " ".join(part for part in [brand.name.strip(), line.name.strip()] if part)
+            sku = item.get("sku")
+            if not error and sku and sku in skus:
+                error = "Duplicate sku in request"
+            if error:
+                results.append({"index": index, "id": None, "status": "failed", "error": error})
+                continue
+            skus.add(sku)
+            product_id = uuid.uuid4()
+            rows.append({**item, "id": product_id, "name": name})
+            results.append({"index": index, "id": product_id, "status": "created", "error": None})
+        inserted = await self.product_repo.insert_many(rows) if rows else set()
+        for result in results:
+            if result["status"] == "created" and result["id"] not in inserted:
+                result.update(id=None, status="failed", error="Product already exists")
+        return self._bulk_response(results)
+
+    @staticmethod
+    def _integrity_error(exc: IntegrityError) -> str:
+        sqlstate = getattr(exc.orig, "sqlstate", None)
+        constraint = getattr(getattr(exc.orig, "__cause__", None), "constraint_name", None)
+        if sqlstate == "23505":
+            if constraint in UNIQUE_CONSTRAINT_ERRORS:
+                return UNIQUE_CONSTRAINT_ERRORS[constraint]
+            return f"Duplicate value: {constraint}" if constraint else "Duplicate value"
+        if sqlstate == "23503":
+            return "Referenced record not found"
+        if sqlstate == "23502":
+            return "Required field missing"
+        return f"Constraint violated: {constraint}" if constraint else "Constraint violated"
+
+    async def _update_rows(self, rows: list[dict], fields: list[str], key: str, results: list[dict]) -> list[tuple]:
+        try:
+            async with self.session.begin_nested():
+                return await self.product_repo.update_many(rows, fields, key)
+        except IntegrityError as exc:
+            if len(rows) == 1:
+                results[rows[0]["index"]]["error"] = self._integrity_error(exc)
+                return []
+        updated = []
+        for row in rows:
+            updated.extend(await self._update_rows([row], fields, key, results))
+        return updated
+
+    async def _apply_groups(self, groups: dict, results: list[dict]) -> None:
+        for (key, fields), rows in groups.items():
+            updated = []
+            for start in range(0, len(rows), PRODUCT_BULK_CHUNK):
+                chunk = rows[start : start + PRODUCT_BULK_CHUNK]
+                updated.extend(await self._update_rows(chunk, list(fields), key, results))
+            matched = {value: product_id for product_id, value in updated}
+            for row in rows:
+                result = results[row["index"]]
+                if row[key] in matched:
+                    result.update(id=matched[row[key]], status="updated")
+                elif result["error"] is None:
+                    result.update(status="failed", error="Product not found")
+
+    async def bulk_update_products(self, items: list[dict]):
+        current = await self.product_repo.get_links({item["id"] for item in items})
+        effective = []
+        for item in items:
+            category_id, brand_id, line_id = current.get(item["id"], (None, None, None))
+            effective.append(
+                {
+                    "category_id": item.get("category_id") or category_id,
+                    "brand_id": item.get("brand_id") or brand_id,
+                    "line_id": item.get("line_id") or line_id,
+                }
+            )
+        pairs, lines = await self._link_maps(effective)
+        owners = await self.product_repo.sku_owners({item["sku"] for item in items if item.get("sku")})
+        results = []
+        groups: dict = {}
+        seen = set()
+        skus = set()
+        for index, (item, links) in enumerate(zip(items, effective)):
+            results.append({"index": index, "id": item["id"], "status": "failed", "error": None})
+            if item["id"] not in current:
+                results[index]["error"] = "Product not found"
+                continue
+            if item["id"] in seen:
+                results[index]["error"] = "Duplicate product in request"
+                continue
+            error = self._link_error(links["category_id"], links["brand_id"], links["line_id"], pairs, lines)
+            sku = item.get("sku")
+            if not error and sku and owners.get(sku, item["id"]) != item["id"]:
+                error = "Sku already exists"
+            if not error and sku and sku in skus:
+                error = "Duplicate sku in request"
+            if error:
+                results[index]["error"] = error
+                continue
+            seen.add(item["id"])
+            if sku:
+                skus.add(sku)
+            changes = {key: value for key, value in item.items() if key != "id" and value is not None}
+            if not changes:
+                results[index]["status"] = "updated"
+                continue
+            fields = tuple(sorted(changes))
+            groups.setdefault(("id", fields), []).append({"index": index, "id": item["id"], **changes})
+        await self._apply_groups(groups, results)
+        return self._bulk_response(results)
+
+    async def update_prices(self, items: list[dict]):
+        owners = await self.product_repo.sku_owners(
+            {item["sku"] for item in items if not item.get("id") and item.get("sku")}
+        )
+        results = []
+        groups: dict = {}
+        seen = set()
+        for index, item in enumerate(items):
+            results.append({"index": index, "id": item.get("id"), "status": "failed", "error": None})
+            product_id = item.get("id") or owners.get(item.get("sku"))
+            fields = tuple(name for name in PRODUCT_PRICE_FIELDS if item.get(name) is not None)
+            if not item.get("id") and not item.get("sku"):
+                results[index]["error"] = "id or sku required"
+            elif product_id is None:
+                results[index]["error"] = "Product not found"
+            elif not fields:
+                results[index]["error"] = "No prices to update"
+            elif product_id in seen:
+                results[index]["error"] = "Duplicate product in request"
+            else:
+                seen.add(product_id)
+                groups.setdefault(("id", fields), []).append(
+                    {"index": index, "id": product_id, **{name: item[name] for name in fields}}
+                )
+        await self._apply_groups(groups, results)
+        return self._bulk_response(results)
+
     async def get_product(self, product_id):
         product = await self.product_repo.get(product_id)
         if not product:
@@ -0,0 +1,58 @@
+from app.models.catalog import Brand, CatalogDeletion, Category, Product, ProductLine
+from app.repos.catalog_repo import CatalogChangeRepo
+
+CATALOG_SYNC_SOURCES = {
+    "products": (
+        Product,
+        [
+            "id",
+            "sku",
+            "barcode",
+            "name",
+            "unit",
+            "sell_price",
+            "tax_rate",
+            "category_id",
+            "brand_id",
+            "line_id",
+            "is_active",
+            "is_hidden",
+            "variant_group",
+            "variant_name",
+        ],
+    ),
+    "categories": (Category, ["id", "name", "is_active"]),
+    "brands": (Brand, ["id", "name", "is_active"]),
+    "lines": (ProductLine, ["id", "brand_id", "name", "is_active"]),
+}
+CATALOG_SYNC_ENTITIES = {
+    "products": "products",
+    "categories": "categories",
+    "brands": "brands",
+    "product_lines": "lines",
+}
+
+
+class CatalogSyncService:
+    def __init__(self, change_repo: CatalogChangeRepo):
+        self.change_repo = change_repo
+
+    async def changes(self, since: int, limit: int) -> dict:
+        watermark = await self.change_repo.watermark()
+        upper = max(watermark, since)
+        if since < watermark:
+            for model in [source[0] for source in CATALOG_SYNC_SOURCES.values()] + [CatalogDeletion]:
+                cut = await self.change_repo.cut(model, since, watermark, limit)
+                if cut is not None:
+                    upper = min(upper, cut)
+        payload = {"since": since, "checkpoint": upper, "has_more": upper < watermark}
+        for key, (model, columns) in CATALOG_SYNC_SOURCES.items():
+            rows = await self.change_repo.changed(model, columns, since, upper) if since < upper else []
+            payload[key] = {"columns": columns, "rows": rows}
+        deleted: dict[str, list] = {key: [] for key in CATALOG_SYNC_SOURCES}
+        deletions = await self.change_repo.deletions(since, upper) if since < upper else []
+        for entity, entity_id in deletions:
+            if entity in CATALOG_SYNC_ENTITIES:
+                deleted[CATALOG_SYNC_ENTITIES[entity]].append(entity_id)
+        payload["deleted"] = deleted
+        return payload
@@ -0,0 +1,45 @@
+from decimal import Decimal
+
+from app.core.config import get_settings
+
+
+class LastPurchaseCosting:
+    method = "LAST_PURCHASE"
+
+    def unit_cost(self, product) -> Decimal:
+        purchase_price = Decimal(product.purchase_price or 0)
+        if purchase_price > 0:
+            return purchase_price
+        return Decimal(product.cost_price or 0)
+
+    def sale_cost(self, product, qty: Decimal, consumed: list) -> Decimal:
+        return self.unit_cost(product)
+
+
+class WeightedAverageCosting(LastPurchaseCosting):
+    method = "WEIGHTED_AVERAGE"
+
+    def unit_cost(self, product) -> Decimal:
+        avg_cost = Decimal(product.avg_cost or 0)
+        if avg_cost > 0:
+            return avg_cost
+        return super().unit_cost(product)
+
+
+class FifoCosting(LastPurchaseCosting):
+    method = "FIFO"
+
+    def sale_cost(self, product, qty: Decimal, consumed: list) -> Decimal:
+        if not qty or not consumed:
+            return self.unit_cost(product)
+        total = sum((Decimal(str(take)) * Decimal(batch.unit_cost) for batch, take in consumed), Decimal("0"))
+        return total / Decimal(qty)
+
+
+COSTING_STRATEGIES = {
+    strategy.method: strategy for strategy in (LastPurchaseCosting(), WeightedAverageCosting(), FifoCosting())
+}
+
+
+def get_costing_strategy(method: str | None = None) -> LastPurchaseCosting:
+    return COSTING_STRATEGIES[method or get_settings().costing_method]
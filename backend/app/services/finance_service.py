@@ -1,28 +1,210 @@
 import calendar
-from collections import defaultdict
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+import json
+from typing import AsyncIterator
 import uuid
 
 from fastapi import HTTPException, status
-from sqlalchemy import Date, cast, func, select
-
-from app.models.finance import (
-    Expense,
-    ExpenseAccrual,
-    RecurringExpense,
-    RecurringExpenseAllocationMethod,
-    RecurringExpensePeriod,
-)
+from sqlalchemy import Date, and_, cast, func, literal_column, or_, select, true
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.business_date import business_date_for, business_today
+from app.core.config import get_settings
+from app.models.finance import Expense, ExpenseAccrual, ProfitLossSnapshot
 from app.models.sales import Sale, SaleItem, SaleStatus, SaleTaxLine
+from app.models.store import Store
 from app.repos.finance_repo import (
+    AccountingPeriodRepo,
     ExpenseAccrualRepo,
     ExpenseCategoryRepo,
     ExpenseRepo,
     RecurringExpenseRepo,
 )
 from app.repos.store_repo import StoreRepo
-from app.schemas.finance import ProfitLossDailyBreakdown, ProfitLossResponse, ProfitLossTotals
+from app.schemas.finance import (
+    ProfitLossComparisonResponse,
+    ProfitLossConsolidated,
+    ProfitLossDailyBreakdown,
+    ProfitLossResponse,
+    ProfitLossStoreSeries,
+    ProfitLossTotals,
+)
+
+
+PROFIT_LOSS_TOTALS = {
+    "revenue_total": "revenue",
+    "cogs_total": "cogs",
+    "taxes_total": "taxes",
+    "one_time_expenses_total": "one_time_expenses",
+    "fixed_accruals_total": "fixed_costs",
+}
+
+
+PROFIT_LOSS_BUCKETS = {"day": "1 day", "week": "1 week", "month": "1 month"}
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def month_end(month: date) -> date:
+    return month.replace(day=calendar.monthrange(month.year, month.month)[1])
+
+
+def profit_loss_statement(
+    store_ids: list[uuid.UUID] | None,
+    date_from: date,
+    date_to: date,
+    bucket: str = "day",
+    closed_months: list[date] | None = None,
+):
+    closed_months = closed_months or []
+
+    def bucketed(column):
+        if bucket == "day":
+            return column
+        return cast(func.date_trunc(bucket, column), Date)
+
+    def in_scope(column):
+        if store_ids is None:
+            return true()
+        return column.in_(store_ids)
+
+    def live_range(column):
+        conditions = [column >= date_from, column <= date_to]
+        if closed_months:
+            conditions.append(
+                ~or_(*(column.between(month, month_end(month)) for month in closed_months))
+            )
+        return and_(*conditions)
+
+    stores = (
+        select(Store.id.label("store_id"), Store.name.label("store_name"))
+        .where(in_scope(Store.id))
+        .subquery("store_scope")
+    )
+    calendar = (
+        select(
+            cast(
+                func.generate_series(
+                    bucket_start(date_from, bucket),
+                    date_to,
+                    literal_column(f"interval '{PROFIT_LOSS_BUCKETS[bucket]}'"),
+                ).column_valued(),
+                Date,
+            ).label("day")
+        )
+    ).subquery("calendar")
+
+    def sales_source(name, amount, *joins):
+        day = bucketed(Sale.business_date)
+        stmt = select(Sale.store_id.label("store_id"), day.label("day"), func.sum(amount).label("amount"))
+        for target, onclause in joins:
+            stmt = stmt.join(target, onclause)
+        return (
+            stmt.where(
+                Sale.status == SaleStatus.completed,
+                in_scope(Sale.store_id),
+                live_range(Sale.business_date),
+            )
+            .group_by(Sale.store_id, day)
+            .subquery(name)
+        )
+
+    revenue = sales_source("revenue", Sale.total_amount)
+    cogs = sales_source(
+        "cogs", SaleItem.line_total - SaleItem.profit_line, (SaleItem, SaleItem.sale_id == Sale.id)
+    )
+    taxes = sales_source("taxes", SaleTaxLine.tax_amount, (SaleTaxLine, SaleTaxLine.sale_id == Sale.id))
+    expense_day = bucketed(Expense.business_date)
+    one_time = (
+        select(Expense.store_id.label("store_id"), expense_day.label("day"), func.sum(Expense.amount).label("amount"))
+        .where(
+            in_scope(Expense.store_id),
+            live_range(Expense.business_date),
+        )
+        .group_by(Expense.store_id, expense_day)
+        .subquery("one_time")
+    )
+    accrual_day = bucketed(ExpenseAccrual.date)
+    fixed = (
+        select(
+            ExpenseAccrual.store_id.label("store_id"),
+            accrual_day.label("day"),
+            func.sum(ExpenseAccrual.amount).label("amount"),
+        )
+        .where(
+            in_scope(ExpenseAccrual.store_id),
+            live_range(ExpenseAccrual.date),
+        )
+        .group_by(ExpenseAccrual.store_id, accrual_day)
+        .subquery("fixed")
+    )
+    snapshot_day = bucketed(ProfitLossSnapshot.date)
+    snapshot_columns = ("revenue", "cogs", "taxes", "one_time_expenses", "fixed_costs")
+    snapshots = (
+        select(
+            ProfitLossSnapshot.store_id.label("store_id"),
+            snapshot_day.label("day"),
+            *(func.sum(getattr(ProfitLossSnapshot, name)).label(name) for name in snapshot_columns),
+        )
+        .where(
+            in_scope(ProfitLossSnapshot.store_id),
+            ProfitLossSnapshot.date >= date_from,
+            ProfitLossSnapshot.date <= date_to,
+        )
+        .group_by(ProfitLossSnapshot.store_id, snapshot_day)
+        .subquery("snapshots")
+    )
+    sources = (revenue, cogs, taxes, one_time, fixed)
+    amounts = [func.coalesce(source.c.amount, 0) for source in sources]
+    if closed_months:
+        amounts = [
+            amount + func.coalesce(snapshots.c[name], 0)
+            for amount, name in zip(amounts, snapshot_columns)
+        ]
+        sources += (snapshots,)
+    revenue_amount, cogs_amount, taxes_amount, one_time_amount, fixed_amount = amounts
+    stmt = select(
+        stores.c.store_id,
+        stores.c.store_name,
+        calendar.c.day,
+        revenue_amount.label("revenue"),
+        cogs_amount.label("cogs"),
+        taxes_amount.label("taxes"),
+        one_time_amount.label("one_time_expenses"),
+        fixed_amount.label("fixed_costs"),
+        (revenue_amount - cogs_amount - taxes_amount - one_time_amount - fixed_amount).label(
+            "operating_profit"
+        ),
+    ).select_from(stores.join(calendar, literal_column("true")))
+    for source in sources:
+        stmt = stmt.outerjoin(
+            source, (source.c.store_id == stores.c.store_id) & (source.c.day == calendar.c.day)
+        )
+    return stmt.order_by(stores.c.store_name, stores.c.store_id, calendar.c.day)
+
+
+async def ensure_period_open(session: AsyncSession, day: date) -> None:
+    if await AccountingPeriodRepo(session).is_closed(day):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Accounting period {day.strftime('%Y-%m')} is closed",
+        )
+
+
+async def accrue_ahead(session: AsyncSession, days: int | None = None) -> int:
+    if days is None:
+        days = get_settings().accrual_ahead_days
+    today = await business_today(session)
+    return await ExpenseAccrualRepo(session).generate(
+        None, today - timedelta(days=1), today + timedelta(days=days)
+    )
 
 
 class AccrualService:
@@ -30,43 +212,19 @@ class AccrualService:
         self.recurring_repo = recurring_repo
         self.accrual_repo = accrual_repo
 
-    async def ensure_accruals(self, store_id: uuid.UUID, date_from: date, date_to: date) -> None:
-        recurring_expenses = await self.recurring_repo.list_for_accruals(
-            store_id, date_from, date_to
+    async def ensure_accruals(self, store_id: uuid.UUID | None, date_from: date, date_to: date) -> int:
+        return await self.accrual_repo.generate(store_id, date_from, date_to)
+
+    async def accrue_recurring_expense(self, recurring_expense, replace: bool = False) -> int:
+        today = await business_today(self.accrual_repo.session)
+        if replace:
+            await self.accrual_repo.delete_stale(recurring_expense, today)
+        if not recurring_expense.is_active:
+            return 0
+        date_to = today + timedelta(days=get_settings().accrual_ahead_days)
+        return await self.accrual_repo.generate(
+            recurring_expense.store_id, recurring_expense.start_date, date_to, recurring_expense.id
         )
-        for recurring_expense in recurring_expenses:
-            active_from = max(date_from, recurring_expense.start_date)
-            active_to = min(date_to, recurring_expense.end_date or date_to)
-            if active_from > active_to:
-                continue
-            existing_dates = await self.accrual_repo.list_existing_dates(
-                recurring_expense.id, active_from, active_to
-            )
-            payloads: list[dict] = []
-            current = active_from
-            while current <= active_to:
-                if current not in existing_dates:
-                    payloads.append(
-                        {
-                            "store_id": store_id,
-                            "recurring_expense_id": recurring_expense.id,
-                            "date": current,
-                            "amount": self._daily_amount(recurring_expense, current),
-                        }
-                    )
-                current += timedelta(days=1)
-            await self.accrual_repo.bulk_create(payloads)
-
-    def _daily_amount(self, recurring_expense: RecurringExpense, day: date) -> Decimal:
-        amount = Decimal(recurring_expense.amount)
-        if recurring_expense.period == RecurringExpensePeriod.daily:
-            return amount
-        if recurring_expense.period == RecurringExpensePeriod.weekly:
-            return amount / Decimal("7")
-        if recurring_expense.allocation_method == RecurringExpenseAllocationMethod.fixed_30:
-            return amount / Decimal("30")
-        days_in_month = Decimal(str(calendar.monthrange(day.year, day.month)[1]))
-        return amount / days_in_month
 
 
 class FinanceService:
@@ -77,12 +235,14 @@ class FinanceService:
         recurring_repo: RecurringExpenseRepo,
         accrual_service: AccrualService,
         store_repo: StoreRepo,
+        period_repo: AccountingPeriodRepo,
     ):
         self.category_repo = category_repo
         self.expense_repo = expense_repo
         self.recurring_repo = recurring_repo
         self.accrual_service = accrual_service
         self.store_repo = store_repo
+        self.period_repo = period_repo
 
     async def list_categories(self):
         return await self.category_repo.list()
@@ -103,14 +263,54 @@ class FinanceService:
         payload["created_by_user_id"] = user_id
         if not payload.get("store_id"):
             payload["store_id"] = (await self.store_repo.get_default()).id
+        session = self.expense_repo.session
+        await ensure_period_open(session, await business_date_for(session, payload["occurred_at"]))
         return await self.expense_repo.create(payload)
 
     async def delete_expense(self, expense_id):
         expense = await self.expense_repo.session.get(Expense, expense_id)
         if not expense:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Expense not found")
+        await ensure_period_open(self.expense_repo.session, expense.business_date)
         await self.expense_repo.delete(expense)
 
+    async def list_periods(self):
+        return await self.period_repo.list()
+
+    async def close_period(self, month: date, user_id):
+        month = month.replace(day=1)
+        today = await business_today(self.expense_repo.session)
+        if month >= today.replace(day=1):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Only past months can be closed",
+            )
+        period = await self.period_repo.get(month, for_update=True)
+        if period and period.is_closed:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Period already closed")
+        if period is None:
+            period = await self.period_repo.create({"month": month, "is_closed": False})
+        await self.period_repo.delete_snapshots(month)
+        await self.period_repo.store_snapshots(
+            month, profit_loss_statement(None, month, month_end(month))
+        )
+        period.is_closed = True
+        period.closed_at = datetime.now(timezone.utc)
+        period.closed_by_user_id = user_id
+        await self.expense_repo.session.flush()
+        return period
+
+    async def reopen_period(self, month: date, user_id):
+        period = await self.period_repo.get(month.replace(day=1), for_update=True)
+        if not period or not period.is_closed:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Period is not closed")
+        await self.period_repo.delete_snapshots(period.month)
+        period.is_closed = False
+        period.reopened_at = datetime.now(timezone.utc)
+        period.reopened_by_user_id = user_id
+        await self.expense_repo.session.flush()
+        return period
+
     async def list_recurring_expenses(self, store_id: uuid.UUID | None = None):
         return await self.recurring_repo.list(store_id)
 
@@ -118,7 +318,9 @@ class FinanceService:
         payload = data.copy()
         if not payload.get("store_id"):
             payload["store_id"] = (await self.store_repo.get_default()).id
-        return await self.recurring_repo.create(payload)
+        recurring_expense = await self.recurring_repo.create(payload)
+        await self.accrual_service.accrue_recurring_expense(recurring_expense)
+        return recurring_expense
 
     async def update_recurring_expense(self, recurring_expense_id: uuid.UUID, data: dict):
         recurring_expense = await self.recurring_repo.get(recurring_expense_id)
@@ -129,7 +331,9 @@ class FinanceService:
         payload = data.copy()
         if payload.get("store_id") is None:
             payload.pop("store_id", None)
-        return await self.recurring_repo.update(recurring_expense, payload)
+        recurring_expense = await self.recurring_repo.update(recurring_expense, payload)
+        await self.accrual_service.accrue_recurring_expense(recurring_expense, replace=True)
+        return recurring_expense
 
     async def delete_recurring_expense(self, recurring_expense_id: uuid.UUID):
         recurring_expense = await self.recurring_repo.get(recurring_expense_id)
@@ -137,10 +341,12 @@ class FinanceService:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Recurring expense not found"
             )
-        return await self.recurring_repo.update(recurring_expense, {"is_active": False})
+        recurring_expense = await self.recurring_repo.update(recurring_expense, {"is_active": False})
+        await self.accrual_service.accrue_recurring_expense(recurring_expense, replace=True)
+        return recurring_expense
 
-    async def ensure_accruals(self, store_id: uuid.UUID, date_from: date, date_to: date) -> None:
-        await self.accrual_service.ensure_accruals(store_id, date_from, date_to)
+    async def ensure_accruals(self, store_id: uuid.UUID, date_from: date, date_to: date) -> int:
+        return await self.accrual_service.ensure_accruals(store_id, date_from, date_to)
 
     async def profit_loss(
         self,
@@ -148,128 +354,135 @@ class FinanceService:
         date_from: date,
         date_to: date,
     ) -> ProfitLossResponse:
-        if date_from > date_to:
-            raise HTTPException(
-                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
-                detail="date_from must be less than or equal to date_to",
-            )
-
-        if not store_id:
-            store_id = (await self.store_repo.get_default()).id
-
-        await self.ensure_accruals(store_id, date_from, date_to)
-
-        revenue_by_day = await self._fetch_sales_sum_by_day(
-            select(func.date(Sale.created_at), func.coalesce(func.sum(Sale.total_amount), 0))
-            .where(
-                Sale.status == SaleStatus.completed,
-                Sale.store_id == store_id,
-                cast(Sale.created_at, Date) >= date_from,
-                cast(Sale.created_at, Date) <= date_to,
-            )
-            .group_by(func.date(Sale.created_at))
-        )
-        cogs_by_day = await self._fetch_sales_sum_by_day(
-            select(
-                func.date(Sale.created_at),
-                func.coalesce(func.sum(SaleItem.line_total - SaleItem.profit_line), 0),
-            )
-            .join(SaleItem, SaleItem.sale_id == Sale.id)
-            .where(
-                Sale.status == SaleStatus.completed,
-                Sale.store_id == store_id,
-                cast(Sale.created_at, Date) >= date_from,
-                cast(Sale.created_at, Date) <= date_to,
-            )
-            .group_by(func.date(Sale.created_at))
+        self.validate_range(date_from, date_to)
+        store_id = await self.resolve_store_id(store_id)
+        closed_months = await self.period_repo.closed_months(date_from, date_to)
+        result = await self.expense_repo.session.execute(
+            profit_loss_statement([store_id], date_from, date_to, closed_months=closed_months)
         )
-        taxes_by_day = await self._fetch_sales_sum_by_day(
-            select(func.date(Sale.created_at), func.coalesce(func.sum(SaleTaxLine.tax_amount), 0))
-            .join(SaleTaxLine, SaleTaxLine.sale_id == Sale.id)
-            .where(
-                Sale.status == SaleStatus.completed,
-                Sale.store_id == store_id,
-                cast(Sale.created_at, Date) >= date_from,
-                cast(Sale.created_at, Date) <= date_to,
-            )
-            .group_by(func.date(Sale.created_at))
+        daily_breakdown = [self._daily_row(row) for row in result.all()]
+        sums = dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))
+        for day in daily_breakdown:
+            self._add_day(sums, day)
+        return ProfitLossResponse(totals=self._totals(sums), daily_breakdown=daily_breakdown)
+
+    async def stream_profit_loss(
+        self,
+        store_id: uuid.UUID,
+        date_from: date,
+        date_to: date,
+    ) -> AsyncIterator[str]:
+        closed_months = await self.period_repo.closed_months(date_from, date_to)
+        rows = await self.expense_repo.session.stream(
+            profit_loss_statement(
+                [store_id], date_from, date_to, closed_months=closed_months
+            ).execution_options(yield_per=500)
         )
-        one_time_by_day = await self._fetch_generic_sum_by_day(
-            select(func.date(Expense.occurred_at), func.coalesce(func.sum(Expense.amount), 0))
-            .where(
-                Expense.store_id == store_id,
-                cast(Expense.occurred_at, Date) >= date_from,
-                cast(Expense.occurred_at, Date) <= date_to,
-            )
-            .group_by(func.date(Expense.occurred_at))
+        sums = dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))
+        async for row in rows:
+            day = self._daily_row(row)
+            self._add_day(sums, day)
+            yield day.model_dump_json() + "\n"
+        yield json.dumps({"totals": self._totals(sums).model_dump(mode="json")}) + "\n"
+
+    async def compare_profit_loss(
+        self,
+        store_ids: list[uuid.UUID] | None,
+        date_from: date,
+        date_to: date,
+        bucket: str = "day",
+    ) -> ProfitLossComparisonResponse:
+        self.validate_range(date_from, date_to)
+        if bucket not in PROFIT_LOSS_BUCKETS:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid bucket")
+        closed_months = await self.period_repo.closed_months(date_from, date_to)
+        result = await self.expense_repo.session.execute(
+            profit_loss_statement(store_ids or None, date_from, date_to, bucket, closed_months)
         )
-        fixed_by_day = await self._fetch_generic_sum_by_day(
-            select(ExpenseAccrual.date, func.coalesce(func.sum(ExpenseAccrual.amount), 0))
-            .where(
-                ExpenseAccrual.store_id == store_id,
-                ExpenseAccrual.date >= date_from,
-                ExpenseAccrual.date <= date_to,
+        stores: dict[uuid.UUID, ProfitLossStoreSeries] = {}
+        store_sums: dict[uuid.UUID, dict[str, Decimal]] = {}
+        consolidated_days: dict[date, dict[str, Decimal]] = {}
+        consolidated_sums = dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))
+        for row in result.all():
+            day = self._daily_row(row)
+            store = stores.get(row.store_id)
+            if store is None:
+                store = stores[row.store_id] = ProfitLossStoreSeries(
+                    store_id=row.store_id,
+                    store_name=row.store_name,
+                    totals=self._totals(dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))),
+                    series=[],
+                )
+                store_sums[row.store_id] = dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))
+            store.series.append(day)
+            self._add_day(store_sums[row.store_id], day)
+            self._add_day(consolidated_sums, day)
+            self._add_day(
+                consolidated_days.setdefault(day.date, dict.fromkeys(PROFIT_LOSS_TOTALS, Decimal("0"))),
+                day,
             )
-            .group_by(ExpenseAccrual.date)
-        )
-
-        revenue_total = self._sum_map(revenue_by_day)
-        cogs_total = self._sum_map(cogs_by_day)
-        taxes_total = self._sum_map(taxes_by_day)
-        one_time_expenses_total = self._sum_map(one_time_by_day)
-        fixed_accruals_total = self._sum_map(fixed_by_day)
-        gross_profit = revenue_total - cogs_total - taxes_total
-        operating_profit = gross_profit - one_time_expenses_total - fixed_accruals_total
-
-        daily_breakdown: list[ProfitLossDailyBreakdown] = []
-        current_day = date_from
-        while current_day <= date_to:
-            revenue = revenue_by_day[current_day]
-            cogs = cogs_by_day[current_day]
-            taxes = taxes_by_day[current_day]
-            one_time_expenses = one_time_by_day[current_day]
-            fixed_costs = fixed_by_day[current_day]
-            day_operating_profit = revenue - cogs - taxes - one_time_expenses - fixed_costs
-            daily_breakdown.append(
+        for store_id, store in stores.items():
+            store.totals = self._totals(store_sums[store_id])
+        consolidated_series = []
+        for day, sums in sorted(consolidated_days.items()):
+            totals = self._totals(sums)
+            consolidated_series.append(
                 ProfitLossDailyBreakdown(
-                    date=current_day,
-                    revenue=revenue,
-                    cogs=cogs,
-                    taxes=taxes,
-                    one_time_expenses=one_time_expenses,
-                    fixed_costs=fixed_costs,
-                    operating_profit=day_operating_profit,
+                    date=day,
+                    revenue=totals.revenue_total,
+                    cogs=totals.cogs_total,
+                    taxes=totals.taxes_total,
+                    one_time_expenses=totals.one_time_expenses_total,
+                    fixed_costs=totals.fixed_accruals_total,
+                    operating_profit=totals.operating_profit,
                 )
             )
-            current_day += timedelta(days=1)
-
-        return ProfitLossResponse(
-            totals=ProfitLossTotals(
-                revenue_total=revenue_total,
-                cogs_total=cogs_total,
-                taxes_total=taxes_total,
-                one_time_expenses_total=one_time_expenses_total,
-                fixed_accruals_total=fixed_accruals_total,
-                gross_profit=gross_profit,
-                operating_profit=operating_profit,
-                profitable=operating_profit >= Decimal("0"),
+        return ProfitLossComparisonResponse(
+            date_from=date_from,
+            date_to=date_to,
+            bucket=bucket,
+            stores=list(stores.values()),
+            consolidated=ProfitLossConsolidated(
+                totals=self._totals(consolidated_sums),
+                series=consolidated_series,
             ),
-            daily_breakdown=daily_breakdown,
         )
 
-    async def _fetch_sales_sum_by_day(self, stmt):
-        result = await self.expense_repo.session.execute(stmt)
-        values: dict[date, Decimal] = defaultdict(lambda: Decimal("0"))
-        for day, amount in result.all():
-            values[day] = Decimal(amount or 0)
-        return values
-
-    async def _fetch_generic_sum_by_day(self, stmt):
-        result = await self.expense_repo.session.execute(stmt)
-        values: dict[date, Decimal] = defaultdict(lambda: Decimal("0"))
-        for day, amount in result.all():
-            values[day] = Decimal(amount or 0)
-        return values
-
-    def _sum_map(self, values: dict[date, Decimal]) -> Decimal:
-        return sum(values.values(), start=Decimal("0"))
+    async def resolve_store_id(self, store_id: uuid.UUID | None) -> uuid.UUID:
+        if store_id:
+            return store_id
+        return (await self.store_repo.get_default()).id
+
+    def validate_range(self, date_from: date, date_to: date) -> None:
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="date_from must be less than or equal to date_to",
+            )
+
+    def _daily_row(self, row) -> ProfitLossDailyBreakdown:
+        return ProfitLossDailyBreakdown(
+            date=row.day,
+            revenue=Decimal(row.revenue),
+            cogs=Decimal(row.cogs),
+            taxes=Decimal(row.taxes),
+            one_time_expenses=Decimal(row.one_time_expenses),
+            fixed_costs=Decimal(row.fixed_costs),
+            operating_profit=Decimal(row.operating_profit),
+        )
+
+    def _add_day(self, sums: dict[str, Decimal], day: ProfitLossDailyBreakdown) -> None:
+        for total_name, field_name in PROFIT_LOSS_TOTALS.items():
+            sums[total_name] += getattr(day, field_name)
+
+    def _totals(self, sums: dict[str, Decimal]) -> ProfitLossTotals:
+        gross_profit = sums["revenue_total"] - sums["cogs_total"] - sums["taxes_total"]
+        operating_profit = (
+            gross_profit - sums["one_time_expenses_total"] - sums["fixed_accruals_total"]
+        )
+        return ProfitLossTotals(
+            **sums,
+            gross_profit=gross_profit,
+            operating_profit=operating_profit,
+            profitable=operating_profit >= Decimal("0"),
+        )
@@ -0,0 +1,221 @@
+import asyncio
+import csv
+import json
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from pathlib import Path
+from typing import IO, AsyncIterator, Iterator
+from xml.etree.ElementTree import iterparse
+from zipfile import BadZipFile, ZipFile
+
+from fastapi import UploadFile
+
+from app.core.config import get_settings
+
+SPREADSHEET_NS = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_RELATIONSHIP_NS = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+SPOOL_CHUNK_BYTES = 1024 * 1024
+
+
+def _column_index(column_letters: str) -> int:
+    result = 0
+    for char in column_letters.upper():
+        result = result * 26 + (ord(char) - ord("A") + 1)
+    return max(result - 1, 0)
+
+
+def _read_shared_strings(archive: ZipFile) -> list[str]:
+    try:
+        handle = archive.open("xl/sharedStrings.xml")
+    except KeyError:
+        return []
+    values: list[str] = []
+    with handle:
+        for _, elem in iterparse(handle, events=("end",)):
+            if elem.tag == f"{SPREADSHEET_NS}si":
+                values.append("".join(node.text or "" for node in elem.iter(f"{SPREADSHEET_NS}t")))
+                elem.clear()
+    return values
+
+
+def _sheet_path(archive: ZipFile, sheet: str | None) -> str | None:
+    sheets = []
+    with archive.open("xl/workbook.xml") as handle:
+        for _, elem in iterparse(handle, events=("end",)):
+            if elem.tag == f"{SPREADSHEET_NS}sheet":
+                sheets.append((elem.attrib.get("name"), elem.attrib.get(f"{RELATIONSHIP_NS}id")))
+    if not sheets:
+        return None
+    rel_id = sheets[0][1]
+    if sheet:
+        for name, candidate in sheets:
+            if name == sheet:
+                rel_id = candidate
+                break
+    targets = {}
+    with archive.open("xl/_rels/workbook.xml.rels") as handle:
+        for _, elem in iterparse(handle, events=("end",)):
+            if elem.tag == f"{PACKAGE_RELATIONSHIP_NS}Relationship":
+                targets[elem.attrib.get("Id")] = elem.attrib.get("Target", "")
+    target = targets.get(rel_id or "", "worksheets/sheet1.xml")
+    return f"xl/{target.lstrip('/')}"
+
+
+def _row_values(row, shared_strings: list[str]) -> list[str | None]:
+    values: list[str | None] = []
+    for cell in row.iter(f"{SPREADSHEET_NS}c"):
+        ref = cell.attrib.get("r", "A1")
+        col_idx = _column_index("".join(ch for ch in ref if ch.isalpha()) or "A")
+        while len(values) <= col_idx:
+            values.append(None)
+        cell_type = cell.attrib.get("t")
+        if cell_type == "inlineStr":
+            value = "".join(node.text or "" for node in cell.iter(f"{SPREADSHEET_NS}t"))
+        else:
+            value_node = cell.find(f"{SPREADSHEET_NS}v")
+            raw = value_node.text if value_node is not None else None
+            if cell_type == "s" and raw is not None and raw.isdigit():
+                idx = int(raw)
+                value = shared_strings[idx] if idx < len(shared_strings) else raw
+            else:
+                value = raw
+        values[col_idx] = value
+    return values
+
+
+def iter_xlsx_rows(path: str, sheet: str | None = None) -> Iterator[list[str] | dict[str, str | None]]:
+    try:
+        archive = ZipFile(path)
+    except BadZipFile as exc:
+        raise ValueError("Invalid XLSX file") from exc
+    with archive:
+        sheet_path = _sheet_path(archive, sheet)
+        if sheet_path is None:
+            return
+        shared_strings = _read_shared_strings(archive)
+        headers: list[str] | None = None
+        sheet_data = None
+        with archive.open(sheet_path) as handle:
+            for event, elem in iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == f"{SPREADSHEET_NS}sheetData":
+                        sheet_data = elem
+                    continue
+                if elem.tag != f"{SPREADSHEET_NS}row":
+                    continue
+                values = _row_values(elem, shared_strings)
+                if sheet_data is not None:
+                    sheet_data.clear()
+                if not values:
+                    continue
+                if headers is None:
+                    headers = [str(cell).strip() if cell is not None else "" for cell in values]
+                    yield [header for header in headers if header]
+                    continue
+                mapped: dict[str, str | None] = {}
+                for idx, header in enumerate(headers):
+                    if not header:
+                        continue
+                    value = values[idx] if idx < len(values) else None
+                    mapped[header] = str(value).strip() if value is not None else None
+                if mapped:
+                    yield mapped
+
+
+def iter_csv_rows(path: str, encoding: str = "utf-8", delimiter: str = ",") -> Iterator[list[str] | dict[str, str | None]]:
+    with open(path, encoding=encoding, newline="") as handle:
+        reader = csv.DictReader(handle, delimiter=delimiter)
+        yield list(reader.fieldnames or [])
+        for row in reader:
+            yield {str(k): (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+
+
+def parse_to_ndjson(
+    source_path: str,
+    target_path: str,
+    filename: str | None = None,
+    sheet: str | None = None,
+    encoding: str | None = None,
+    delimiter: str | None = None,
+) -> dict:
+    if Path(filename or "").suffix.lower() == ".xlsx":
+        rows = iter_xlsx_rows(source_path, sheet=sheet)
+    else:
+        rows = iter_csv_rows(source_path, encoding=encoding or "utf-8", delimiter=delimiter or ",")
+    columns: list[str] = []
+    count = 0
+    with open(target_path, "w", encoding="utf-8") as target:
+        for item in rows:
+            if isinstance(item, list):
+                columns = item
+                continue
+            target.write(json.dumps(item, ensure_ascii=False))
+            target.write("\n")
+            count += 1
+    return {"columns": columns, "rows": count}
+
+
+@lru_cache
+def _parser_pool() -> ProcessPoolExecutor:
+    return ProcessPoolExecutor(
+        max_workers=max(1, get_settings().import_parse_workers),
+        mp_context=multiprocessing.get_context("spawn"),
+        max_tasks_per_child=50,
+    )
+
+
+async def parse_in_worker(
+    source_path: str,
+    target_path: str,
+    filename: str | None = None,
+    sheet: str | None = None,
+    encoding: str | None = None,
+    delimiter: str | None = None,
+) -> dict:
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        _parser_pool(), parse_to_ndjson, source_path, target_path, filename, sheet, encoding, delimiter
+    )
+
+
+def _read_lines(handle: IO[str], size: int) -> list[dict]:
+    rows = []
+    for line in handle:
+        rows.append(json.loads(line))
+        if len(rows) >= size:
+            break
+    return rows
+
+
+async def iter_ndjson_chunks(path: str, chunk_size: int) -> AsyncIterator[list[dict]]:
+    handle = await asyncio.to_thread(open, path, "r", encoding="utf-8")
+    try:
+        while True:
+            chunk = await asyncio.to_thread(_read_lines, handle, chunk_size)
+            if not chunk:
+                return
+            yield chunk
+    finally:
+        handle.close()
+
+
+@asynccontextmanager
+async def spooled_upload(upload: UploadFile) -> AsyncIterator[tuple[str, int]]:
+    workdir = tempfile.mkdtemp(prefix="catalog-import-")
+    path = os.path.join(workdir, "upload" + Path(upload.filename or "").suffix.lower())
+    size = 0
+    try:
+        with open(path, "wb") as target:
+            while chunk := await upload.read(SPOOL_CHUNK_BYTES):
+                size += len(chunk)
+                await asyncio.to_thread(target.write, chunk)
+        yield path, size
+    finally:
+        for name in os.listdir(workdir):
+            os.unlink(os.path.join(workdir, name))
+        os.rmdir(workdir)
@@ -1,19 +1,70 @@
-import csv
-import io
+import logging
 import uuid
 from decimal import Decimal
-from pathlib import Path
-from xml.etree import ElementTree as ET
-from zipfile import BadZipFile, ZipFile
 
 from fastapi import HTTPException, status
-from sqlalchemy import select
+from sqlalchemy import func, literal_column, select
 from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.catalog import Brand, Category, Product, ProductLine, ProductUnit
-from app.repos.imports_repo import ImportsRepo
-from app.schemas.imports import ImportCounters
+from app.core.config import get_settings
+from app.core.db_utils import set_search_path
+from app.models.catalog import Brand, Category, CategoryBrand, Product, ProductLine, ProductUnit
+from app.models.imports import CatalogImportRow
+from app.repos.imports_repo import IMPORT_APPLY_CHUNK, IMPORT_FINISHED_STATUSES, IMPORT_ROWS_CHUNK, ImportsRepo
+from app.schemas.imports import ImportCounters, ImportKind
+from app.services.import_parser import iter_ndjson_chunks, parse_in_worker
+from app.services.inventory_import_service import InventoryImportService
+
+logger = logging.getLogger(__name__)
+
+PRODUCT_IMPORT_FIELDS = (
+    "name",
+    "sku",
+    "barcode",
+    "category_id",
+    "brand_id",
+    "line_id",
+    "unit",
+    "cost_price",
+    "sell_price",
+    "tax_rate",
+    "image_url",
+    "description",
+    "is_active",
+    "is_hidden",
+)
+PRODUCT_IMPORT_NULL_DEFAULTS = {"description": "", "is_active": True, "is_hidden": False}
+
+
+async def run_next_import(session: AsyncSession, schema: str, worker_id: str) -> bool:
+    settings = get_settings()
+    repo = ImportsRepo(session)
+    job = await repo.claim_next(worker_id, settings.import_job_stale_after)
+    if job is None:
+        return False
+    if job.attempts > settings.import_job_max_attempts:
+        job.last_error = job.last_error or "Worker stopped responding"
+        await repo.update_status(job.id, "failed")
+        await session.commit()
+        return True
+    await session.commit()
+    await set_search_path(session, schema)
+    try:
+        await ImportService(session, repo).perform_import(job.id, job.mapping, job.options, schema=schema)
+        await session.commit()
+    except Exception as exc:
+        logger.exception("Catalog import %s failed for schema=%s", job.id, schema)
+        await session.rollback()
+        await set_search_path(session, schema)
+        await repo.retry_or_fail(
+            job.id,
+            str(exc) or exc.__class__.__name__,
+            settings.import_job_max_attempts,
+            settings.import_job_retry_delay,
+        )
+        await session.commit()
+    return True
 
 
 class ImportService:
@@ -21,140 +72,51 @@ class ImportService:
         self.session = session
         self.imports_repo = imports_repo
 
-    def parse_file(
+    async def queue_import(self, import_id: uuid.UUID, mapping: dict[str, str], options: dict):
+        job = await self.imports_repo.get_import(import_id, for_update=True)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+        if job.status in {"queued", "running"}:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import is already queued or running")
+        job.mapping = mapping
+        job.options = options
+        job.status = "queued"
+        job.mode = "background"
+        job.attempts = 0
+        job.cancel_requested = False
+        job.run_after = None
+        job.last_error = None
+        job.finished_at = None
+        await self.session.flush()
+        return job
+
+    async def cancel_import(self, import_id: uuid.UUID):
+        job = await self.imports_repo.get_import(import_id, for_update=True)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+        if job.status in IMPORT_FINISHED_STATUSES:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Import already finished")
+        if job.status == "running":
+            job.cancel_requested = True
+            await self.session.flush()
+            return job
+        return await self.imports_repo.update_status(import_id, "cancelled")
+
+    async def stage_upload(
         self,
-        file_bytes: bytes,
+        import_id: uuid.UUID,
+        source_path: str,
         filename: str | None = None,
         sheet: str | None = None,
         encoding: str | None = None,
         delimiter: str | None = None,
-    ):
-        suffix = Path(filename or "").suffix.lower()
-
-        if suffix == ".xlsx":
-            rows, columns = self._parse_xlsx(file_bytes, sheet=sheet)
-            return {
-                "columns": columns,
-                "rows": rows,
-                "sample_rows": rows[:20],
-            }
-
-        text = file_bytes.decode(encoding or "utf-8")
-        reader = csv.DictReader(io.StringIO(text), delimiter=delimiter or ",")
-        rows: list[dict[str, str | None]] = []
-        for row in reader:
-            rows.append({str(k): (v.strip() if isinstance(v, str) else v) for k, v in row.items()})
-        return {
-            "columns": list(reader.fieldnames or []),
-            "rows": rows,
-            "sample_rows": rows[:20],
-        }
-
-    def _parse_xlsx(self, file_bytes: bytes, sheet: str | None = None):
-        namespace = {"x": "http://schemas.openxmlformats.org/spreadsheetml/2006/main", "r": "http://schemas.openxmlformats.org/officeDocument/2006/relationships"}
-
-        try:
-            archive = ZipFile(io.BytesIO(file_bytes))
-        except BadZipFile as exc:
-            raise ValueError("Invalid XLSX file") from exc
-
-        with archive:
-            workbook_xml = ET.fromstring(archive.read("xl/workbook.xml"))
-            rels_xml = ET.fromstring(archive.read("xl/_rels/workbook.xml.rels"))
-            shared_strings = self._read_shared_strings(archive)
-
-            rel_by_id = {
-                rel.attrib.get("Id"): rel.attrib.get("Target", "")
-                for rel in rels_xml.findall("{http://schemas.openxmlformats.org/package/2006/relationships}Relationship")
-            }
-            sheets = workbook_xml.findall("x:sheets/x:sheet", namespace)
-            if not sheets:
-                return [], []
-
-            selected = sheets[0]
-            if sheet:
-                for candidate in sheets:
-                    if candidate.attrib.get("name") == sheet:
-                        selected = candidate
-                        break
-
-            rel_id = selected.attrib.get("{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id")
-            target = rel_by_id.get(rel_id or "", "worksheets/sheet1.xml")
-            sheet_path = f"xl/{target.lstrip('/')}"
-            sheet_xml = ET.fromstring(archive.read(sheet_path))
-
-            rows = self._extract_sheet_rows(sheet_xml, shared_strings)
-            if not rows:
-                return [], []
-
-            headers = [str(cell).strip() if cell is not None else "" for cell in rows[0]]
-            mapped_rows: list[dict[str, str | None]] = []
-            for row in rows[1:]:
-                mapped: dict[str, str | None] = {}
-                for idx, header in enumerate(headers):
-                    if not header:
-                        continue
-                    value = row[idx] if idx < len(row) else None
-                    mapped[header] = str(value).strip() if value is not None else None
-                if mapped:
-                    mapped_rows.append(mapped)
-
-            return mapped_rows, [header for header in headers if header]
-
-    def _read_shared_strings(self, archive: ZipFile) -> list[str]:
-        try:
-            xml = ET.fromstring(archive.read("xl/sharedStrings.xml"))
-        except KeyError:
-            return []
-
-        values: list[str] = []
-        for item in xml.findall("{http://schemas.openxmlformats.org/spreadsheetml/2006/main}si"):
-            chunks = [node.text or "" for node in item.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}t")]
-            values.append("".join(chunks))
-        return values
-
-    def _extract_sheet_rows(self, sheet_xml: ET.Element, shared_strings: list[str]) -> list[list[str | None]]:
-        rows: list[list[str | None]] = []
-        row_nodes = sheet_xml.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}row")
-
-        for row in row_nodes:
-            cells = row.findall("{http://schemas.openxmlformats.org/spreadsheetml/2006/main}c")
-            if not cells:
-                continue
-
-            values: list[str | None] = []
-            for cell in cells:
-                ref = cell.attrib.get("r", "A1")
-                col_letters = "".join(ch for ch in ref if ch.isalpha()) or "A"
-                col_idx = self._column_index(col_letters)
-                while len(values) <= col_idx:
-                    values.append(None)
-
-                cell_type = cell.attrib.get("t")
-                if cell_type == "inlineStr":
-                    text_parts = [n.text or "" for n in cell.findall(".//{http://schemas.openxmlformats.org/spreadsheetml/2006/main}t")]
-                    value = "".join(text_parts)
-                else:
-                    value_node = cell.find("{http://schemas.openxmlformats.org/spreadsheetml/2006/main}v")
-                    raw = value_node.text if value_node is not None else None
-                    if cell_type == "s" and raw is not None and raw.isdigit():
-                        idx = int(raw)
-                        value = shared_strings[idx] if idx < len(shared_strings) else raw
-                    else:
-                        value = raw
-
-                values[col_idx] = value
-
-            rows.append(values)
-
-        return rows
-
-    @staticmethod
-    def _column_index(column_letters: str) -> int:
-        result = 0
-        for char in column_letters.upper():
-            result = result * 26 + (ord(char) - ord("A") + 1)
-        return max(result - 1, 0)
+    ) -> dict:
+        rows_path = f"{source_path}.ndjson"
+        parsed = await parse_in_worker(source_path, rows_path, filename, sheet, encoding, delimiter)
+        staged = 0
+        async for chunk in iter_ndjson_chunks(rows_path, IMPORT_ROWS_CHUNK):
+            staged += await self.imports_repo.add_rows(import_id, chunk, start_row=2 + staged)
+        return {"columns": parsed["columns"], "rows": staged}
 
     @staticmethod
     def _parse_decimal(value: object, decimal_separator: str = ".", thousand_separator: str = ",") -> Decimal | None:
@@ -177,65 +139,228 @@ class ImportService:
             for row in (await self.session.execute(select(Brand.id, Brand.name))).all()
         }
         lines = {
-            row.name.strip().lower(): row.id
-            for row in (await self.session.execute(select(ProductLine.id, ProductLine.name))).all()
+            (row.brand_id, row.name.strip().lower()): row.id
+            for row in (
+                await self.session.execute(select(ProductLine.id, ProductLine.brand_id, ProductLine.name))
+            ).all()
         }
         return categories, brands, lines
 
-    async def preview_import(self, job_id: uuid.UUID, mapping: dict[str, str], options: dict):
-        job = await self.imports_repo.get_import(job_id)
-        if not job:
-            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+    async def _resolve_missing(
+        self, import_id: uuid.UUID, mapping: dict[str, str], lookups: tuple[dict, dict, dict], persist: bool
+    ) -> tuple[tuple[dict, dict, dict], dict[str, list[str]]]:
+        categories, brands, lines = (dict(item) for item in lookups)
+        references = await self.imports_repo.distinct_values(
+            import_id, [mapping.get("category"), mapping.get("brand"), mapping.get("line")]
+        )
+        new_categories: dict[str, str] = {}
+        new_brands: dict[str, str] = {}
+        new_lines: dict[tuple[str, str], str] = {}
+        for category_name, brand_name, line_name in references:
+            if category_name and category_name.lower() not in categories:
+                new_categories.setdefault(category_name.lower(), category_name)
+            if brand_name and brand_name.lower() not in brands:
+                new_brands.setdefault(brand_name.lower(), brand_name)
+            if brand_name and line_name:
+                new_lines.setdefault((brand_name.lower(), line_name.lower()), line_name)
+
+        if not persist:
+            categories.update({key: uuid.uuid4() for key in new_categories})
+            brands.update({key: uuid.uuid4() for key in new_brands})
+        elif new_categories or new_brands:
+            if new_categories:
+                await self.session.execute(
+                    insert(Category)
+                    .values([{"id": uuid.uuid4(), "name": name, "is_active": True} for name in new_categories.values()])
+                    .on_conflict_do_nothing(index_elements=[Category.name])
+                )
+            if new_brands:
+                await self.session.execute(
+                    insert(Brand)
+                    .values([{"id": uuid.uuid4(), "name": name, "is_active": True} for name in new_brands.values()])
+                    .on_conflict_do_nothing(index_elements=[Brand.name])
+                )
+            categories, brands, _ = await self._lookup_ids()
+
+        missing_lines = {
+            (brands[brand_key], line_key): name
+            for (brand_key, line_key), name in new_lines.items()
+            if brand_key in brands and (brands[brand_key], line_key) not in lines
+        }
+        if not persist:
+            lines.update({key: uuid.uuid4() for key in missing_lines})
+        elif missing_lines:
+            await self.session.execute(
+                insert(ProductLine).values(
+                    [
+                        {"id": uuid.uuid4(), "brand_id": brand_id, "name": name, "is_active": True}
+                        for (brand_id, _), name in missing_lines.items()
+                    ]
+                )
+            )
+            _, _, lines = await self._lookup_ids()
+
+        if persist:
+            links = {
+                (categories[category_name.lower()], brands[brand_name.lower()])
+                for category_name, brand_name, _ in references
+                if category_name and brand_name
+                and category_name.lower() in categories
+                and brand_name.lower() in brands
+            }
+            if links:
+                await self.session.execute(
+                    insert(CategoryBrand)
+                    .values([{"category_id": category_id, "brand_id": brand_id} for category_id, brand_id in links])
+                    .on_conflict_do_nothing()
+                )
+
+        created = {
+            "categories": sorted(new_categories.values()),
+            "brands": sorted(new_brands.values()),
+            "lines": sorted(missing_lines.values()),
+        }
+        return (categories, brands, lines), created
 
-        if "name" not in mapping or not mapping["name"]:
-            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Mapping for 'name' is required")
+    def _validate_row(self, row: dict, mapping: dict[str, str], decimal_separator: str, thousand_separator: str) -> list[str]:
+        row_errors: list[str] = []
+        name = str(row.get(mapping.get("name")) or "").strip()
+        if not name:
+            row_errors.append("name is required")
 
-        decimal_separator = str(options.get("decimal_separator", "."))
-        thousand_separator = str(options.get("thousand_separator", ","))
+        for numeric_field in ("cost_price", "sell_price", "tax_rate"):
+            source_column = mapping.get(numeric_field)
+            if not source_column:
+                continue
+            raw = row.get(source_column)
+            if raw in (None, ""):
+                continue
+            try:
+                self._parse_decimal(raw, decimal_separator, thousand_separator)
+            except Exception:
+                row_errors.append(f"invalid number in {numeric_field}: {raw}")
+        return row_errors
+
+    async def _existing_products(self, import_id: uuid.UUID, match_by: str, source_column: str | None) -> dict[str, dict]:
+        if not source_column:
+            return {}
+        key_column = getattr(Product, match_by, Product.sku)
+        columns = [getattr(Product, field) for field in PRODUCT_IMPORT_FIELDS]
+        staged_keys = (
+            select(func.btrim(CatalogImportRow.data[source_column].astext))
+            .where(CatalogImportRow.import_id == import_id)
+            .distinct()
+        )
+        result = await self.session.execute(select(key_column, *columns).where(key_column.in_(staged_keys)))
+        return {row[0]: dict(zip(PRODUCT_IMPORT_FIELDS, row[1:])) for row in result.all()}
+
+    @staticmethod
+    def _diff_product(current: dict, payload: dict) -> dict[str, dict]:
+        changes: dict[str, dict] = {}
+        for field in PRODUCT_IMPORT_FIELDS:
+            before = current.get(field)
+            if isinstance(before, ProductUnit):
+                before = before.value
+            after = payload.get(field)
+            if before is None:
+                before = PRODUCT_IMPORT_NULL_DEFAULTS.get(field)
+            if before in (None, "") and after in (None, ""):
+                continue
+            if before != after:
+                changes[field] = {"from": before, "to": after}
+        return changes
 
-        errors: list[dict[str, str]] = []
-        sample_actions: list[dict[str, str | int]] = []
+    def _build_payload(
+        self,
+        row: dict,
+        mapping: dict[str, str],
+        lookups: tuple[dict, dict, dict],
+        decimal_separator: str,
+        thousand_separator: str,
+    ) -> tuple[dict | None, str | None]:
+        row_errors = self._validate_row(row, mapping, decimal_separator, thousand_separator)
+        if row_errors:
+            return None, "; ".join(row_errors)
+        categories, brands, lines = lookups
+
+        sku_col = mapping.get("sku")
+        sku = str(row.get(sku_col) or "").strip() if sku_col else None
+        barcode_col = mapping.get("barcode")
+        barcode = str(row.get(barcode_col) or "").strip() if barcode_col else None
+
+        category_id = None
+        if mapping.get("category"):
+            category_name = str(row.get(mapping["category"]) or "").strip().lower()
+            category_id = categories.get(category_name)
+        brand_id = None
+        if mapping.get("brand"):
+            brand_name = str(row.get(mapping["brand"]) or "").strip().lower()
+            brand_id = brands.get(brand_name)
+        line_id = None
+        if mapping.get("line"):
+            line_name = str(row.get(mapping["line"]) or "").strip().lower()
+            line_id = lines.get((brand_id, line_name))
+        if category_id is None:
+            return None, "category not found"
+        if brand_id is None:
+            return None, "brand not found"
+
+        payload = {
+            "id": uuid.uuid4(),
+            "name": str(row.get(mapping.get("name")) or "").strip(),
+            "sku": sku or None,
+            "barcode": barcode or None,
+            "category_id": category_id,
+            "brand_id": brand_id,
+            "line_id": line_id,
+            "unit": str(row.get(mapping.get("unit", ""), "pcs") or "pcs"),
+            "cost_price": self._parse_decimal(row.get(mapping.get("cost_price", "")), decimal_separator, thousand_separator) or Decimal("0"),
+            "sell_price": self._parse_decimal(row.get(mapping.get("sell_price", "")), decimal_separator, thousand_separator) or Decimal("0"),
+            "tax_rate": self._parse_decimal(row.get(mapping.get("tax_rate", "")), decimal_separator, thousand_separator) or Decimal("0"),
+            "image_url": (str(row.get(mapping["image_url"])).strip() if mapping.get("image_url") and row.get(mapping["image_url"]) else None),
+            "description": str(row.get(mapping["description"]) or "").strip() if mapping.get("description") else "",
+            "is_active": True,
+            "is_hidden": False,
+        }
+        if payload["unit"] not in {unit.value for unit in ProductUnit}:
+            payload["unit"] = ProductUnit.pcs.value
+        return payload, None
+
+    async def _preview_inventory(self, job, mapping: dict[str, str], options: dict):
+        inventory = InventoryImportService(self.session)
+        context = await inventory.prepare(job, mapping, options)
+        sample_rows: list[dict] = []
+        sample_actions: list[dict] = []
         valid_count = 0
         invalid_count = 0
-
-        for idx, row in enumerate(job.source_rows, start=2):
-            row_errors: list[str] = []
-            name = str(row.get(mapping["name"], "")).strip()
-            if not name:
-                row_errors.append("name is required")
-
-            for numeric_field in ("cost_price", "sell_price", "tax_rate"):
-                source_column = mapping.get(numeric_field)
-                if not source_column:
-                    continue
-                raw = row.get(source_column)
-                if raw in (None, ""):
-                    continue
-                try:
-                    self._parse_decimal(raw, decimal_separator, thousand_separator)
-                except Exception:
-                    row_errors.append(f"invalid number in {numeric_field}: {raw}")
-
-            if row_errors:
-                invalid_count += 1
-                errors.append({"row": str(idx), "error": "; ".join(row_errors)})
-                sample_actions.append({"row": idx, "action": "error", "reason": "; ".join(row_errors)})
-            else:
-                valid_count += 1
-                sample_actions.append({"row": idx, "action": "create", "reason": None})
+        async for chunk in self.imports_repo.iter_row_chunks(job.id):
+            checked = await inventory.check_chunk(chunk, context)
+            updates: list[dict] = []
+            for row in chunk:
+                reason = checked[row.row_number]
+                if reason:
+                    invalid_count += 1
+                    updates.append({"row_number": row.row_number, "status": "invalid", "error": reason})
+                else:
+                    valid_count += 1
+                    updates.append({"row_number": row.row_number, "status": "valid", "error": None})
+                if len(sample_rows) < 50:
+                    sample_rows.append(row.data)
+                    sample_actions.append(
+                        {"row": row.row_number, "action": "error" if reason else "create", "reason": reason}
+                    )
+            await self.imports_repo.update_rows(job.id, updates)
 
         job.mapping = mapping
         job.options = options
-        job.rows_total = len(job.source_rows)
+        job.rows_total = valid_count + invalid_count
         job.rows_valid = valid_count
         job.rows_invalid = invalid_count
-        job.errors = errors
         await self.session.flush()
-
         return {
             "mapping": mapping,
             "options": options,
-            "rows": job.source_rows[:50],
+            "rows": sample_rows,
             "summary": {
                 "rows": job.rows_total,
                 "valid": valid_count,
@@ -244,87 +369,201 @@ class ImportService:
                 "would_update": 0,
                 "would_skip": 0,
             },
-            "sample_actions": sample_actions[:50],
+            "sample_actions": sample_actions,
         }
 
-    async def perform_import(self, import_id: uuid.UUID, mapping: dict[str, str], options: dict):
-        job = await self.imports_repo.get_import(import_id)
+    async def preview_import(self, job_id: uuid.UUID, mapping: dict[str, str], options: dict):
+        job = await self.imports_repo.get_import(job_id)
         if not job:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
 
-        await self.imports_repo.update_status(import_id, "running")
-        categories, brands, lines = await self._lookup_ids()
+        if job.kind != ImportKind.products:
+            return await self._preview_inventory(job, mapping, options)
 
+        if "name" not in mapping or not mapping["name"]:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Mapping for 'name' is required")
+
+        decimal_separator = str(options.get("decimal_separator", "."))
+        thousand_separator = str(options.get("thousand_separator", ","))
         match_by = options.get("match_by") or "sku"
-        counters = ImportCounters(total=len(job.source_rows)).model_dump()
-        errors: list[dict[str, str]] = []
+        lookups = await self._lookup_ids()
+        created_refs = {"categories": [], "brands": [], "lines": []}
+        if options.get("create_missing"):
+            lookups, created_refs = await self._resolve_missing(job.id, mapping, lookups, persist=False)
+        existing = await self._existing_products(job.id, match_by, mapping.get(match_by))
+
+        sample_rows: list[dict] = []
+        sample_actions: list[dict] = []
+        summary = {"create": 0, "update": 0, "unchanged": 0, "error": 0}
+
+        async for chunk in self.imports_repo.iter_row_chunks(job.id):
+            updates: list[dict] = []
+            for row in chunk:
+                payload, reason = self._build_payload(row.data, mapping, lookups, decimal_separator, thousand_separator)
+                changes = None
+                if payload is None:
+                    action_name = "error"
+                    updates.append({"row_number": row.row_number, "status": "invalid", "error": reason})
+                else:
+                    updates.append({"row_number": row.row_number, "status": "valid", "error": None})
+                    key = payload.get(match_by)
+                    current = existing.get(key) if key is not None else None
+                    if current is None:
+                        action_name = "create"
+                    else:
+                        changes = self._diff_product(current, payload)
+                        action_name = "update" if changes else "unchanged"
+                    if key is not None:
+                        existing[key] = {field: payload.get(field) for field in PRODUCT_IMPORT_FIELDS}
+                summary[action_name] += 1
+                if len(sample_rows) < 50:
+                    sample_rows.append(row.data)
+                    sample_actions.append(
+                        {"row": row.row_number, "action": action_name, "reason": reason, "changes": changes}
+                    )
+            await self.imports_repo.update_rows(job.id, updates)
+
+        valid_count = summary["create"] + summary["update"] + summary["unchanged"]
+        job.mapping = mapping
+        job.options = options
+        job.rows_total = valid_count + summary["error"]
+        job.rows_valid = valid_count
+        job.rows_invalid = summary["error"]
+        await self.session.flush()
+
+        return {
+            "mapping": mapping,
+            "options": options,
+            "rows": sample_rows,
+            "summary": {
+                "rows": job.rows_total,
+                "valid": valid_count,
+                "invalid": summary["error"],
+                "would_create": summary["create"],
+                "would_update": summary["update"],
+                "would_skip": 0,
+                "unchanged": summary["unchanged"],
+                "would_create_categories": created_refs["categories"],
+                "would_create_brands": created_refs["brands"],
+                "would_create_lines": created_refs["lines"],
+            },
+            "sample_actions": sample_actions,
+        }
 
-        for idx, row in enumerate(job.source_rows, start=2):
-            name_col = mapping.get("name")
-            name = str(row.get(name_col, "")).strip() if name_col else ""
-            if not name:
+    async def _upsert_products(self, payloads: list[dict], match_by: str) -> int:
+        conflict_column = Product.sku if match_by == "sku" else getattr(Product, match_by, Product.sku)
+        stmt = insert(Product).values(payloads)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[conflict_column],
+            set_={key: stmt.excluded[key] for key in payloads[0] if key not in {"id", conflict_column.key}},
+        ).returning(literal_column("xmax = 0"))
+        result = await self.session.execute(stmt)
+        return sum(1 for inserted in result.scalars() if inserted)
+
+    async def _products_context(self, import_id: uuid.UUID, mapping: dict[str, str], options: dict) -> dict:
+        lookups = await self._lookup_ids()
+        if options.get("create_missing"):
+            lookups, _ = await self._resolve_missing(import_id, mapping, lookups, persist=True)
+        return {
+            "mapping": mapping,
+            "lookups": lookups,
+            "match_by": options.get("match_by") or "sku",
+            "decimal_separator": options.get("decimal_separator", "."),
+            "thousand_separator": options.get("thousand_separator", ","),
+        }
+
+    async def _apply_products_chunk(self, chunk: list, context: dict, counters: dict[str, int]) -> list[dict]:
+        match_by = context["match_by"]
+        updates: list[dict] = []
+        payloads: dict[str, dict] = {}
+        applied: dict[str, int] = {}
+        for item in chunk:
+            payload, reason = self._build_payload(
+                item.data,
+                context["mapping"],
+                context["lookups"],
+                context["decimal_separator"],
+                context["thousand_separator"],
+            )
+            if payload is None:
                 counters["failed"] += 1
-                errors.append({"row": str(idx), "error": "name is required"})
+                updates.append({"row_number": item.row_number, "status": "failed", "error": reason})
                 continue
 
-            sku_col = mapping.get("sku")
-            sku = str(row.get(sku_col, "")).strip() if sku_col else None
-            barcode_col = mapping.get("barcode")
-            barcode = str(row.get(barcode_col, "")).strip() if barcode_col else None
-
-            category_id = None
-            if mapping.get("category"):
-                category_name = str(row.get(mapping["category"], "")).strip().lower()
-                category_id = categories.get(category_name)
-            brand_id = None
-            if mapping.get("brand"):
-                brand_name = str(row.get(mapping["brand"], "")).strip().lower()
-                brand_id = brands.get(brand_name)
-            line_id = None
-            if mapping.get("line"):
-                line_name = str(row.get(mapping["line"], "")).strip().lower()
-                line_id = lines.get(line_name)
-
-            payload = {
-                "id": uuid.uuid4(),
-                "name": name,
-                "sku": sku or None,
-                "barcode": barcode or None,
-                "category_id": category_id,
-                "brand_id": brand_id,
-                "line_id": line_id,
-                "unit": str(row.get(mapping.get("unit", ""), "pcs") or "pcs"),
-                "cost_price": self._parse_decimal(row.get(mapping.get("cost_price", "")), options.get("decimal_separator", "."), options.get("thousand_separator", ",")) or Decimal("0"),
-                "sell_price": self._parse_decimal(row.get(mapping.get("sell_price", "")), options.get("decimal_separator", "."), options.get("thousand_separator", ",")) or Decimal("0"),
-                "tax_rate": self._parse_decimal(row.get(mapping.get("tax_rate", "")), options.get("decimal_separator", "."), options.get("thousand_separator", ",")) or Decimal("0"),
-                "image_url": (str(row.get(mapping["image_url"])).strip() if mapping.get("image_url") and row.get(mapping["image_url"]) else None),
-                "description": str(row.get(mapping["description"], "")).strip() if mapping.get("description") else "",
-                "is_active": True,
-                "is_hidden": False,
-            }
-            if payload["unit"] not in {unit.value for unit in ProductUnit}:
-                payload["unit"] = ProductUnit.pcs.value
-
-            conflict_column = Product.sku if match_by == "sku" else getattr(Product, match_by, Product.sku)
-            conflict_values = payload.copy()
-            conflict_values.pop("id", None)
-            stmt = insert(Product).values(**payload).on_conflict_do_update(
-                index_elements=[conflict_column],
-                set_=conflict_values,
+            key = payload.get(match_by) or f"row:{item.row_number}"
+            if key in applied:
+                counters["skipped"] += 1
+                updates.append(
+                    {
+                        "row_number": applied[key],
+                        "status": "skipped",
+                        "error": f"superseded by row {item.row_number}",
+                    }
+                )
+            payloads[key] = payload
+            applied[key] = item.row_number
+
+        if payloads:
+            created = await self._upsert_products(list(payloads.values()), match_by)
+            counters["processed"] += len(payloads)
+            counters["created"] += created
+            counters["updated"] += len(payloads) - created
+            updates.extend(
+                {"row_number": row_number, "status": "applied", "error": None} for row_number in applied.values()
             )
-            await self.session.execute(stmt)
-            counters["processed"] += 1
-            counters["updated"] += 1
+        return updates
 
-        counters["created"] = max(counters["processed"] - counters["updated"], 0)
-        status_value = "failed" if counters["failed"] and counters["processed"] == 0 else "done"
-        await self.imports_repo.append_errors(import_id, errors)
+    async def perform_import(
+        self, import_id: uuid.UUID, mapping: dict[str, str], options: dict, schema: str | None = None
+    ):
+        job = await self.imports_repo.get_import(import_id)
+        if not job:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Import not found")
+
+        stored = dict(job.counters or {})
+        resume = job.status != "done" and any(stored.get(key) for key in ("processed", "skipped", "failed"))
+        job.mapping = mapping
+        job.options = options
+        await self.imports_repo.update_status(import_id, "running")
+        if schema is not None:
+            await self.session.commit()
+            await set_search_path(self.session, schema)
+        if job.kind == ImportKind.products:
+            context = await self._products_context(import_id, mapping, options)
+            apply_chunk = self._apply_products_chunk
+        else:
+            inventory = InventoryImportService(self.session)
+            context = await inventory.prepare(job, mapping, options)
+            apply_chunk = inventory.apply_chunk
+
+        counters = ImportCounters(total=await self.imports_repo.count_rows(import_id)).model_dump()
+        if resume:
+            counters.update({key: stored[key] for key in counters if key != "total" and key in stored})
+        statuses = ["pending", "valid", "invalid"] if resume else None
+
+        cancelled = False
+        async for chunk in self.imports_repo.iter_row_chunks(import_id, IMPORT_APPLY_CHUNK, statuses=statuses):
+            updates = await apply_chunk(chunk, context, counters)
+            await self.imports_repo.update_rows(import_id, updates)
+            cancelled = await self.imports_repo.save_progress(import_id, counters)
+            if schema is not None:
+                await self.session.commit()
+                await set_search_path(self.session, schema)
+            if cancelled:
+                break
+
+        if cancelled:
+            status_value = "cancelled"
+        elif counters["failed"] and counters["processed"] == 0:
+            status_value = "failed"
+        else:
+            status_value = "done"
         await self.imports_repo.finalize(
             import_id,
             status=status_value,
             counters=counters,
-            rows_total=len(job.source_rows),
+            rows_total=counters["total"],
             rows_valid=counters["processed"],
-            rows_invalid=len(errors),
+            rows_invalid=counters["failed"],
         )
         return counters
@@ -0,0 +1,229 @@
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+
+from fastapi import HTTPException, status
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.catalog import Product
+from app.models.purchasing import PurchaseInvoice, PurchaseItem, PurchaseStatus
+from app.models.stock import StockBatch, StockMove
+from app.models.store import Store
+from app.repos.store_repo import StoreRepo
+from app.schemas.imports import ImportKind
+
+INVENTORY_MATCH_FIELDS = {"sku", "barcode"}
+STOCK_IMPORT_MODES = {"set", "add"}
+OPENING_STOCK_REASON = "OPENING_STOCK"
+
+
+class InventoryImportService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def prepare(self, job, mapping: dict[str, str], options: dict) -> dict:
+        match_by = options.get("match_by") or "sku"
+        if match_by not in INVENTORY_MATCH_FIELDS:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="match_by must be sku or barcode")
+        if not mapping.get(match_by):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=f"Mapping for '{match_by}' is required"
+            )
+        if not mapping.get("quantity"):
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Mapping for 'quantity' is required")
+        context = {
+            "import_id": job.id,
+            "kind": job.kind,
+            "user_id": job.uploaded_by,
+            "mapping": mapping,
+            "match_by": match_by,
+            "decimal_separator": str(options.get("decimal_separator", ".")),
+            "thousand_separator": str(options.get("thousand_separator", ",")),
+        }
+        if job.kind == ImportKind.stock:
+            mode = options.get("stock_mode") or "set"
+            if mode not in STOCK_IMPORT_MODES:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="stock_mode must be set or add")
+            store_id = options.get("store_id")
+            if store_id:
+                store_id = await self.session.scalar(select(Store.id).where(Store.id == uuid.UUID(str(store_id))))
+                if store_id is None:
+                    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Store not found")
+            else:
+                store_id = (await StoreRepo(self.session).get_default()).id
+            context.update({"store_id": store_id, "stock_mode": mode})
+        elif job.kind == ImportKind.purchase_items:
+            if not mapping.get("unit_cost"):
+                raise HTTPException(
+                    status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Mapping for 'unit_cost' is required"
+                )
+            invoice_id = options.get("invoice_id")
+            if not invoice_id:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="invoice_id option is required")
+            invoice_status = await self.session.scalar(
+                select(PurchaseInvoice.status).where(PurchaseInvoice.id == uuid.UUID(str(invoice_id)))
+            )
+            if invoice_status is None:
+                raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
+            if invoice_status != PurchaseStatus.draft:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot edit invoice")
+            context["invoice_id"] = uuid.UUID(str(invoice_id))
+        else:
+            raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unsupported import kind")
+        return context
+
+    @staticmethod
+    def _decimal(value: object, decimal_separator: str, thousand_separator: str) -> Decimal | None:
+        text = str(value).strip() if value is not None else ""
+        if not text:
+            return None
+        cleaned = text.replace(thousand_separator, "") if thousand_separator else text
+        cleaned = cleaned.replace(decimal_separator, ".") if decimal_separator and decimal_separator != "." else cleaned
+        return Decimal(cleaned)
+
+    def _parse_row(self, row: dict, context: dict) -> tuple[str | None, Decimal | None, Decimal | None, str | None]:
+        mapping = context["mapping"]
+        key = str(row.get(mapping[context["match_by"]]) or "").strip()
+        if not key:
+            return None, None, None, f"{context['match_by']} is required"
+        try:
+            quantity = self._decimal(row.get(mapping["quantity"]), context["decimal_separator"], context["thousand_separator"])
+            unit_cost = self._decimal(
+                row.get(mapping.get("unit_cost", "")), context["decimal_separator"], context["thousand_separator"]
+            )
+        except InvalidOperation:
+            return key, None, None, "invalid number"
+        if quantity is None:
+            return key, None, None, "quantity is required"
+        if context["kind"] == ImportKind.purchase_items:
+            if quantity <= 0:
+                return key, None, None, "Quantity must be greater than zero"
+            if unit_cost is None:
+                return key, None, None, "unit_cost is required"
+        elif quantity < 0 and context["stock_mode"] == "set":
+            return key, None, None, "quantity cannot be negative"
+        if unit_cost is not None and unit_cost < 0:
+            return key, None, None, "Unit cost cannot be negative"
+        return key, quantity, unit_cost, None
+
+    async def _resolve_products(self, match_by: str, keys: set[str]) -> dict[str, tuple]:
+        if not keys:
+            return {}
+        key_column = getattr(Product, match_by)
+        result = await self.session.execute(
+            select(key_column, Product.id, Product.cost_price).where(key_column.in_(keys))
+        )
+        return {row[0]: (row[1], row[2]) for row in result.all()}
+
+    async def _parse_chunk(self, chunk: list, context: dict) -> tuple[dict[int, str | None], list[tuple]]:
+        parsed = [(item.row_number, *self._parse_row(item.data, context)) for item in chunk]
+        products = await self._resolve_products(
+            context["match_by"], {key for _, key, _, _, error in parsed if key and not error}
+        )
+        errors: dict[int, str | None] = {}
+        lines: list[tuple] = []
+        for row_number, key, quantity, unit_cost, error in parsed:
+            if not error and key not in products:
+                error = "product not found"
+            errors[row_number] = error
+            if not error:
+                product_id, cost_price = products[key]
+                lines.append((row_number, product_id, quantity, unit_cost if unit_cost is not None else cost_price))
+        return errors, lines
+
+    async def check_chunk(self, chunk: list, context: dict) -> dict[int, str | None]:
+        errors, _ = await self._parse_chunk(chunk, context)
+        return errors
+
+    async def _stock_baseline(self, context: dict, product_ids: list) -> dict:
+        imported = StockMove.ref_id == context["import_id"]
+        result = await self.session.execute(
+            select(
+                StockMove.product_id,
+                func.coalesce(func.sum(StockMove.delta_qty).filter(~imported | StockMove.ref_id.is_(None)), 0),
+                func.bool_or(imported),
+            )
+            .where(StockMove.store_id == context["store_id"], StockMove.product_id.in_(product_ids))
+            .group_by(StockMove.product_id)
+        )
+        return {product_id: Decimal(0) if seen else Decimal(on_hand) for product_id, on_hand, seen in result.all()}
+
+    async def _apply_stock(self, lines: list[tuple], context: dict) -> int:
+        totals: dict = {}
+        costs: dict = {}
+        for _, product_id, quantity, unit_cost in lines:
+            totals[product_id] = totals.get(product_id, Decimal(0)) + quantity
+            costs[product_id] = unit_cost
+        if context["stock_mode"] == "set":
+            baseline = await self._stock_baseline(context, list(totals))
+            totals = {product_id: total - baseline.get(product_id, Decimal(0)) for product_id, total in totals.items()}
+        now = datetime.now(timezone.utc)
+        moves = [
+            {
+                "id": uuid.uuid4(),
+                "product_id": product_id,
+                "quantity": delta,
+                "delta_qty": delta,
+                "reason": OPENING_STOCK_REASON,
+                "reference": f"import:{context['import_id']}",
+                "ref_id": context["import_id"],
+                "created_by_user_id": context["user_id"],
+                "created_at": now,
+                "store_id": context["store_id"],
+            }
+            for product_id, delta in totals.items()
+            if delta != 0
+        ]
+        if not moves:
+            return 0
+        await self.session.execute(insert(StockMove), moves)
+        batches = [
+            {
+                "id": uuid.uuid4(),
+                "product_id": move["product_id"],
+                "quantity": move["delta_qty"],
+                "unit_cost": costs[move["product_id"]] or Decimal(0),
+                "created_at": now,
+            }
+            for move in moves
+            if move["delta_qty"] > 0
+        ]
+        if batches:
+            await self.session.execute(insert(StockBatch), batches)
+        return len(moves)
+
+    async def _apply_purchase_items(self, lines: list[tuple], context: dict) -> int:
+        await self.session.execute(
+            insert(PurchaseItem),
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "invoice_id": context["invoice_id"],
+                    "product_id": product_id,
+                    "quantity": quantity,
+                    "unit_cost": unit_cost,
+                }
+                for _, product_id, quantity, unit_cost in lines
+            ],
+        )
+        return len(lines)
+
+    async def apply_chunk(self, chunk: list, context: dict, counters: dict[str, int]) -> list[dict]:
+        errors, lines = await self._parse_chunk(chunk, context)
+        updates = [
+            {"row_number": row_number, "status": "failed", "error": error}
+            for row_number, error in errors.items()
+            if error
+        ]
+        counters["failed"] += len(updates)
+        if not lines:
+            return updates
+        if context["kind"] == ImportKind.stock:
+            created = await self._apply_stock(lines, context)
+        else:
+            created = await self._apply_purchase_items(lines, context)
+        counters["processed"] += len(lines)
+        counters["created"] += created
+        updates.extend({"row_number": row_number, "status": "applied", "error": None} for row_number, *_ in lines)
+        return updates
@@ -29,6 +29,9 @@ LEGACY_PUBLIC_VERSION_TABLE = "alembic_version_public"
 LEGACY_TENANT_VERSION_TABLE = "alembic_version_tenant"
 
 
+_tenant_worker: dict = {}
+
+
 class TenantMigrationLockTimeoutError(RuntimeError):
     pass
 
@@ -198,14 +201,57 @@ def _tenant_script_directory() -> ScriptDirectory:
     return ScriptDirectory.from_config(config)
 
 
-def get_tenant_head_revision() -> str | None:
-    script = _tenant_script_directory()
+def get_tenant_head_revision(script: ScriptDirectory | None = None) -> str | None:
+    script = script or _tenant_script_directory()
     revisions = script.get_revisions("tenant@head")
     if not revisions:
         return None
     return revisions[0].revision
 
 
+def get_tenant_revisions(schemas: list[str], engine=None) -> dict[str, str | None]:
+    schemas = [normalize_tenant_slug(schema) for schema in schemas]
+    revisions: dict[str, str | None] = dict.fromkeys(schemas)
+    if not schemas:
+        return revisions
+    owns_engine = engine is None
+    engine = engine or create_engine(_sync_database_url())
+    try:
+        with engine.connect() as conn:
+            versioned = conn.execute(
+                text(
+                    """
+                    SELECT table_schema
+                    FROM information_schema.tables
+                    WHERE table_name = :table_name
+                      AND table_schema = ANY(:schemas)
+                    """
+                ),
+                {"table_name": DEFAULT_VERSION_TABLE, "schemas": schemas},
+            ).scalars().all()
+            if versioned:
+                params = {f"s{index}": schema for index, schema in enumerate(versioned)}
+                query = " UNION ALL ".join(
+                    f"(SELECT CAST(:s{index} AS text), version_num FROM {quote_ident(schema)}.{DEFAULT_VERSION_TABLE} LIMIT 1)"
+                    for index, schema in enumerate(versioned)
+                )
+                revisions.update(conn.execute(text(query), params).all())
+    finally:
+        if owns_engine:
+            engine.dispose()
+    return revisions
+
+
+def pending_tenant_schemas(schemas: list[str]) -> list[str]:
+    head_revision = get_tenant_head_revision()
+    revisions = get_tenant_revisions(schemas)
+    return [
+        schema
+        for schema in schemas
+        if head_revision is None or revisions.get(normalize_tenant_slug(schema)) != head_revision
+    ]
+
+
 def get_tenant_migration_status(schema: str) -> dict:
     schema = normalize_tenant_slug(schema)
     engine = create_engine(_sync_database_url())
@@ -366,6 +412,8 @@ def run_tenant_migrations(
     *,
     correlation_id: str | None = None,
     schema_created: bool | None = None,
+    engine=None,
+    script: ScriptDirectory | None = None,
 ) -> None:
     schema = normalize_tenant_slug(schema)
     settings = get_settings()
@@ -378,7 +426,9 @@ def run_tenant_migrations(
         version_table_schema=schema,
     )
     database_url = _sync_database_url()
-    engine = create_engine(database_url)
+    owns_engine = engine is None
+    if owns_engine:
+        engine = create_engine(database_url)
     lock_key = _advisory_lock_key(schema)
     lock_acquired = False
     migration_start = time.monotonic()
@@ -410,7 +460,7 @@ def run_tenant_migrations(
                     current_revision = connection.execute(
                         text(f"SELECT version_num FROM {safe_schema}.{version_table} LIMIT 1")
                     ).scalar()
-                head_revision = get_tenant_head_revision()
+                head_revision = get_tenant_head_revision(script)
                 _log_migration_start(
                     schema=schema,
                     branch="tenant",
@@ -452,9 +502,33 @@ def run_tenant_migrations(
                 if lock_acquired:
                     _release_advisory_lock(connection, lock_key, schema=schema, correlation_id=correlation_id)
     finally:
+        if owns_engine:
+            engine.dispose()
+
+
+def init_tenant_migration_worker() -> None:
+    _tenant_worker["engine"] = create_engine(_sync_database_url())
+    _tenant_worker["script"] = _tenant_script_directory()
+
+
+def close_tenant_migration_worker() -> None:
+    engine = _tenant_worker.pop("engine", None)
+    _tenant_worker.pop("script", None)
+    if engine is not None:
         engine.dispose()
 
 
+def migrate_tenant_in_worker(schema: str) -> tuple[str, float, str | None]:
+    if not _tenant_worker:
+        init_tenant_migration_worker()
+    start = time.monotonic()
+    try:
+        run_tenant_migrations(schema, engine=_tenant_worker["engine"], script=_tenant_worker["script"])
+    except Exception as exc:
+        return schema, time.monotonic() - start, str(exc)
+    return schema, time.monotonic() - start, None
+
+
 def _sync_database_url() -> str:
     settings = get_settings()
     return normalize_migration_database_url(settings.database_url)
@@ -0,0 +1,221 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from functools import lru_cache
+
+from fastapi import HTTPException, status
+from sqlalchemy import Date, Integer, cast, delete, func, literal, literal_column, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.business_date import business_today
+from app.core.config import get_settings
+from app.core.db import get_sessionmaker
+from app.core.db_utils import set_search_path
+from app.core.ttl_cache import TTLCache
+from app.models.analytics import SalesDailyRollup, SalesRollupDay
+from app.models.sales import Sale, SaleStatus
+from app.models.tenant import TenantStatus
+from app.schemas.platform import PlatformAnalyticsResponse, PlatformAnalyticsTenant
+from app.services.platform_service import PlatformService
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_SOURCES = {"live", "rollup"}
+
+
+@lru_cache
+def _analytics_cache() -> TTLCache:
+    return TTLCache(get_settings().platform_analytics_cache_ttl)
+
+
+async def _rebuild_rollups(session: AsyncSession, rollup_filter, sale_filter) -> int:
+    await session.execute(delete(SalesDailyRollup).where(*rollup_filter))
+    source = (
+        select(
+            Sale.store_id,
+            Sale.business_date,
+            func.count(Sale.id),
+            func.coalesce(func.sum(Sale.total_amount), 0),
+            func.now(),
+        )
+        .where(Sale.status == SaleStatus.completed, *sale_filter)
+        .group_by(Sale.store_id, Sale.business_date)
+    )
+    result = await session.execute(
+        insert(SalesDailyRollup).from_select(
+            ["store_id", "business_date", "sales_count", "gmv", "refreshed_at"], source
+        )
+    )
+    return result.rowcount or 0
+
+
+async def _mark_covered(session: AsyncSession, date_from: date, date_to: date) -> None:
+    if date_from > date_to:
+        return
+    days = func.generate_series(literal(date_from), literal(date_to), literal_column("interval '1 day'"))
+    await session.execute(
+        insert(SalesRollupDay)
+        .from_select(["business_date", "refreshed_at"], select(cast(days, Date), func.now()))
+        .on_conflict_do_update(index_elements=[SalesRollupDay.business_date], set_={"refreshed_at": func.now()})
+    )
+
+
+async def refresh_sales_rollups(session: AsyncSession, days: int = 2) -> int:
+    today = await business_today(session)
+    since = today - timedelta(days=days)
+    count = await _rebuild_rollups(
+        session, [SalesDailyRollup.business_date >= since], [Sale.business_date >= since]
+    )
+    await _mark_covered(session, since, today - timedelta(days=1))
+    return count
+
+
+async def rebuild_sales_rollups(session: AsyncSession) -> int:
+    count = await _rebuild_rollups(session, [], [])
+    first_day = await session.scalar(select(func.min(Sale.business_date)))
+    if first_day:
+        await _mark_covered(session, first_day, await business_today(session) - timedelta(days=1))
+    return count
+
+
+async def refresh_sales_rollup_day(session: AsyncSession, store_id, business_date: date) -> int:
+    return await _rebuild_rollups(
+        session,
+        [SalesDailyRollup.store_id == store_id, SalesDailyRollup.business_date == business_date],
+        [Sale.store_id == store_id, Sale.business_date == business_date],
+    )
+
+
+class PlatformAnalyticsService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+        self.settings = get_settings()
+
+    async def summary(
+        self,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        source: str = "live",
+        refresh: bool = False,
+    ) -> PlatformAnalyticsResponse:
+        if source not in ANALYTICS_SOURCES:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid source")
+        date_to = date_to or datetime.now(timezone.utc).date()
+        date_from = date_from or date_to - timedelta(days=29)
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="date_from must be less than or equal to date_to",
+            )
+        return await _analytics_cache().get_or_compute(
+            (date_from, date_to, source),
+            lambda: self._collect(date_from, date_to, source),
+            refresh=refresh,
+        )
+
+    async def _collect(self, date_from: date, date_to: date, source: str) -> PlatformAnalyticsResponse:
+        tenants = [
+            tenant
+            for tenant in await PlatformService(self.session).list_tenants()
+            if tenant.status == TenantStatus.active
+        ]
+        semaphore = asyncio.Semaphore(max(1, self.settings.platform_analytics_concurrency))
+        results = await asyncio.gather(
+            *(self._tenant_metrics(semaphore, tenant, date_from, date_to, source) for tenant in tenants)
+        )
+        return PlatformAnalyticsResponse(
+            date_from=date_from,
+            date_to=date_to,
+            source=source,
+            generated_at=datetime.now(timezone.utc),
+            tenants_total=len(results),
+            tenants_failed=sum(1 for item in results if item.error),
+            gmv=sum((item.gmv for item in results), start=Decimal("0")),
+            sales_count=sum(item.sales_count for item in results),
+            active_stores=sum(item.active_stores for item in results),
+            tenants=sorted(results, key=lambda item: item.gmv, reverse=True),
+        )
+
+    async def _tenant_metrics(self, semaphore, tenant, date_from: date, date_to: date, source: str):
+        item = PlatformAnalyticsTenant(
+            tenant_id=str(tenant.id), code=tenant.code, name=tenant.name, status=tenant.status.value
+        )
+        timeout = self.settings.platform_analytics_timeout
+        async with semaphore:
+            try:
+                gmv, sales_count, active_stores = await asyncio.wait_for(
+                    self._query_tenant(tenant.code, date_from, date_to, source, timeout), timeout
+                )
+            except asyncio.TimeoutError:
+                item.error = "timeout"
+                return item
+            except Exception as exc:
+                logger.warning("Platform analytics failed for schema=%s: %s", tenant.code, exc)
+                item.error = str(exc) or exc.__class__.__name__
+                return item
+        item.gmv = Decimal(gmv or 0)
+        item.sales_count = int(sales_count or 0)
+        item.active_stores = int(active_stores or 0)
+        return item
+
+    async def _query_tenant(self, schema: str, date_from: date, date_to: date, source: str, timeout: float):
+        async with get_sessionmaker()() as session:
+            await set_search_path(session, schema)
+            await session.execute(text(f"SET LOCAL statement_timeout = {int(timeout * 1000)}"))
+            if source == "rollup":
+                return await self._query_rollups(session, date_from, date_to)
+            return await self._query_live(session, date_from, date_to)
+
+    async def _query_live(self, session: AsyncSession, date_from: date, date_to: date):
+        result = await session.execute(
+            select(
+                func.coalesce(func.sum(Sale.total_amount), 0),
+                func.count(Sale.id),
+                func.count(func.distinct(Sale.store_id)),
+            ).where(
+                Sale.status == SaleStatus.completed,
+                Sale.business_date >= date_from,
+                Sale.business_date <= date_to,
+            )
+        )
+        return result.one()
+
+    async def _query_rollups(self, session: AsyncSession, date_from: date, date_to: date):
+        today = await business_today(session)
+        covered = select(SalesRollupDay.business_date).where(
+            SalesRollupDay.business_date >= date_from,
+            SalesRollupDay.business_date <= date_to,
+            SalesRollupDay.business_date < today,
+        )
+        rollups = (
+            select(
+                SalesDailyRollup.store_id.label("store_id"),
+                SalesDailyRollup.gmv.label("gmv"),
+                SalesDailyRollup.sales_count.label("sales_count"),
+            )
+            .where(SalesDailyRollup.business_date.in_(covered))
+        )
+        live = (
+            select(
+                Sale.store_id.label("store_id"),
+                Sale.total_amount.label("gmv"),
+                literal(1, Integer).label("sales_count"),
+            )
+            .where(
+                Sale.status == SaleStatus.completed,
+                Sale.business_date >= date_from,
+                Sale.business_date <= date_to,
+                Sale.business_date.not_in(covered),
+            )
+        )
+        combined = rollups.union_all(live).subquery()
+        result = await session.execute(
+            select(
+                func.coalesce(func.sum(combined.c.gmv), 0),
+                func.coalesce(func.sum(combined.c.sales_count), 0),
+                func.count(func.distinct(combined.c.store_id)),
+            )
+        )
+        return result.one()
@@ -0,0 +1,223 @@
+import asyncio
+import hashlib
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
+
+from sqlalchemy import column, exists, func, select, table, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import get_settings
+from app.models.catalog import Brand, Category, Product, ProductLine
+from app.models.platform import Module, TenantSettings
+from app.models.stock import StockMove
+from app.schemas.public_catalog import (
+    PublicCatalogFacets,
+    PublicCatalogFacetValue,
+    PublicCatalogProductOut,
+    PublicCatalogResponse,
+)
+
+PUBLIC_CATALOG_FACETS = {
+    "category_id": ("categories", "category"),
+    "brand_id": ("brands", "brand"),
+    "line_id": ("lines", "line"),
+    "variant_group": ("variant_groups", "variant_group"),
+}
+
+
+class PublicCatalogSnapshot:
+    def __init__(self, state: tuple, items: list[PublicCatalogProductOut]):
+        self.state = state
+        self.enabled = bool(state[0])
+        self.items = items
+        self.body = PublicCatalogResponse(items=items, total=len(items)).model_dump_json().encode()
+        self.etag = f'"{hashlib.sha256(self.body).hexdigest()[:32]}"'
+        self.last_modified = datetime.now(timezone.utc).replace(microsecond=0)
+        self.built_at = time.monotonic()
+        self.checked_at = self.built_at
+
+
+class PublicCatalogCache:
+    def __init__(self):
+        self._snapshots: dict[str, PublicCatalogSnapshot] = {}
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def fresh(self, schema: str) -> PublicCatalogSnapshot | None:
+        snapshot = self._snapshots.get(schema)
+        if snapshot and time.monotonic() - snapshot.checked_at < get_settings().public_catalog_refresh_interval:
+            return snapshot
+        return None
+
+    def lock(self, schema: str) -> asyncio.Lock:
+        return self._locks.setdefault(schema, asyncio.Lock())
+
+    def get(self, schema: str) -> PublicCatalogSnapshot | None:
+        return self._snapshots.get(schema)
+
+    def set(self, schema: str, snapshot: PublicCatalogSnapshot) -> None:
+        self._snapshots[schema] = snapshot
+
+
+@lru_cache
+def _snapshot_cache() -> PublicCatalogCache:
+    return PublicCatalogCache()
+
+
+def _matches(item: PublicCatalogProductOut, filters: dict, skip: str | None = None) -> bool:
+    for key in PUBLIC_CATALOG_FACETS:
+        if key != skip and filters.get(key) and getattr(item, key) != filters[key]:
+            return False
+    if skip != "in_stock" and filters.get("in_stock") is not None and (item.on_hand > 0) != filters["in_stock"]:
+        return False
+    return True
+
+
+def _facets(items: list[PublicCatalogProductOut], filters: dict) -> PublicCatalogFacets:
+    facets = PublicCatalogFacets()
+    for key, (field, label) in PUBLIC_CATALOG_FACETS.items():
+        counts: dict[str, PublicCatalogFacetValue] = {}
+        for item in items:
+            value = getattr(item, key)
+            if value is None or not _matches(item, filters, skip=key):
+                continue
+            entry = counts.get(value)
+            if entry is None:
+                entry = counts[value] = PublicCatalogFacetValue(id=value, name=getattr(item, label), count=0)
+            entry.count += 1
+        setattr(facets, field, sorted(counts.values(), key=lambda entry: (-entry.count, entry.name.lower())))
+    facets.in_stock = sum(1 for item in items if item.on_hand > 0 and _matches(item, filters, skip="in_stock"))
+    return facets
+
+
+def search_snapshot(
+    snapshot: PublicCatalogSnapshot,
+    filters: dict,
+    offset: int = 0,
+    limit: int | None = None,
+    with_facets: bool = False,
+) -> PublicCatalogResponse:
+    needle = (filters.get("q") or "").lower()
+    items = [item for item in snapshot.items if needle in item.name.lower()] if needle else snapshot.items
+    matched = [item for item in items if _matches(item, filters)]
+    return PublicCatalogResponse(
+        items=matched[offset : offset + limit] if limit else matched[offset:],
+        total=len(matched),
+        offset=offset,
+        limit=limit,
+        facets=_facets(items, filters) if with_facets else None,
+    )
+
+
+class PublicCatalogService:
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    def _enabled_expr(self, tenant):
+        tenant_modules = table("tenant_modules", column("module_id"), column("is_enabled"), schema=tenant.code)
+        module_enabled = exists().where(
+            Module.code == "public_catalog",
+            Module.is_active.is_(True),
+            tenant_modules.c.module_id == Module.id,
+            tenant_modules.c.is_enabled.is_(True),
+        )
+        settings_enabled = (
+            select(TenantSettings.settings["internet_catalog"]["is_enabled"].as_boolean())
+            .where(TenantSettings.tenant_id == tenant.id)
+            .scalar_subquery()
+        )
+        return module_enabled & func.coalesce(settings_enabled, False)
+
+    async def is_enabled(self, tenant) -> bool:
+        return bool(await self.session.scalar(select(self._enabled_expr(tenant))))
+
+    async def _state(self, tenant) -> tuple:
+        row = (
+            await self.session.execute(
+                select(
+                    self._enabled_expr(tenant).label("enabled"),
+                    text("(SELECT last_value FROM catalog_version_seq)"),
+                    text("(SELECT last_value FROM stock_moves_version_seq)"),
+                )
+            )
+        ).one()
+        return tuple(row)
+
+    async def _build_items(self) -> list[PublicCatalogProductOut]:
+        on_hand = (
+            select(StockMove.product_id, func.sum(StockMove.delta_qty).label("on_hand"))
+            .group_by(StockMove.product_id)
+            .subquery()
+        )
+        stmt = (
+            select(
+                Product.id,
+                Product.name,
+                Product.sku,
+                Product.image_url,
+                Product.unit,
+                Product.sell_price,
+                Product.variant_group,
+                Product.variant_name,
+                Product.category_id,
+                Product.brand_id,
+                Product.line_id,
+                Category.name.label("category"),
+                Brand.name.label("brand"),
+                ProductLine.name.label("line"),
+                func.coalesce(on_hand.c.on_hand, 0).label("on_hand"),
+            )
+            .join(Category, Category.id == Product.category_id)
+            .join(Brand, Brand.id == Product.brand_id)
+            .outerjoin(ProductLine, ProductLine.id == Product.line_id)
+            .outerjoin(on_hand, on_hand.c.product_id == Product.id)
+            .where(Product.is_active.is_(True), Product.is_hidden.is_(False))
+            .order_by(func.lower(Product.name), Product.id)
+        )
+        rows = (await self.session.execute(stmt)).all()
+        return [
+            PublicCatalogProductOut(
+                id=str(row.id),
+                name=row.name,
+                sku=row.sku,
+                image_url=row.image_url,
+                unit=row.unit.value if hasattr(row.unit, "value") else str(row.unit),
+                sell_price=row.sell_price,
+                category=row.category,
+                brand=row.brand,
+                line=row.line,
+                on_hand=float(row.on_hand or 0),
+                variant_group=row.variant_group,
+                variant_name=row.variant_name,
+                category_id=str(row.category_id),
+                brand_id=str(row.brand_id),
+                line_id=str(row.line_id) if row.line_id else None,
+            )
+            for row in rows
+        ]
+
+    async def snapshot(self, tenant) -> PublicCatalogSnapshot:
+        cache = _snapshot_cache()
+        snapshot = cache.fresh(tenant.code)
+        if snapshot is not None:
+            return snapshot
+        async with cache.lock(tenant.code):
+            snapshot = cache.fresh(tenant.code)
+            if snapshot is not None:
+                return snapshot
+            state = await self._state(tenant)
+            snapshot = cache.get(tenant.code)
+            now = time.monotonic()
+            if (
+                snapshot is not None
+                and snapshot.state == state
+                and now - snapshot.built_at < get_settings().public_catalog_max_age
+            ):
+                snapshot.checked_at = now
+                return snapshot
+            previous = snapshot
+            snapshot = PublicCatalogSnapshot(state, await self._build_items() if state[0] else [])
+            if previous is not None and previous.etag == snapshot.etag:
+                snapshot.last_modified = previous.last_modified
+            cache.set(tenant.code, snapshot)
+            return snapshot
@@ -1,3 +1,6 @@
+import uuid
+from datetime import datetime, timezone
+
 from fastapi import HTTPException, status
 from sqlalchemy import select
 
@@ -93,36 +96,60 @@ class PurchasingService:
         await self.invoice_repo.delete(invoice)
 
     async def post_invoice(self, invoice_id):
-        invoice = await self.get_invoice(invoice_id)
+        invoice = await self.invoice_repo.get(invoice_id, for_update=True)
+        if not invoice:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Invoice not found")
         if invoice.status != PurchaseStatus.draft:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot post invoice")
-        items = await self.item_repo.list_by_invoice(invoice.id)
+        items = invoice.items
         if not items:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Cannot post empty invoice")
         default_store_id = (await self.store_repo.get_default()).id
-        for item in items:
-            await self.stock_repo.record_move(
+        on_hand = await self.stock_repo.on_hand_many({item.product_id for item in items})
+        now = datetime.now(timezone.utc)
+        await self.stock_repo.record_moves(
+            [
                 {
+                    "id": uuid.uuid4(),
                     "product_id": item.product_id,
                     "quantity": item.quantity,
+                    "delta_qty": item.quantity,
                     "reason": "PURCHASE_IN",
                     "reference": str(invoice.id),
                     "store_id": default_store_id,
+                    "created_at": now,
                 }
-            )
-            await self.batch_repo.create(
+                for item in items
+            ]
+        )
+        await self.batch_repo.create_many(
+            [
                 {
+                    "id": uuid.uuid4(),
                     "product_id": item.product_id,
                     "quantity": item.quantity,
                     "unit_cost": item.unit_cost,
                     "purchase_item_id": item.id,
+                    "created_at": now,
                 }
+                for item in items
+            ]
+        )
+        costs: dict = {}
+        for item in items:
+            _, first_cost, quantity, total_cost = costs.get(item.product_id, (None, item.unit_cost, 0, 0))
+            costs[item.product_id] = (
+                item.unit_cost,
+                first_cost,
+                quantity + item.quantity,
+                total_cost + item.quantity * item.unit_cost,
             )
-            product = await self.product_repo.get(item.product_id)
-            if product:
-                product.purchase_price = item.unit_cost
-                if not product.cost_price or product.cost_price == 0:
-                    product.cost_price = item.unit_cost
+        await self.product_repo.apply_purchase_costs(
+            [
+                (product_id, last_cost, first_cost, on_hand.get(product_id, 0), quantity, total_cost)
+                for product_id, (last_cost, first_cost, quantity, total_cost) in costs.items()
+            ]
+        )
         invoice.status = PurchaseStatus.posted
         await self.session.flush()
         await self.session.refresh(invoice)
@@ -0,0 +1,51 @@
+import numpy as np
+
+DEFAULT_WINDOW_DAYS = 28
+DEFAULT_LEAD_TIME_DAYS = 7
+DEFAULT_REVIEW_DAYS = 7
+DEFAULT_SERVICE_LEVEL_Z = 1.65
+
+
+def build_daily_matrix(product_index: dict, rows, window_days: int) -> np.ndarray:
+    matrix = np.zeros((len(product_index), window_days), dtype=np.float64)
+    if not rows:
+        return matrix
+    product_ids, day_offsets, quantities = zip(*rows)
+    row_idx = np.fromiter((product_index.get(pid, -1) for pid in product_ids), dtype=np.int64)
+    col_idx = np.asarray(day_offsets, dtype=np.int64)
+    qty = np.asarray(quantities, dtype=np.float64)
+    mask = (row_idx >= 0) & (col_idx >= 0) & (col_idx < window_days)
+    np.add.at(matrix, (row_idx[mask], col_idx[mask]), qty[mask])
+    return matrix
+
+
+def compute_reorder(
+    daily: np.ndarray,
+    on_hand: np.ndarray,
+    lead_time_days: np.ndarray,
+    review_days: int = DEFAULT_REVIEW_DAYS,
+    service_level_z: float = DEFAULT_SERVICE_LEVEL_Z,
+) -> dict[str, np.ndarray]:
+    on_hand = np.asarray(on_hand, dtype=np.float64)
+    lead_time = np.asarray(lead_time_days, dtype=np.float64)
+    if daily.shape[1]:
+        velocity = daily.mean(axis=1)
+        deviation = daily.std(axis=1)
+    else:
+        velocity = np.zeros(daily.shape[0])
+        deviation = np.zeros(daily.shape[0])
+    safety_stock = service_level_z * deviation * np.sqrt(lead_time)
+    reorder_point = velocity * lead_time + safety_stock
+    target_level = velocity * (lead_time + review_days) + safety_stock
+    available = np.maximum(on_hand, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        days_of_cover = np.where(velocity > 0, available / velocity, np.inf)
+    needs_reorder = (velocity > 0) & (on_hand <= reorder_point)
+    suggested_qty = np.where(needs_reorder, np.ceil(np.maximum(target_level - on_hand, 0)), 0)
+    return {
+        "velocity": velocity,
+        "days_of_cover": days_of_cover,
+        "reorder_point": reorder_point,
+        "suggested_qty": suggested_qty,
+        "needs_reorder": needs_reorder,
+    }
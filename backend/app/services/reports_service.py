@@ -1,14 +1,21 @@
-from datetime import datetime
+from datetime import date, datetime, timedelta, timezone
 from decimal import Decimal
+from functools import lru_cache
 
-from sqlalchemy import select, func, case
+import numpy as np
+from fastapi import HTTPException, status
+from sqlalchemy import select, func, case, delete, insert
 from sqlalchemy.sql import Select
 
-from app.models.purchasing import PurchaseInvoice, PurchaseStatus, PurchaseItem
+from app.core.business_date import business_today
+from app.core.config import get_settings
+from app.core.ttl_cache import TTLCache
+from app.models.purchasing import PurchaseInvoice, PurchaseStatus, PurchaseItem, Supplier
 from app.models.sales import Sale, SaleStatus, SaleItem, SaleTaxLine, PaymentProvider, Payment, PaymentStatus
 from app.models.catalog import Product, Category, Brand
-from app.models.stock import SaleItemCostAllocation, StockBatch, StockMove
+from app.models.stock import StockMove
 from app.models.finance import Expense
+from app.models.reorder import ReorderSuggestion
 from app.schemas.reports import (
     SummaryReport,
     GroupReport,
@@ -19,8 +26,30 @@ from app.schemas.reports import (
     TopProductPerformanceReport,
     InventoryValuationReport,
     InventoryValuationItem,
+    ReorderReport,
+    ReorderSuggestionItem,
+    AbcXyzItem,
+    AbcXyzReport,
 )
 from app.repos.tenant_settings_repo import TenantSettingsRepo
+from app.services.abc_xyz_engine import (
+    DEFAULT_ABC_THRESHOLDS,
+    DEFAULT_XYZ_THRESHOLDS,
+    classify_abc_xyz,
+)
+from app.services.reorder_engine import (
+    DEFAULT_LEAD_TIME_DAYS,
+    DEFAULT_REVIEW_DAYS,
+    DEFAULT_SERVICE_LEVEL_Z,
+    DEFAULT_WINDOW_DAYS,
+    build_daily_matrix,
+    compute_reorder,
+)
+
+
+@lru_cache
+def _reports_cache() -> TTLCache:
+    return TTLCache(get_settings().reports_cache_ttl)
 
 
 class ReportsService:
@@ -35,9 +64,7 @@ class ReportsService:
             select(func.coalesce(func.sum(PurchaseItem.quantity * PurchaseItem.unit_cost), 0)).join(PurchaseInvoice).where(PurchaseInvoice.status == PurchaseStatus.posted)
         )
         cogs_sum = await self.session.execute(
-            select(func.coalesce(func.sum(SaleItemCostAllocation.quantity * StockBatch.unit_cost), 0))
-            .join(StockBatch, StockBatch.id == SaleItemCostAllocation.batch_id)
-            .join(SaleItem, SaleItem.id == SaleItemCostAllocation.sale_item_id)
+            select(func.coalesce(func.sum(SaleItem.line_total - SaleItem.profit_line), 0))
             .join(Sale, Sale.id == SaleItem.sale_id)
             .where(Sale.status == SaleStatus.completed)
         )
@@ -49,9 +76,7 @@ class ReportsService:
     async def pnl(self, date_from: datetime | None = None, date_to: datetime | None = None):
         sales_stmt = select(func.coalesce(func.sum(Sale.total_amount), 0)).where(Sale.status == SaleStatus.completed)
         cogs_stmt = (
-            select(func.coalesce(func.sum(SaleItemCostAllocation.quantity * StockBatch.unit_cost), 0))
-            .join(StockBatch, StockBatch.id == SaleItemCostAllocation.batch_id)
-            .join(SaleItem, SaleItem.id == SaleItemCostAllocation.sale_item_id)
+            select(func.coalesce(func.sum(SaleItem.line_total - SaleItem.profit_line), 0))
             .join(Sale, Sale.id == SaleItem.sale_id)
             .where(Sale.status == SaleStatus.completed)
         )
@@ -211,9 +236,7 @@ class ReportsService:
     async def finance_overview(self, date_from: datetime | None = None, date_to: datetime | None = None):
         revenue_stmt = select(func.coalesce(func.sum(Sale.total_amount), 0)).where(Sale.status == SaleStatus.completed)
         cogs_stmt = (
-            select(func.coalesce(func.sum(SaleItemCostAllocation.quantity * StockBatch.unit_cost), 0))
-            .join(StockBatch, StockBatch.id == SaleItemCostAllocation.batch_id)
-            .join(SaleItem, SaleItem.id == SaleItemCostAllocation.sale_item_id)
+            select(func.coalesce(func.sum(SaleItem.line_total - SaleItem.profit_line), 0))
             .join(Sale, Sale.id == SaleItem.sale_id)
             .where(Sale.status == SaleStatus.completed)
         )
@@ -347,3 +370,260 @@ class ReportsService:
                 )
             )
         return InventoryValuationReport(total_value=total_value, items=items)
+
+    async def reorder_suggestions(
+        self,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        default_lead_time_days: int = DEFAULT_LEAD_TIME_DAYS,
+        review_days: int = DEFAULT_REVIEW_DAYS,
+        service_level_z: float = DEFAULT_SERVICE_LEVEL_Z,
+        only_needed: bool = False,
+    ):
+        rows = await self._compute_reorder(window_days, default_lead_time_days, review_days, service_level_z)
+        items = [
+            ReorderSuggestionItem(**{**row, "product_id": str(row["product_id"])})
+            for row in rows
+            if row["needs_reorder"] or not only_needed
+        ]
+        return ReorderReport(window_days=window_days, computed_at=datetime.now(timezone.utc), items=items)
+
+    async def reorder_snapshot(self, only_needed: bool = False):
+        stmt = (
+            select(ReorderSuggestion, Product.sku, Product.name)
+            .join(Product, Product.id == ReorderSuggestion.product_id)
+            .order_by(ReorderSuggestion.suggested_qty.desc(), Product.name)
+        )
+        if only_needed:
+            stmt = stmt.where(ReorderSuggestion.needs_reorder.is_(True))
+        result = await self.session.execute(stmt)
+        items = []
+        window_days = DEFAULT_WINDOW_DAYS
+        computed_at = None
+        for suggestion, sku, name in result.all():
+            window_days = suggestion.window_days
+            computed_at = suggestion.computed_at
+            items.append(
+                ReorderSuggestionItem(
+                    product_id=str(suggestion.product_id),
+                    sku=sku,
+                    name=name,
+                    on_hand=suggestion.on_hand,
+                    avg_daily_qty=suggestion.avg_daily_qty,
+                    days_of_cover=suggestion.days_of_cover,
+                    lead_time_days=suggestion.lead_time_days,
+                    reorder_point=suggestion.reorder_point,
+                    suggested_qty=suggestion.suggested_qty,
+                    needs_reorder=suggestion.needs_reorder,
+                )
+            )
+        return ReorderReport(window_days=window_days, computed_at=computed_at, items=items)
+
+    async def refresh_reorder_snapshot(
+        self,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        default_lead_time_days: int = DEFAULT_LEAD_TIME_DAYS,
+        review_days: int = DEFAULT_REVIEW_DAYS,
+        service_level_z: float = DEFAULT_SERVICE_LEVEL_Z,
+    ) -> int:
+        rows = await self._compute_reorder(window_days, default_lead_time_days, review_days, service_level_z)
+        computed_at = datetime.now(timezone.utc)
+        await self.session.execute(delete(ReorderSuggestion))
+        if rows:
+            await self.session.execute(
+                insert(ReorderSuggestion),
+                [
+                    {
+                        "product_id": row["product_id"],
+                        "on_hand": row["on_hand"],
+                        "avg_daily_qty": row["avg_daily_qty"],
+                        "days_of_cover": row["days_of_cover"],
+                        "lead_time_days": row["lead_time_days"],
+                        "reorder_point": row["reorder_point"],
+                        "suggested_qty": row["suggested_qty"],
+                        "needs_reorder": row["needs_reorder"],
+                        "window_days": window_days,
+                        "computed_at": computed_at,
+                    }
+                    for row in rows
+                ],
+            )
+        return len(rows)
+
+    async def _compute_reorder(
+        self,
+        window_days: int,
+        default_lead_time_days: int,
+        review_days: int,
+        service_level_z: float,
+    ) -> list[dict]:
+        on_hand_subq = (
+            select(StockMove.product_id, func.coalesce(func.sum(StockMove.delta_qty), 0).label("on_hand"))
+            .group_by(StockMove.product_id)
+            .subquery()
+        )
+        lead_time_subq = (
+            select(PurchaseItem.product_id, Supplier.lead_time_days)
+            .join(PurchaseInvoice, PurchaseInvoice.id == PurchaseItem.invoice_id)
+            .join(Supplier, Supplier.id == PurchaseInvoice.supplier_id)
+            .where(PurchaseInvoice.status == PurchaseStatus.posted)
+            .distinct(PurchaseItem.product_id)
+            .order_by(PurchaseItem.product_id, PurchaseInvoice.created_at.desc())
+            .subquery()
+        )
+        products = (
+            await self.session.execute(
+                select(
+                    Product.id,
+                    Product.sku,
+                    Product.name,
+                    func.coalesce(on_hand_subq.c.on_hand, 0),
+                    func.coalesce(lead_time_subq.c.lead_time_days, default_lead_time_days),
+                )
+                .outerjoin(on_hand_subq, on_hand_subq.c.product_id == Product.id)
+                .outerjoin(lead_time_subq, lead_time_subq.c.product_id == Product.id)
+                .where(Product.is_active.is_(True))
+            )
+        ).all()
+        if not products:
+            return []
+
+        today = await business_today(self.session)
+        window_start = today - timedelta(days=window_days)
+        sales = await self.session.execute(
+            select(SaleItem.product_id, Sale.business_date - window_start, func.sum(SaleItem.qty))
+            .join(Sale, Sale.id == SaleItem.sale_id)
+            .where(
+                Sale.status == SaleStatus.completed,
+                Sale.business_date >= window_start,
+                Sale.business_date < today,
+            )
+            .group_by(SaleItem.product_id, Sale.business_date)
+        )
+
+        product_index = {row[0]: idx for idx, row in enumerate(products)}
+        daily = build_daily_matrix(product_index, sales.all(), window_days)
+        on_hand = np.fromiter((float(row[3]) for row in products), dtype=np.float64, count=len(products))
+        lead_time = np.fromiter((int(row[4]) for row in products), dtype=np.int64, count=len(products))
+        result = compute_reorder(daily, on_hand, lead_time, review_days, service_level_z)
+
+        rows = []
+        for idx, (product_id, sku, name, _, _) in enumerate(products):
+            days_of_cover = result["days_of_cover"][idx]
+            rows.append(
+                {
+                    "product_id": product_id,
+                    "sku": sku,
+                    "name": name,
+                    "on_hand": Decimal(str(round(on_hand[idx], 3))),
+                    "avg_daily_qty": Decimal(str(round(result["velocity"][idx], 3))),
+                    "days_of_cover": (
+                        Decimal(str(round(days_of_cover, 1))) if np.isfinite(days_of_cover) else None
+                    ),
+                    "lead_time_days": int(lead_time[idx]),
+                    "reorder_point": Decimal(str(round(result["reorder_point"][idx], 3))),
+                    "suggested_qty": Decimal(str(result["suggested_qty"][idx])),
+                    "needs_reorder": bool(result["needs_reorder"][idx]),
+                }
+            )
+        rows.sort(key=lambda row: (-row["suggested_qty"], row["name"]))
+        return rows
+
+    async def abc_xyz(
+        self,
+        tenant_id,
+        date_from: date | None = None,
+        date_to: date | None = None,
+        abc_thresholds: tuple[float, float] = DEFAULT_ABC_THRESHOLDS,
+        xyz_thresholds: tuple[float, float] = DEFAULT_XYZ_THRESHOLDS,
+        refresh: bool = False,
+    ):
+        if date_to is None:
+            date_to = await business_today(self.session) - timedelta(days=1)
+        if date_from is None:
+            date_from = date_to - timedelta(days=89)
+        if date_from > date_to:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="date_from must be less than or equal to date_to",
+            )
+        key = ("abc_xyz", str(tenant_id), date_from, date_to, abc_thresholds, xyz_thresholds)
+        return await _reports_cache().get_or_compute(
+            key,
+            lambda: self._compute_abc_xyz(date_from, date_to, abc_thresholds, xyz_thresholds),
+            refresh=refresh,
+        )
+
+    async def _compute_abc_xyz(
+        self,
+        date_from: date,
+        date_to: date,
+        abc_thresholds: tuple[float, float],
+        xyz_thresholds: tuple[float, float],
+    ):
+        daily = (
+            select(
+                SaleItem.product_id.label("product_id"),
+                func.sum(SaleItem.qty).label("qty"),
+                func.sum(SaleItem.line_total).label("revenue"),
+            )
+            .join(Sale, Sale.id == SaleItem.sale_id)
+            .where(
+                Sale.status == SaleStatus.completed,
+                Sale.business_date >= date_from,
+                Sale.business_date <= date_to,
+            )
+            .group_by(SaleItem.product_id, Sale.business_date)
+            .subquery()
+        )
+        result = await self.session.execute(
+            select(
+                Product.id,
+                Product.sku,
+                Product.name,
+                func.sum(daily.c.qty),
+                func.sum(daily.c.qty * daily.c.qty),
+                func.sum(daily.c.revenue),
+            )
+            .join(daily, daily.c.product_id == Product.id)
+            .group_by(Product.id, Product.sku, Product.name)
+        )
+        rows = result.all()
+        window_days = (date_to - date_from).days + 1
+        count = len(rows)
+        qty_total = np.fromiter((float(row[3] or 0) for row in rows), dtype=np.float64, count=count)
+        qty_squares = np.fromiter((float(row[4] or 0) for row in rows), dtype=np.float64, count=count)
+        revenue = np.fromiter((float(row[5] or 0) for row in rows), dtype=np.float64, count=count)
+        classes = classify_abc_xyz(
+            revenue, qty_total, qty_squares, window_days, abc_thresholds, xyz_thresholds
+        )
+
+        counts: dict[str, int] = {}
+        items = []
+        for idx in np.argsort(classes["rank"]):
+            product_id, sku, name, qty, _, revenue_value = rows[idx]
+            abc_class = str(classes["abc"][idx])
+            xyz_class = str(classes["xyz"][idx])
+            counts[abc_class + xyz_class] = counts.get(abc_class + xyz_class, 0) + 1
+            cv = classes["cv"][idx]
+            items.append(
+                AbcXyzItem(
+                    product_id=str(product_id),
+                    sku=sku,
+                    name=name,
+                    qty=qty or 0,
+                    revenue=revenue_value or 0,
+                    revenue_share=round(Decimal(str(classes["share"][idx])), 4),
+                    cumulative_share=round(Decimal(str(classes["cumulative_share"][idx])), 4),
+                    cv=round(Decimal(str(cv)), 3) if np.isfinite(cv) else None,
+                    abc_class=abc_class,
+                    xyz_class=xyz_class,
+                    rank=int(classes["rank"][idx]),
+                )
+            )
+        return AbcXyzReport(
+            date_from=date_from,
+            date_to=date_to,
+            generated_at=datetime.now(timezone.utc),
+            counts=counts,
+            items=items,
+        )
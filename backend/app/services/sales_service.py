@@ -2,6 +2,7 @@ from decimal import Decimal
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.business_date import business_today
 from app.core.config import get_settings
 from app.models.sales import PaymentProvider, PaymentStatus, SaleStatus, SaleTaxLine
 from app.models.stock import SaleItemCostAllocation
@@ -12,6 +13,9 @@ from app.repos.cash_repo import CashReceiptRepo, CashRegisterRepo
 from app.repos.payment_repo import PaymentRepo, RefundRepo
 from app.repos.tenant_settings_repo import TenantSettingsRepo
 from app.services.cash_register import get_cash_register
+from app.services.costing_engine import get_costing_strategy
+from app.services.finance_service import ensure_period_open
+from app.services.platform_analytics_service import refresh_sales_rollup_day
 from app.services.tax_service import calculate_sale_tax_lines
 from app.repos.store_repo import StoreRepo
 from app.repos.shifts_repo import CashierShiftRepo
@@ -46,12 +50,10 @@ class SalesService:
         self.tenant_settings_repo = tenant_settings_repo
         self.shift_repo = shift_repo
         self.store_repo = StoreRepo(session)
+        self.costing = get_costing_strategy()
 
     def _resolve_effective_cost(self, product):
-        purchase_price = Decimal(product.purchase_price or 0)
-        if purchase_price > 0:
-            return purchase_price
-        return Decimal(product.cost_price or 0)
+        return self.costing.unit_cost(product)
 
     async def create_sale(self, payload: dict, user_id=None, tenant_id: str | None = None):
         items = payload.get("items", [])
@@ -185,6 +187,8 @@ class SalesService:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Sale is not draft")
         if not sale.items:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Items required")
+        business_date = sale.business_date
+        await ensure_period_open(self.session, business_date)
         total_amount = Decimal("0")
         for item in sale.items:
             if not item.product_id:
@@ -201,9 +205,6 @@ class SalesService:
                 raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Insufficient stock")
             line_total = qty * unit_price
             total_amount += line_total
-            cost_snapshot = self._resolve_effective_cost(product)
-            item.cost_snapshot = cost_snapshot
-            item.profit_line = line_total - (cost_snapshot * qty)
             for allocation in item.allocations:
                 await self.session.delete(allocation)
             consumed, remaining = await self.batch_repo.consume_with_fallback(product.id, float(qty))
@@ -219,6 +220,9 @@ class SalesService:
                 )
                 fallback_batch.quantity = Decimal("0")
                 consumed.append((fallback_batch, remaining))
+            cost_snapshot = self.costing.sale_cost(product, qty, consumed)
+            item.cost_snapshot = cost_snapshot
+            item.profit_line = line_total - (cost_snapshot * qty)
             for batch, consumed_qty in consumed:
                 allocation = SaleItemCostAllocation(
                     sale_item_id=item.id,
@@ -249,8 +253,22 @@ class SalesService:
         sale.total_amount = total_amount
         sale.status = SaleStatus.completed
         await self.session.flush()
-        await self._create_sale_tax_lines(sale.id, total_amount, payments, tenant_id, sale.status)
-        await self._create_payments(sale.id, payments, sale.currency or await self._resolve_currency(tenant_id))
+        tax_total = await self._create_sale_tax_lines(sale.id, total_amount, payments, tenant_id, sale.status)
+        by_payment_type = await self._create_payments(
+            sale.id, payments, sale.currency or await self._resolve_currency(tenant_id)
+        )
+        applied = await self.shift_repo.apply_totals(
+            active_shift.id,
+            sales_count=1,
+            revenue=total_amount,
+            tax=tax_total,
+            profit=sum((Decimal(item.profit_line or 0) for item in sale.items), Decimal("0")),
+            by_payment_type=by_payment_type,
+        )
+        if not applied:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Shift already closed")
+        if business_date < await business_today(self.session):
+            await refresh_sales_rollup_day(self.session, sale.store_id, business_date)
         register = await self._resolve_cash_register(cash_register_id)
         await register.register_sale(sale.id)
         return await self.sale_repo.get(sale.id)
@@ -271,6 +289,23 @@ class SalesService:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Sale not found")
         if sale.status == SaleStatus.cancelled:
             raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail="Sale already cancelled")
+        was_completed = sale.status == SaleStatus.completed
+        business_date = sale.business_date
+        if was_completed:
+            await ensure_period_open(self.session, business_date)
+            by_payment_type: dict[str, Decimal] = {}
+            for payment in sale.payments:
+                method = payment.method.value
+                by_payment_type[method] = by_payment_type.get(method, Decimal("0")) - Decimal(payment.amount)
+            await self._apply_shift_adjustment(
+                sale,
+                user_id,
+                sales_count=-1,
+                revenue=-Decimal(sale.total_amount or 0),
+                tax=-(await self.sale_repo.tax_total(sale.id)),
+                profit=-sum((Decimal(item.profit_line or 0) for item in sale.items), Decimal("0")),
+                by_payment_type=by_payment_type,
+            )
         for item in sale.items:
             await self._restore_batches(item, item.qty)
             await self.stock_repo.record_move(
@@ -286,6 +321,8 @@ class SalesService:
             )
         sale.status = SaleStatus.cancelled
         await self.session.flush()
+        if was_completed:
+            await refresh_sales_rollup_day(self.session, sale.store_id, business_date)
         register = await self._resolve_cash_register()
         await register.refund_sale(sale.id)
         return await self.sale_repo.get(sale.id)
@@ -343,6 +380,7 @@ class SalesService:
             sale.id,
             {"amount": refund_amount, "reason": reason, "created_by_user_id": user_id},
         )
+        await self._apply_shift_adjustment(sale, user_id, to_active_shift=True, refunds=refund_amount)
         register = await self._resolve_cash_register()
         await register.refund_sale(sale.id)
         return await self.sale_repo.get(sale.id)
@@ -370,9 +408,19 @@ class SalesService:
                 products.append(product)
         return products
 
-    async def _create_payments(self, sale_id, payments, currency):
-        if not payments:
+    async def _apply_shift_adjustment(self, sale, user_id, to_active_shift: bool = False, **totals):
+        if sale.shift_id and await self.shift_repo.apply_totals(sale.shift_id, **totals):
+            return
+        if not to_active_shift or not user_id:
             return
+        active_shift = await self.shift_repo.get_active_for_cashier_store(user_id, sale.store_id)
+        if active_shift:
+            await self.shift_repo.apply_totals(active_shift.id, **totals)
+
+    async def _create_payments(self, sale_id, payments, currency) -> dict[str, Decimal]:
+        by_payment_type: dict[str, Decimal] = {}
+        if not payments:
+            return by_payment_type
         for payment in payments:
             amount = Decimal(payment["amount"])
             if amount <= 0:
@@ -390,17 +438,19 @@ class SalesService:
                     "reference": payment.get("reference", ""),
                 },
             )
+            by_payment_type[method.value] = by_payment_type.get(method.value, Decimal("0")) + amount
+        return by_payment_type
 
-    async def _create_sale_tax_lines(self, sale_id, subtotal, payments, tenant_id, status):
+    async def _create_sale_tax_lines(self, sale_id, subtotal, payments, tenant_id, status) -> Decimal:
         if status != SaleStatus.completed:
-            return
+            return Decimal("0")
         if not tenant_id:
-            return
+            return Decimal("0")
         settings_row = await self.tenant_settings_repo.get_or_create(tenant_id)
         tax_settings = (settings_row.settings or {}).get("taxes") if settings_row else None
         lines = calculate_sale_tax_lines(Decimal(subtotal), payments, tax_settings)
         if not lines:
-            return
+            return Decimal("0")
         for line in lines:
             self.session.add(
                 SaleTaxLine(
@@ -414,6 +464,7 @@ class SalesService:
                 )
             )
         await self.session.flush()
+        return sum((Decimal(line["tax_amount"]) for line in lines), Decimal("0"))
 
     async def _resolve_cash_register(self, cash_register_id=None):
         settings = get_settings()
@@ -1,12 +1,51 @@
 from datetime import datetime, timezone
+from decimal import Decimal
 
 from fastapi import HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.shifts import CashierShiftStatus
+from app.models.sales import PaymentProvider
+from app.models.shifts import CashierShift, CashierShiftStatus
 from app.repos.shifts_repo import CashierShiftRepo
 
 
+def shift_aggregates(shift: CashierShift) -> dict:
+    return {
+        "sales_count": int(shift.sales_count or 0),
+        "revenue_total": Decimal(shift.revenue_total or 0),
+        "tax_total": Decimal(shift.tax_total or 0),
+        "profit_gross_total": Decimal(shift.profit_gross_total or 0),
+        "refunds_total": Decimal(shift.refunds_total or 0),
+        "by_payment_type": {
+            PaymentProvider(method): Decimal(str(amount)) for method, amount in (shift.payment_totals or {}).items()
+        },
+    }
+
+
+def build_z_report(shift: CashierShift) -> dict:
+    aggregates = shift_aggregates(shift)
+    opening_cash = Decimal(shift.opening_cash or 0)
+    expected_cash = opening_cash + aggregates["by_payment_type"].get(PaymentProvider.cash, Decimal("0"))
+    closing_cash = Decimal(shift.closing_cash) if shift.closing_cash is not None else None
+    return {
+        "shift_id": str(shift.id),
+        "store_id": str(shift.store_id),
+        "cashier_id": str(shift.cashier_id),
+        "opened_at": shift.opened_at.isoformat() if shift.opened_at else None,
+        "closed_at": shift.closed_at.isoformat() if shift.closed_at else None,
+        "opening_cash": str(opening_cash),
+        "closing_cash": str(closing_cash) if closing_cash is not None else None,
+        "expected_cash": str(expected_cash),
+        "cash_difference": str(closing_cash - expected_cash) if closing_cash is not None else None,
+        "sales_count": aggregates["sales_count"],
+        "revenue_total": str(aggregates["revenue_total"]),
+        "tax_total": str(aggregates["tax_total"]),
+        "profit_gross_total": str(aggregates["profit_gross_total"]),
+        "refunds_total": str(aggregates["refunds_total"]),
+        "by_payment_type": {method.value: str(amount) for method, amount in aggregates["by_payment_type"].items()},
+    }
+
+
 class ShiftsService:
     def __init__(self, session: AsyncSession, shift_repo: CashierShiftRepo):
         self.session = session
@@ -31,7 +70,7 @@ class ShiftsService:
         return shift
 
     async def close_shift(self, shift_id, payload: dict, current_user):
-        shift = await self.shift_repo.get(shift_id)
+        shift = await self.shift_repo.get(shift_id, for_update=True)
         if not shift:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
         role_names = {role.name.lower() for role in current_user.roles}
@@ -45,6 +84,7 @@ class ShiftsService:
             shift.closing_cash = payload["closing_cash"]
         if payload.get("note") is not None:
             shift.note = payload["note"]
+        shift.z_report = build_z_report(shift)
         await self.session.flush()
         return shift
 
@@ -54,10 +94,14 @@ class ShiftsService:
     async def list_shifts(self, *, store_id=None, date_from=None, date_to=None, cashier_id=None, status=None):
         return await self.shift_repo.list(store_id, date_from, date_to, cashier_id, status)
 
-    async def get_shift(self, shift_id):
+    async def get_shift(self, shift_id, include_sales: bool = True):
         shift = await self.shift_repo.get(shift_id)
         if not shift:
             raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
-        sales = await self.shift_repo.list_sales(shift_id)
-        aggregates = await self.shift_repo.get_aggregates(shift_id)
-        return {"shift": shift, "sales": sales, "aggregates": aggregates}
+        sales = await self.shift_repo.list_sales(shift_id, None) if include_sales else []
+        return {"shift": shift, "sales": sales, "aggregates": shift_aggregates(shift)}
+
+    async def list_shift_sales(self, shift_id, limit: int = 50, offset: int = 0):
+        if not await self.shift_repo.get(shift_id):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Shift not found")
+        return await self.shift_repo.list_sales(shift_id, limit, offset)
@@ -5,6 +5,7 @@ from fastapi import HTTPException, status
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.business_date import normalize_timezone, set_business_timezone
 from app.models.platform import Module, TenantFeature, TenantModule, TenantUIPreference
 from app.models.sales import PaymentProvider
 from app.repos.tenant_settings_repo import TenantSettingsRepo
@@ -204,8 +205,16 @@ class TenantSettingsService:
         settings_row = await self.tenant_settings_repo.get_or_create(tenant_id)
         current_settings = settings_row.settings or {}
         normalized_patch = self._normalize_settings(patch)
+        timezone_name = None
+        if "timezone" in normalized_patch:
+            timezone_name = normalize_timezone(normalized_patch["timezone"])
+            if timezone_name is None:
+                raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Unknown timezone")
+            normalized_patch["timezone"] = timezone_name
         merged = self._deep_merge(current_settings, normalized_patch)
         normalized = self._normalize_settings(merged)
+        if timezone_name and timezone_name != current_settings.get("timezone"):
+            await set_business_timezone(self.session, timezone_name)
         settings_row.settings = normalized
         settings_row.updated_at = datetime.now(timezone.utc)
         await self.session.flush()
@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import logging
+import os
+import signal
+import socket
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.db import get_sessionmaker
+from app.core.db_utils import set_search_path
+from app.models.tenant import Tenant, TenantStatus
+from app.services.import_service import run_next_import
+
+logger = logging.getLogger(__name__)
+
+
+async def _active_tenants() -> list[str]:
+    async with get_sessionmaker()() as session:
+        result = await session.execute(select(Tenant.code).where(Tenant.status == TenantStatus.active))
+        return list(result.scalars().all())
+
+
+async def run_once(worker_id: str, stop: asyncio.Event | None = None) -> int:
+    processed = 0
+    for code in await _active_tenants():
+        if stop is not None and stop.is_set():
+            break
+        async with get_sessionmaker()() as session:
+            try:
+                await set_search_path(session, code)
+                if await run_next_import(session, code, worker_id):
+                    processed += 1
+            except Exception:
+                await session.rollback()
+                logger.exception("Import worker failed for schema=%s", code)
+    return processed
+
+
+async def run_worker(poll_interval: float, once: bool = False) -> None:
+    worker_id = f"{socket.gethostname()}:{os.getpid()}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    logger.info("Import worker %s started", worker_id)
+    while not stop.is_set():
+        processed = await run_once(worker_id, stop)
+        if once:
+            break
+        if processed:
+            continue
+        try:
+            await asyncio.wait_for(stop.wait(), poll_interval)
+        except asyncio.TimeoutError:
+            pass
+    logger.info("Import worker %s stopped", worker_id)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--once", action="store_true")
+    parser.add_argument("--poll-interval", type=float)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
+    poll_interval = args.poll_interval or get_settings().import_worker_poll_interval
+    asyncio.run(run_worker(poll_interval, args.once))
+
+
+if __name__ == "__main__":
+    main()
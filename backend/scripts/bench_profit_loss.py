@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+
+from sqlalchemy import func, select
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from app.core.db import get_sessionmaker  # noqa: E402
+from app.core.db_utils import set_search_path  # noqa: E402
+from app.models.finance import Expense, ExpenseAccrual  # noqa: E402
+from app.models.sales import Sale, SaleItem, SaleStatus, SaleTaxLine  # noqa: E402
+from app.repos.store_repo import StoreRepo  # noqa: E402
+from app.services.finance_service import profit_loss_statement  # noqa: E402
+
+
+async def _grouped(session, stmt) -> dict[date, Decimal]:
+    values: dict[date, Decimal] = defaultdict(lambda: Decimal("0"))
+    for day, amount in (await session.execute(stmt)).all():
+        values[day] = Decimal(amount or 0)
+    return values
+
+
+async def legacy_profit_loss(session, store_id, date_from: date, date_to: date) -> list[tuple]:
+    sales_filter = (
+        Sale.status == SaleStatus.completed,
+        Sale.store_id == store_id,
+        Sale.business_date >= date_from,
+        Sale.business_date <= date_to,
+    )
+    revenue = await _grouped(
+        session,
+        select(Sale.business_date, func.sum(Sale.total_amount)).where(*sales_filter).group_by(Sale.business_date),
+    )
+    cogs = await _grouped(
+        session,
+        select(Sale.business_date, func.sum(SaleItem.line_total - SaleItem.profit_line))
+        .join(SaleItem, SaleItem.sale_id == Sale.id)
+        .where(*sales_filter)
+        .group_by(Sale.business_date),
+    )
+    taxes = await _grouped(
+        session,
+        select(Sale.business_date, func.sum(SaleTaxLine.tax_amount))
+        .join(SaleTaxLine, SaleTaxLine.sale_id == Sale.id)
+        .where(*sales_filter)
+        .group_by(Sale.business_date),
+    )
+    one_time = await _grouped(
+        session,
+        select(Expense.business_date, func.sum(Expense.amount))
+        .where(Expense.store_id == store_id, Expense.business_date >= date_from, Expense.business_date <= date_to)
+        .group_by(Expense.business_date),
+    )
+    fixed = await _grouped(
+        session,
+        select(ExpenseAccrual.date, func.sum(ExpenseAccrual.amount))
+        .where(
+            ExpenseAccrual.store_id == store_id,
+            ExpenseAccrual.date >= date_from,
+            ExpenseAccrual.date <= date_to,
+        )
+        .group_by(ExpenseAccrual.date),
+    )
+    rows = []
+    current = date_from
+    while current <= date_to:
+        rows.append((current, revenue[current], cogs[current], taxes[current], one_time[current], fixed[current]))
+        current += timedelta(days=1)
+    return rows
+
+
+async def single_statement_profit_loss(session, store_id, date_from: date, date_to: date) -> list[tuple]:
+    result = await session.execute(profit_loss_statement([store_id], date_from, date_to))
+    return [
+        (row.day, row.revenue, row.cogs, row.taxes, row.one_time_expenses, row.fixed_costs) for row in result.all()
+    ]
+
+
+async def _measure(session, fn, store_id, date_from, date_to, repeat: int) -> tuple[list[float], list[tuple]]:
+    timings = []
+    rows: list[tuple] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        rows = await fn(session, store_id, date_from, date_to)
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, rows
+
+
+async def run(schema: str, store_id: str | None, days: int, repeat: int) -> int:
+    async with get_sessionmaker()() as session:
+        await set_search_path(session, schema)
+        store_id = store_id or (await StoreRepo(session).get_default()).id
+        date_to = date.today()
+        date_from = date_to - timedelta(days=days - 1)
+        legacy_timings, legacy_rows = await _measure(
+            session, legacy_profit_loss, store_id, date_from, date_to, repeat
+        )
+        single_timings, single_rows = await _measure(
+            session, single_statement_profit_loss, store_id, date_from, date_to, repeat
+        )
+        await session.rollback()
+    for label, timings in (("five queries", legacy_timings), ("single statement", single_timings)):
+        print(
+            f"{label:>16}: median {statistics.median(timings):8.2f} ms, "
+            f"min {min(timings):8.2f} ms, max {max(timings):8.2f} ms"
+        )
+    normalized_legacy = [tuple(Decimal(value) if i else value for i, value in enumerate(row)) for row in legacy_rows]
+    normalized_single = [tuple(Decimal(value) if i else value for i, value in enumerate(row)) for row in single_rows]
+    if normalized_legacy != normalized_single:
+        print("Results differ between implementations.")
+        return 1
+    print(f"Results match for {len(single_rows)} days.")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare profit and loss query strategies.")
+    parser.add_argument("--schema", required=True)
+    parser.add_argument("--store-id")
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    return asyncio.run(run(args.schema, args.store_id, args.days, args.repeat))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
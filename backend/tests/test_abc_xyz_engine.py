@@ -0,0 +1,26 @@
+import numpy as np
+
+from app.services.abc_xyz_engine import classify_abc_xyz
+
+
+def test_abc_classes_follow_cumulative_revenue_share() -> None:
+    revenue = np.array([10.0, 700.0, 50.0, 240.0])
+    qty = np.array([1.0, 70.0, 5.0, 24.0])
+    result = classify_abc_xyz(revenue, qty, qty * qty, window_days=10)
+    assert result["rank"].tolist() == [4, 1, 3, 2]
+    assert result["abc"].tolist() == ["C", "A", "B", "A"]
+    assert result["cumulative_share"][1] == 0.7
+
+
+def test_xyz_classes_use_daily_coefficient_of_variation() -> None:
+    steady_qty, steady_squares = 10.0, 10.0
+    spiky_qty, spiky_squares = 10.0, 100.0
+    result = classify_abc_xyz(
+        np.array([100.0, 100.0, 0.0]),
+        np.array([steady_qty, spiky_qty, 0.0]),
+        np.array([steady_squares, spiky_squares, 0.0]),
+        window_days=10,
+    )
+    assert result["xyz"].tolist() == ["X", "Z", "Z"]
+    assert result["cv"][0] == 0.0
+    assert np.isinf(result["cv"][2])
@@ -0,0 +1,95 @@
+import asyncio
+import contextlib
+import uuid
+from types import SimpleNamespace
+
+from sqlalchemy.exc import IntegrityError
+
+from app.services.catalog_service import CatalogService
+
+
+class _AsyncpgUniqueViolation(Exception):
+    def __init__(self, constraint_name: str):
+        super().__init__(constraint_name)
+        self.constraint_name = constraint_name
+
+
+class _UniqueViolation(Exception):
+    sqlstate = "23505"
+
+    def __init__(self, constraint_name: str = "ix_products_sku"):
+        super().__init__(constraint_name)
+        self.__cause__ = _AsyncpgUniqueViolation(constraint_name)
+
+
+class _FakeSession:
+    @contextlib.asynccontextmanager
+    async def begin_nested(self):
+        yield
+
+
+class _FakeProductRepo:
+    def __init__(self, existing: set, taken_skus: set, owners: dict | None = None):
+        self.existing = existing
+        self.taken_skus = taken_skus
+        self.owners = owners or {}
+        self.updated = []
+
+    async def sku_owners(self, skus):
+        return {sku: self.owners[sku] for sku in skus if sku in self.owners}
+
+    async def update_many(self, rows, fields, key="id"):
+        if any(row.get("sku") in self.taken_skus for row in rows):
+            raise IntegrityError("UPDATE products", {}, _UniqueViolation())
+        self.updated.extend(rows)
+        return [(row[key], row[key]) for row in rows if row[key] in self.existing]
+
+
+def test_apply_groups_reports_failing_rows_only() -> None:
+    ok_id, bad_id, missing_id = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+    repo = _FakeProductRepo({ok_id, bad_id}, {"TAKEN"})
+    session = _FakeSession()
+    service = CatalogService(SimpleNamespace(session=session), None, None, repo, None)
+    rows = [
+        {"index": 0, "id": ok_id, "sku": "FREE"},
+        {"index": 1, "id": bad_id, "sku": "TAKEN"},
+        {"index": 2, "id": missing_id, "sku": "OTHER"},
+    ]
+    results = [{"index": row["index"], "id": row["id"], "status": "failed", "error": None} for row in rows]
+
+    asyncio.run(service._apply_groups({("id", ("sku",)): rows}, results))
+
+    assert [(result["status"], result["error"]) for result in results] == [
+        ("updated", None),
+        ("failed", "Sku already exists"),
+        ("failed", "Product not found"),
+    ]
+
+
+def test_unique_violation_reports_constraint() -> None:
+    error = IntegrityError("UPDATE products", {}, _UniqueViolation("ix_products_barcode"))
+    assert CatalogService._integrity_error(error) == "Duplicate value: ix_products_barcode"
+    sku_error = IntegrityError("UPDATE products", {}, _UniqueViolation())
+    assert CatalogService._integrity_error(sku_error) == "Sku already exists"
+
+
+def test_update_prices_dedupes_on_resolved_product() -> None:
+    product_id = uuid.uuid4()
+    repo = _FakeProductRepo({product_id}, set(), {"SKU-1": product_id})
+    service = CatalogService(SimpleNamespace(session=_FakeSession()), None, None, repo, None)
+    response = asyncio.run(
+        service.update_prices(
+            [
+                {"id": product_id, "sell_price": 10},
+                {"sku": "SKU-1", "sell_price": 12},
+                {"sku": "MISSING", "sell_price": 5},
+            ]
+        )
+    )
+
+    assert [(result["status"], result["error"]) for result in response["results"]] == [
+        ("updated", None),
+        ("failed", "Duplicate product in request"),
+        ("failed", "Product not found"),
+    ]
+    assert [row["sell_price"] for row in repo.updated] == [10]
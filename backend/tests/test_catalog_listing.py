@@ -0,0 +1,47 @@
+import os
+import uuid
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.api.catalog import _etag_matches
+from app.services.catalog_service import catalog_etag, decode_cursor, encode_cursor
+
+
+def test_cursor_round_trips_unicode_sort_keys() -> None:
+    product_id = uuid.uuid4()
+    cursor = encode_cursor("чай зелёный", product_id)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == ("чай зелёный", product_id)
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor("tea", "not-a-uuid"), "WyJvbmx5Il0"])
+def test_decode_cursor_rejects_garbage(cursor: str) -> None:
+    with pytest.raises(HTTPException) as exc:
+        decode_cursor(cursor)
+    assert exc.value.status_code == 400
+
+
+def test_catalog_etag_changes_with_version_and_scope() -> None:
+    etag = catalog_etag(7, "tenant?limit=50")
+    assert etag.startswith('"7-') and etag.endswith('"')
+    assert etag == catalog_etag(7, "tenant?limit=50")
+    assert etag != catalog_etag(8, "tenant?limit=50")
+    assert etag != catalog_etag(7, "tenant?limit=100")
+
+
+def _request(if_none_match: str | None) -> Request:
+    headers = [(b"if-none-match", if_none_match.encode())] if if_none_match is not None else []
+    return Request({"type": "http", "method": "GET", "headers": headers})
+
+
+def test_etag_matches_if_none_match_lists() -> None:
+    etag = catalog_etag(3, "scope")
+    assert _etag_matches(_request(f'"other", W/{etag}'), etag)
+    assert _etag_matches(_request("*"), etag)
+    assert not _etag_matches(_request('"other"'), etag)
+    assert not _etag_matches(_request(None), etag)
@@ -0,0 +1,32 @@
+from decimal import Decimal
+from types import SimpleNamespace
+
+from app.services.costing_engine import get_costing_strategy
+
+
+def _product(**prices) -> SimpleNamespace:
+    values = {"purchase_price": Decimal("0"), "cost_price": Decimal("0"), "avg_cost": Decimal("0")}
+    values.update(prices)
+    return SimpleNamespace(**values)
+
+
+def test_last_purchase_falls_back_to_cost_price() -> None:
+    strategy = get_costing_strategy("LAST_PURCHASE")
+    assert strategy.sale_cost(_product(purchase_price=Decimal("6")), Decimal("2"), []) == Decimal("6")
+    assert strategy.sale_cost(_product(cost_price=Decimal("4")), Decimal("2"), []) == Decimal("4")
+
+
+def test_weighted_average_reads_precomputed_cost() -> None:
+    strategy = get_costing_strategy("WEIGHTED_AVERAGE")
+    product = _product(purchase_price=Decimal("6"), avg_cost=Decimal("5.5"))
+    assert strategy.sale_cost(product, Decimal("3"), []) == Decimal("5.5")
+    assert strategy.unit_cost(_product(purchase_price=Decimal("6"))) == Decimal("6")
+
+
+def test_fifo_costs_consumed_layers() -> None:
+    strategy = get_costing_strategy("FIFO")
+    consumed = [
+        (SimpleNamespace(unit_cost=Decimal("4.00")), 2.0),
+        (SimpleNamespace(unit_cost=Decimal("7.00")), 1.0),
+    ]
+    assert strategy.sale_cost(_product(purchase_price=Decimal("7")), Decimal("3"), consumed) == Decimal("5")
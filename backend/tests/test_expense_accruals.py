@@ -0,0 +1,38 @@
+import asyncio
+import os
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+from sqlalchemy.dialects import postgresql
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.repos.finance_repo import ExpenseAccrualRepo
+
+
+class _Session:
+    def __init__(self) -> None:
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=2)
+
+
+def test_delete_stale_drops_accruals_booked_to_another_store() -> None:
+    session = _Session()
+    store_id = uuid.uuid4()
+    recurring = SimpleNamespace(
+        id=uuid.uuid4(), store_id=store_id, start_date=date(2026, 1, 1), end_date=None
+    )
+
+    assert asyncio.run(ExpenseAccrualRepo(session).delete_stale(recurring, date(2026, 3, 15))) == 2
+
+    sql = str(
+        session.statements[0].compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    )
+    assert f"expense_accruals.store_id IS DISTINCT FROM '{store_id}'" in sql
+    assert "expense_accruals.date > '2026-03-15'" in sql
+    assert "accounting_periods.is_closed IS true" in sql
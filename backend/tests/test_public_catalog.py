@@ -0,0 +1,118 @@
+import os
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from starlette.requests import Request
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.api.public_catalog import _not_modified
+from app.schemas.public_catalog import PublicCatalogProductOut
+from app.services.public_catalog_service import (
+    PublicCatalogService,
+    PublicCatalogSnapshot,
+    _facets,
+    _matches,
+    search_snapshot,
+)
+
+
+def _compiled(expr) -> str:
+    return str(select(expr).compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def test_module_check_is_scoped_to_tenant() -> None:
+    service = PublicCatalogService(None)
+    tenant_a = SimpleNamespace(id=uuid.uuid4(), code="tenant_a")
+    tenant_b = SimpleNamespace(id=uuid.uuid4(), code="tenant_b")
+
+    sql_a = _compiled(service._enabled_expr(tenant_a))
+    sql_b = _compiled(service._enabled_expr(tenant_b))
+
+    assert "tenant_a.tenant_modules" in sql_a and "tenant_b" not in sql_a
+    assert "tenant_b.tenant_modules" in sql_b and "tenant_a" not in sql_b
+    assert str(tenant_b.id) in sql_b and str(tenant_a.id) not in sql_b
+
+
+def _item(name: str, category: str, brand: str, on_hand: float, line: str | None = None) -> PublicCatalogProductOut:
+    return PublicCatalogProductOut(
+        id=name,
+        name=name,
+        unit="pcs",
+        sell_price=Decimal("10"),
+        category=category,
+        category_id=f"c-{category}",
+        brand=brand,
+        brand_id=f"b-{brand}",
+        line=line,
+        line_id=f"l-{line}" if line else None,
+        on_hand=on_hand,
+    )
+
+
+def _snapshot() -> PublicCatalogSnapshot:
+    return PublicCatalogSnapshot(
+        (True, 1, 1),
+        [
+            _item("Black Tea", "tea", "acme", 5, "classic"),
+            _item("Green Tea", "tea", "zen", 0),
+            _item("Coffee Beans", "coffee", "acme", 2, "classic"),
+        ],
+    )
+
+
+def test_matches_skips_the_facet_being_counted() -> None:
+    item = _item("Green Tea", "tea", "zen", 0)
+    filters = {"brand_id": "b-acme", "in_stock": True}
+    assert not _matches(item, filters)
+    assert not _matches(item, filters, skip="brand_id")
+    assert _matches(item, {"brand_id": "b-acme"}, skip="brand_id")
+    assert _matches(item, {"in_stock": True}, skip="in_stock")
+
+
+def test_facets_count_other_filters_only() -> None:
+    facets = _facets(_snapshot().items, {"brand_id": "b-acme"})
+    assert [(entry.id, entry.count) for entry in facets.brands] == [("b-acme", 2), ("b-zen", 1)]
+    assert [(entry.id, entry.count) for entry in facets.categories] == [("c-coffee", 1), ("c-tea", 1)]
+    assert [(entry.name, entry.count) for entry in facets.lines] == [("classic", 2)]
+    assert facets.in_stock == 2
+
+
+def test_search_snapshot_filters_pages_and_counts() -> None:
+    response = search_snapshot(_snapshot(), {"q": "tea", "in_stock": True}, with_facets=True)
+    assert [item.name for item in response.items] == ["Black Tea"]
+    assert response.total == 1
+    assert response.facets.in_stock == 1
+    assert [(entry.id, entry.count) for entry in response.facets.brands] == [("b-acme", 1)]
+
+    page = search_snapshot(_snapshot(), {}, offset=1, limit=1)
+    assert [item.name for item in page.items] == ["Green Tea"]
+    assert page.total == 3 and page.facets is None
+
+
+def _request(**headers) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "GET",
+            "headers": [(key.replace("_", "-").encode(), value.encode()) for key, value in headers.items()],
+        }
+    )
+
+
+def test_not_modified_prefers_etag_over_date() -> None:
+    modified = datetime(2026, 3, 1, 12, tzinfo=timezone.utc)
+    assert _not_modified(_request(if_none_match='W/"abc", "def"'), '"abc"', modified)
+    assert _not_modified(_request(if_none_match="*"), '"abc"', modified)
+    assert not _not_modified(
+        _request(if_none_match='"other"', if_modified_since="Sun, 01 Mar 2026 13:00:00 GMT"), '"abc"', modified
+    )
+    assert _not_modified(_request(if_modified_since="Sun, 01 Mar 2026 12:00:00 GMT"), '"abc"', modified)
+    assert not _not_modified(_request(if_modified_since="Sun, 01 Mar 2026 11:59:59 GMT"), '"abc"', modified)
+    assert not _not_modified(_request(if_modified_since="not a date"), '"abc"', modified)
+    assert not _not_modified(_request(), '"abc"', modified)
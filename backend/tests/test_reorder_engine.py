@@ -0,0 +1,31 @@
+import uuid
+
+import numpy as np
+
+from app.services.reorder_engine import build_daily_matrix, compute_reorder
+
+
+def test_daily_matrix_accumulates_rows_per_product_and_day() -> None:
+    first, second = uuid.uuid4(), uuid.uuid4()
+    index = {first: 0, second: 1}
+    rows = [(first, 0, 2), (first, 0, 1), (second, 3, 5), (uuid.uuid4(), 1, 9), (first, 7, 4)]
+    matrix = build_daily_matrix(index, rows, 4)
+    assert matrix.shape == (2, 4)
+    assert matrix[0].tolist() == [3.0, 0.0, 0.0, 0.0]
+    assert matrix[1].tolist() == [0.0, 0.0, 0.0, 5.0]
+
+
+def test_reorder_suggests_quantity_up_to_target_level() -> None:
+    daily = np.array([[2.0] * 10, [0.0] * 10, [1.0] * 10])
+    result = compute_reorder(
+        daily,
+        on_hand=np.array([5.0, 3.0, 100.0]),
+        lead_time_days=np.array([7, 7, 7]),
+        review_days=7,
+        service_level_z=1.65,
+    )
+    assert result["velocity"].tolist() == [2.0, 0.0, 1.0]
+    assert result["needs_reorder"].tolist() == [True, False, False]
+    assert result["suggested_qty"].tolist() == [23.0, 0.0, 0.0]
+    assert result["days_of_cover"][0] == 2.5
+    assert np.isinf(result["days_of_cover"][1])
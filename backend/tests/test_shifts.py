@@ -0,0 +1,123 @@
+import asyncio
+import os
+import uuid
+from datetime import datetime, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app.models.shifts import CashierShiftStatus
+from app.repos.shifts_repo import CashierShiftRepo
+from app.services.sales_service import SalesService
+from app.services.shifts_service import ShiftsService
+
+
+class _CapturingSession:
+    def __init__(self, rowcount: int):
+        self.rowcount = rowcount
+        self.statements = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        return SimpleNamespace(rowcount=self.rowcount)
+
+    async def flush(self):
+        pass
+
+
+def _shift(**values) -> SimpleNamespace:
+    data = {
+        "id": uuid.uuid4(),
+        "store_id": uuid.uuid4(),
+        "cashier_id": uuid.uuid4(),
+        "opened_at": datetime(2026, 3, 1, 9, tzinfo=timezone.utc),
+        "closed_at": None,
+        "status": CashierShiftStatus.open,
+        "opening_cash": Decimal("100"),
+        "closing_cash": None,
+        "note": None,
+        "z_report": None,
+        "sales_count": 3,
+        "revenue_total": Decimal("250"),
+        "tax_total": Decimal("25"),
+        "profit_gross_total": Decimal("80"),
+        "refunds_total": Decimal("10"),
+        "payment_totals": {"cash": "150", "card": "100"},
+    }
+    data.update(values)
+    return SimpleNamespace(**data)
+
+
+def test_apply_totals_updates_open_shift_counters_only() -> None:
+    session = _CapturingSession(rowcount=1)
+    applied = asyncio.run(
+        CashierShiftRepo(session).apply_totals(
+            uuid.uuid4(), sales_count=1, revenue=Decimal("20"), by_payment_type={"cash": Decimal("20")}
+        )
+    )
+    sql = str(session.statements[0].compile(dialect=postgresql.dialect()))
+    assert applied is True
+    assert "cashier_shifts.status = " in sql
+    assert "sales_count=(cashier_shifts.sales_count + " in sql
+    assert "jsonb_set(cashier_shifts.payment_totals" in sql
+
+    closed = asyncio.run(CashierShiftRepo(_CapturingSession(rowcount=0)).apply_totals(uuid.uuid4(), sales_count=1))
+    assert closed is False
+
+
+def test_close_shift_freezes_z_report() -> None:
+    shift = _shift()
+    repo = SimpleNamespace(get=lambda shift_id, for_update=False: asyncio.sleep(0, shift))
+    service = ShiftsService(_CapturingSession(rowcount=1), repo)
+    owner = SimpleNamespace(id=uuid.uuid4(), roles=[SimpleNamespace(name="owner")])
+
+    asyncio.run(service.close_shift(shift.id, {"closing_cash": Decimal("240")}, owner))
+
+    assert shift.status == CashierShiftStatus.closed
+    assert shift.z_report["sales_count"] == 3
+    assert shift.z_report["expected_cash"] == "250"
+    assert shift.z_report["cash_difference"] == "-10"
+    assert shift.z_report["by_payment_type"] == {"cash": "150", "card": "100"}
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.close_shift(shift.id, {}, owner))
+    assert exc.value.status_code == 409
+
+
+class _FakeShiftRepo:
+    def __init__(self, open_ids: set, active):
+        self.open_ids = open_ids
+        self.active = active
+        self.applied = []
+
+    async def apply_totals(self, shift_id, **totals):
+        if shift_id not in self.open_ids:
+            return False
+        self.applied.append((shift_id, totals))
+        return True
+
+    async def get_active_for_cashier_store(self, cashier_id, store_id):
+        return self.active
+
+
+def _sales_service(shift_repo) -> SalesService:
+    return SalesService(None, None, None, None, None, None, None, None, None, None, None, shift_repo)
+
+
+def test_void_after_close_does_not_touch_active_shift() -> None:
+    active = _shift()
+    repo = _FakeShiftRepo({active.id}, active)
+    sale = SimpleNamespace(shift_id=uuid.uuid4(), store_id=active.store_id)
+
+    asyncio.run(_sales_service(repo)._apply_shift_adjustment(sale, uuid.uuid4(), sales_count=-1))
+    assert repo.applied == []
+
+    asyncio.run(
+        _sales_service(repo)._apply_shift_adjustment(sale, uuid.uuid4(), to_active_shift=True, refunds=Decimal("5"))
+    )
+    assert repo.applied == [(active.id, {"refunds": Decimal("5")})]
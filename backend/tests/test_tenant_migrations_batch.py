@@ -0,0 +1,68 @@
+import asyncio
+import os
+
+import pytest
+
+os.environ.setdefault("DATABASE_URL", "sqlite+aiosqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "test")
+
+from app import cli
+from app.services import migrations
+
+
+@pytest.fixture
+def revisions(monkeypatch: pytest.MonkeyPatch) -> dict:
+    current = {"alpha": "tenant_0002", "beta": "tenant_0001", "gamma": None}
+    monkeypatch.setattr(migrations, "get_tenant_head_revision", lambda script=None: "tenant_0002")
+    monkeypatch.setattr(
+        migrations,
+        "get_tenant_revisions",
+        lambda schemas, engine=None: {schema: current.get(schema) for schema in schemas},
+    )
+    return current
+
+
+def test_pending_tenant_schemas_skips_schemas_at_head(revisions: dict) -> None:
+    assert migrations.pending_tenant_schemas(["alpha", "beta", "gamma"]) == ["beta", "gamma"]
+
+
+def test_pending_tenant_schemas_keeps_all_without_head(
+    monkeypatch: pytest.MonkeyPatch, revisions: dict
+) -> None:
+    monkeypatch.setattr(migrations, "get_tenant_head_revision", lambda script=None: None)
+    assert migrations.pending_tenant_schemas(["alpha", "beta"]) == ["alpha", "beta"]
+
+
+def test_migrate_tenants_runs_pending_and_summarizes_failures(
+    monkeypatch: pytest.MonkeyPatch, revisions: dict, capsys: pytest.CaptureFixture
+) -> None:
+    migrated = []
+    closed = []
+
+    def migrate(schema: str):
+        migrated.append(schema)
+        return schema, 0.5, "boom" if schema == "gamma" else None
+
+    monkeypatch.setattr(cli, "migrate_tenant_in_worker", migrate)
+    monkeypatch.setattr(cli, "close_tenant_migration_worker", lambda: closed.append(True))
+
+    with pytest.raises(RuntimeError, match="Tenant migrations failed for: gamma"):
+        asyncio.run(cli.migrate_tenants(["alpha", "beta", "gamma"]))
+
+    out, err = capsys.readouterr()
+    assert migrated == ["beta", "gamma"]
+    assert closed == [True]
+    assert "1 of 3 schemas already at head" in out
+    assert "1 migrated, 1 skipped, 1 failed" in out
+    assert "[2/2] Tenant migrations failed for schema=gamma: boom" in err
+
+
+def test_migrate_tenants_does_nothing_when_all_at_head(
+    monkeypatch: pytest.MonkeyPatch, revisions: dict, capsys: pytest.CaptureFixture
+) -> None:
+    monkeypatch.setattr(cli, "migrate_tenant_in_worker", lambda schema: pytest.fail(schema))
+    monkeypatch.setattr(cli, "close_tenant_migration_worker", lambda: None)
+
+    asyncio.run(cli.migrate_tenants(["alpha"]))
+
+    assert "0 migrated, 1 skipped, 0 failed" in capsys.readouterr().out